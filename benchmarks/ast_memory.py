@@ -0,0 +1,85 @@
+"""
+Per-node memory of the AST: slotted node classes vs. the old __dict__ ones.
+
+The program is parsed once, then every node is copied twice under
+tracemalloc: into its own (slotted) class, and into a plain class that
+stores the same fields in an instance __dict__, which is how the nodes
+were laid out before they were slotted. Lists owned by a node are copied
+in both cases, so the figures are the whole per-node cost.
+
+Usage: python benchmarks/ast_memory.py [nodes]
+"""
+import sys
+import time
+import tracemalloc
+from dataclasses import fields
+
+from common import synthetic_source
+
+from src.lexer.scanner import Scanner
+from src.parser.ast_nodes import ASTNode
+from src.parser.parser import Parser
+
+NODES_PER_FUNCTION = 44     # nodes in one FUNCTION_TEMPLATE function
+
+
+def _nodes(root):
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        yield node
+        for f in fields(node):
+            value = getattr(node, f.name)
+            if isinstance(value, ASTNode):
+                stack.append(value)
+            elif isinstance(value, list):
+                stack.extend(v for v in value if isinstance(v, ASTNode))
+
+
+def _copy(node, cls):
+    twin = object.__new__(cls)
+    for f in fields(node):
+        value = getattr(node, f.name)
+        object.__setattr__(twin, f.name, list(value) if isinstance(value, list) else value)
+    return twin
+
+
+def _measure(nodes, class_for):
+    copies = [None] * len(nodes)
+    tracemalloc.start()
+    for i, node in enumerate(nodes):
+        copies[i] = _copy(node, class_for(type(node)))
+    size, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size
+
+
+def main():
+    target = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    source = synthetic_source(max(1, target // NODES_PER_FUNCTION))
+
+    tokens = Scanner(source).scan_tokens()
+    start = time.perf_counter()
+    ast = Parser(tokens).parse()
+    parse_time = time.perf_counter() - start
+    del tokens
+    nodes = list(_nodes(ast))
+    print(f"{len(nodes)} nodes, parsed in {parse_time:.2f}s")
+
+    dict_classes = {}
+
+    def dict_class(cls):
+        if cls not in dict_classes:
+            dict_classes[cls] = type(cls.__name__, (), {})
+        return dict_classes[cls]
+
+    before = _measure(nodes, dict_class)
+    after = _measure(nodes, lambda cls: cls)
+    print(f"{'layout':<14}{'bytes':>14}{'bytes/node':>12}")
+    print(f"{'__dict__':<14}{before:>14}{before / len(nodes):>12.1f}")
+    print(f"{'__slots__':<14}{after:>14}{after / len(nodes):>12.1f}")
+    print(f"saved: {1 - after / before:.1%}")
+
+
+if __name__ == "__main__":
+    main()
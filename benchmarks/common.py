@@ -0,0 +1,49 @@
+"""
+Shared helpers for the benchmark scripts in this directory.
+Run the scripts from anywhere: python benchmarks/<name>.py [args]
+"""
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+FUNCTION_TEMPLATE = """\
+// generated function {i}
+fn f{i}(int a, int b) -> int {{
+    int x{i} = a * {i} + b;
+    float y{i} = 2.5;
+    if (x{i} > 10 && b != 0) {{
+        x{i} = x{i} - 1;
+    }} else {{
+        x{i} += 3;
+    }}
+    /* loop */
+    while (x{i} < 100) {{
+        x{i} = x{i} + a % 7;
+    }}
+    return x{i};
+}}
+
+"""
+
+
+def synthetic_source(functions: int) -> str:
+    """A valid MiniCompiler program with `functions` small functions."""
+    parts = [FUNCTION_TEMPLATE.format(i=i) for i in range(functions)]
+    parts.append("fn main() -> int {\n    return f0(1, 2);\n}\n")
+    return "".join(parts)
+
+
+def best_of(repeat, fn, *args, **kwargs):
+    """Run fn `repeat` times; return (best seconds, last result)."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best, result
@@ -0,0 +1,38 @@
+"""
+Compare two result files written by benchmarks/frontend/run.py.
+
+Usage: python benchmarks/frontend/compare.py BASELINE.json CANDIDATE.json
+Speedup is baseline seconds over candidate seconds, so above 1 is faster.
+"""
+import json
+import sys
+
+
+def _load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    if len(sys.argv) != 3:
+        print(__doc__.strip())
+        sys.exit(1)
+    old, new = _load(sys.argv[1]), _load(sys.argv[2])
+    if old["config"] != new["config"]:
+        print("warning: the two runs used different generator settings")
+
+    print(f"{old['commit']} -> {new['commit']}")
+    print(f"{'stage':<10}{'before s':>10}{'after s':>10}{'speedup':>10}"
+          f"{'before MB':>11}{'after MB':>10}")
+    for stage, after in new["stages"].items():
+        before = old["stages"].get(stage)
+        if before is None:
+            continue
+        speedup = before["seconds"] / after["seconds"]
+        print(f"{stage:<10}{before['seconds']:>10.3f}{after['seconds']:>10.3f}"
+              f"{speedup:>10.2f}{before['peak_rss_mb'] or 0:>11.1f}"
+              f"{after['peak_rss_mb'] or 0:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Deterministic generator of valid MiniCompiler programs at a chosen scale.
+
+The same GeneratorConfig always gives the same source text, so timings
+taken on different commits measure the same input. Every program passes
+the semantic analyser.
+
+Usage: python benchmarks/frontend/generator.py [--functions N] [--depth N]
+           [--width N] [--structs N] [--comments F] [--seed N]
+"""
+import argparse
+import random
+import sys
+from dataclasses import asdict, dataclass
+from typing import List
+
+
+@dataclass(frozen=True)
+class GeneratorConfig:
+    functions: int = 200        # functions besides main
+    depth: int = 3              # nesting of if/while/for inside a function
+    width: int = 4              # operands per arithmetic expression
+    structs: int = 4            # struct declarations; each nests the one before
+    comments: float = 0.2       # chance of a comment before each statement
+    seed: int = 0
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+_OPERATORS = ("+", "-", "*")
+_STATEMENTS_PER_BLOCK = 3
+
+
+class _Writer:
+    def __init__(self, config: GeneratorConfig) -> None:
+        self.config = config
+        self.random = random.Random(config.seed)
+        self.lines: List[str] = []
+        self.indent = 0
+        self.comment_id = 0
+        # int fields of the struct variable `s`, down the chain of nesting
+        self.fields: List[str] = []
+        chain = "s."
+        for _ in range(config.structs):
+            self.fields += [chain + "x", chain + "z"]
+            chain += "inner."
+
+    def line(self, text: str) -> None:
+        self.lines.append("    " * self.indent + text)
+
+    def comment(self) -> None:
+        if self.random.random() >= self.config.comments:
+            return
+        self.comment_id += 1
+        if self.comment_id % 3:
+            self.line(f"// note {self.comment_id}: keep the accumulator in range")
+        else:
+            self.line(f"/* note {self.comment_id}: generated block comment */")
+
+    # ── expressions ────────────────────────────────────────────────────────
+    def operand(self, index: int, locals_: List[str]) -> str:
+        choice = self.random.randrange(6)
+        if choice == 0:
+            return str(self.random.randrange(1, 100))
+        if choice == 1 and index > 0:
+            callee = self.random.randrange(index)
+            return f"f{callee}({self.random.choice(locals_)}, b)"
+        if choice == 2 and self.config.structs:
+            return self.random.choice(self.fields)
+        return self.random.choice(locals_)
+
+    def expression(self, index: int, locals_: List[str]) -> str:
+        parts = [self.operand(index, locals_)]
+        for i in range(1, max(1, self.config.width)):
+            parts.append(self.random.choice(_OPERATORS))
+            parts.append(self.operand(index, locals_))
+            if i % 3 == 2:
+                parts = ["(" + " ".join(parts) + ")"]
+        return " ".join(parts)
+
+    def condition(self, index: int, locals_: List[str]) -> str:
+        limit = self.random.randrange(10, 1000)
+        return f"{self.expression(index, locals_)} < {limit} && b != 0"
+
+    # ── statements ─────────────────────────────────────────────────────────
+    def block(self, index: int, depth: int, locals_: List[str]) -> None:
+        local = f"t{depth}"
+        self.comment()
+        self.line(f"int {local} = {self.expression(index, locals_)};")
+        locals_ = locals_ + [local]
+        for _ in range(_STATEMENTS_PER_BLOCK):
+            self.comment()
+            self.statement(index, depth, locals_)
+
+    def statement(self, index: int, depth: int, locals_: List[str]) -> None:
+        kind = self.random.randrange(5) if depth < self.config.depth else 0
+        if kind <= 1:
+            op = self.random.choice(("=", "+=", "-="))
+            self.line(f"acc {op} {self.expression(index, locals_)};")
+            return
+        if kind == 2:
+            self.line(f"if ({self.condition(index, locals_)}) {{")
+            self.nested(index, depth, locals_)
+            self.line("} else {")
+            self.nested(index, depth, locals_)
+            self.line("}")
+        elif kind == 3:
+            self.line(f"while ({self.condition(index, locals_)}) {{")
+            self.nested(index, depth, locals_)
+            self.line("}")
+        else:
+            counter = f"i{depth}"
+            self.line(f"for (int {counter} = 0; {counter} < {self.config.width}; {counter} += 1) {{")
+            self.nested(index, depth, locals_ + [counter])
+            self.line("}")
+
+    def nested(self, index: int, depth: int, locals_: List[str]) -> None:
+        self.indent += 1
+        self.block(index, depth + 1, locals_)
+        self.indent -= 1
+
+    # ── declarations ───────────────────────────────────────────────────────
+    def struct(self, k: int) -> None:
+        self.comment()
+        self.line(f"struct S{k} {{")
+        self.indent += 1
+        self.line("int x;")
+        self.line("float y;")
+        if k:
+            self.line(f"S{k - 1} inner;")
+        self.line("int z;")
+        self.indent -= 1
+        self.line("}")
+        self.line("")
+
+    def function(self, index: int) -> None:
+        self.comment()
+        self.line(f"fn f{index}(int a, int b) -> int {{")
+        self.indent += 1
+        self.line("int acc = a;")
+        if self.config.structs:
+            self.line(f"S{self.config.structs - 1} s;")
+            for name in self.fields:
+                self.line(f"{name} = b;")
+        self.block(index, 0, ["a", "b", "acc"])
+        self.line("return acc;")
+        self.indent -= 1
+        self.line("}")
+        self.line("")
+
+    def program(self) -> str:
+        for k in range(self.config.structs):
+            self.struct(k)
+        for index in range(self.config.functions):
+            self.function(index)
+        self.line("fn main() -> int {")
+        self.line(f"    return f{max(0, self.config.functions - 1)}(1, 2);"
+                  if self.config.functions else "    return 0;")
+        self.line("}")
+        return "\n".join(self.lines) + "\n"
+
+
+def generate(config: GeneratorConfig) -> str:
+    """The program described by `config`."""
+    return _Writer(config).program()
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """The generator's knobs as command-line options."""
+    defaults = GeneratorConfig()
+    parser.add_argument("--functions", type=int, default=defaults.functions)
+    parser.add_argument("--depth", type=int, default=defaults.depth)
+    parser.add_argument("--width", type=int, default=defaults.width)
+    parser.add_argument("--structs", type=int, default=defaults.structs)
+    parser.add_argument("--comments", type=float, default=defaults.comments,
+                        help="chance of a comment before each statement, 0..1")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+
+
+def config_from(args: argparse.Namespace) -> GeneratorConfig:
+    return GeneratorConfig(args.functions, args.depth, args.width,
+                           args.structs, args.comments, args.seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    add_arguments(parser)
+    sys.stdout.write(generate(config_from(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Front-end throughput: Scanner, Parser and SemanticAnalyzer timed separately
+on a generated program, with the results saved as JSON.
+
+Each stage reports its best time over --repeat runs, tokens/s and nodes/s
+over the whole program, and the peak RSS of a fresh process that has just
+run the stage (along with how much of that the stage itself added).
+
+Usage: python benchmarks/frontend/run.py [--functions N] [--depth N]
+           [--width N] [--structs N] [--comments F] [--seed N]
+           [--repeat N] [--output FILE]
+Writes frontend-<commit>.json unless --output is given; compare two result
+files with benchmarks/frontend/compare.py.
+"""
+import argparse
+import json
+import multiprocessing
+import platform
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from common import ROOT, best_of
+from generator import add_arguments, config_from, generate
+
+from src.lexer.scanner import Scanner
+from src.parser.ast_nodes import iter_nodes
+from src.parser.parser import Parser
+from src.semantic.analyzer import SemanticAnalyzer
+
+try:
+    import resource
+except ImportError:     # not on Windows: RSS is reported as null there
+    resource = None
+
+STAGES = ("scan", "parse", "semantic")
+
+
+def _scan(source):
+    return Scanner(source).scan_tokens()
+
+
+def _parse(tokens):
+    return Parser(tokens).parse()
+
+
+def _analyze(ast):
+    analyzer = SemanticAnalyzer()
+    if not analyzer.analyze(ast):
+        raise RuntimeError("generated program failed semantic analysis:\n"
+                           + analyzer.format_errors())
+    return analyzer
+
+
+def _max_rss_mb():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return rss / (1 << 20) if sys.platform == "darwin" else rss / (1 << 10)
+
+
+def _stage_rss(config, stage):
+    """In a fresh process: (peak RSS before `stage`, peak RSS after it)."""
+    source = generate(config)
+    before = _max_rss_mb()
+    tokens = _scan(source)
+    if stage != "scan":
+        before = _max_rss_mb()
+        ast = _parse(tokens)
+        if stage == "semantic":
+            before = _max_rss_mb()
+            _analyze(ast)
+    return before, _max_rss_mb()
+
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def measure(config, repeat):
+    """The benchmark result for `config` as a JSON-ready dict."""
+    # A child starts out with its parent's peak RSS on Linux, so take these
+    # while this process is still small.
+    context = multiprocessing.get_context("spawn")
+    rss = {}
+    for stage in STAGES:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            rss[stage] = pool.submit(_stage_rss, config, stage).result()
+
+    source = generate(config)
+    scan_time, tokens = best_of(repeat, _scan, source)
+    parse_time, ast = best_of(repeat, _parse, tokens)
+    semantic_time, _analyzer = best_of(repeat, _analyze, ast)
+    nodes = sum(1 for _ in iter_nodes(ast))
+
+    stages = {}
+    for stage, seconds in zip(STAGES, (scan_time, parse_time, semantic_time)):
+        before, after = rss[stage]
+        stages[stage] = {
+            "seconds": seconds,
+            "tokens_per_second": len(tokens) / seconds,
+            "nodes_per_second": nodes / seconds,
+            "peak_rss_mb": after,
+            "stage_rss_mb": None if after is None else after - before,
+        }
+
+    return {
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": config.as_dict(),
+        "repeat": repeat,
+        "source_bytes": len(source.encode("utf-8")),
+        "lines": source.count("\n"),
+        "tokens": len(tokens),
+        "nodes": nodes,
+        "stages": stages,
+    }
+
+
+def _rss(value):
+    return "n/a" if value is None else f"{value:.1f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    add_arguments(parser)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="result file (default: frontend-<commit>.json)")
+    args = parser.parse_args()
+
+    result = measure(config_from(args), args.repeat)
+    output = Path(args.output or f"frontend-{result['commit']}.json")
+    output.write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+
+    print(f"{result['lines']} lines, {result['tokens']} tokens, {result['nodes']} nodes")
+    print(f"{'stage':<10}{'seconds':>10}{'tokens/s':>12}{'nodes/s':>12}"
+          f"{'peak MB':>10}{'stage MB':>10}")
+    for stage, row in result["stages"].items():
+        print(f"{stage:<10}{row['seconds']:>10.3f}{row['tokens_per_second']:>12,.0f}"
+              f"{row['nodes_per_second']:>12,.0f}{_rss(row['peak_rss_mb']):>10}"
+              f"{_rss(row['stage_rss_mb']):>10}")
+    print(f"results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
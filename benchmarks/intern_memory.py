@@ -0,0 +1,60 @@
+"""
+Memory held by tokens, AST and IR with and without the interning pool.
+
+Usage: python benchmarks/intern_memory.py [functions]
+"""
+import sys
+import tracemalloc
+
+from common import synthetic_source
+
+from src.ir.ir_generator import IRGenerator
+from src.lexer.scanner import Scanner
+from src.parser.parser import Parser
+from src.utils.interner import StringPool
+
+
+class NoPool(StringPool):
+    """Pool that hands every string back unchanged (the old behaviour)."""
+
+    def intern(self, text: str) -> str:
+        return text
+
+
+def _compile(source, pool):
+    tokens = Scanner(source, pool=pool).scan_tokens()
+    ast = Parser(tokens).parse()
+    program = IRGenerator(pool).generate(ast)
+    return tokens, ast, program
+
+
+def _measure(source, pool_class):
+    """Bytes held by the results, with and without the pool still alive."""
+    tracemalloc.start()
+    pool = pool_class()
+    result = _compile(source, pool)
+    with_pool, _peak = tracemalloc.get_traced_memory()
+    unique = len(pool) if pool_class is StringPool else 0
+    del pool
+    results_only, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return results_only, with_pool, unique
+
+
+def main():
+    functions = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    source = synthetic_source(functions)
+
+    print(f"source: {len(source)} chars, {functions} functions")
+    print(f"{'strings':<16}{'results':>14}{'with pool':>14}{'unique names':>14}")
+    base, _, _ = _measure(source, NoPool)
+    print(f"{'not interned':<16}{base:>14}{'-':>14}{'-':>14}")
+    results, with_pool, unique = _measure(source, StringPool)
+    print(f"{'interned':<16}{results:>14}{with_pool:>14}{unique:>14}")
+    print(f"saved once the pool is dropped: {base - results} bytes "
+          f"({1 - results / base:.1%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+Parallel chunked lexing: speedup against worker count.
+
+Usage: python benchmarks/parallel_lex.py [megabytes] [max_workers]
+Defaults to a 50 MB synthetic source and os.cpu_count() workers.
+"""
+import os
+import sys
+
+from common import best_of, synthetic_source, FUNCTION_TEMPLATE
+
+from src.lexer.scanner import Scanner
+
+
+def main():
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 50.0
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+
+    per_function = len(FUNCTION_TEMPLATE.format(i=10000))
+    source = synthetic_source(int(megabytes * 1_000_000 / per_function))
+    print(f"source: {len(source) / 1e6:.1f} MB, cpu_count={os.cpu_count()}")
+
+    serial, buffer = best_of(1, lambda: Scanner(source).scan_buffer())
+    print(f"{'workers':>8}{'seconds':>10}{'speedup':>10}")
+    print(f"{'serial':>8}{serial:>10.2f}{1.0:>10.2f}")
+
+    workers = 2
+    while workers <= max_workers:
+        seconds, parallel = best_of(
+            1, lambda: Scanner(source).scan_buffer(workers=workers)
+        )
+        assert len(parallel) == len(buffer)
+        print(f"{workers:>8}{seconds:>10.2f}{serial / seconds:>10.2f}")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
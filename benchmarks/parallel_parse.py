@@ -0,0 +1,36 @@
+"""
+Parallel per-declaration parsing: speedup against worker count.
+
+Usage: python benchmarks/parallel_parse.py [functions] [max_workers]
+Defaults to 10k synthetic functions and os.cpu_count() workers.
+"""
+import os
+import sys
+
+from common import best_of, synthetic_source
+
+from src.lexer.scanner import Scanner
+from src.parser.parser import Parser
+
+
+def main():
+    functions = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+
+    tokens = Scanner(synthetic_source(functions)).scan_buffer()
+    print(f"{functions} functions, {len(tokens)} tokens, cpu_count={os.cpu_count()}")
+
+    serial, ast = best_of(1, lambda: Parser(tokens).parse())
+    print(f"{'workers':>8}{'seconds':>10}{'speedup':>10}")
+    print(f"{'serial':>8}{serial:>10.2f}{1.0:>10.2f}")
+
+    workers = 2
+    while workers <= max_workers:
+        seconds, parallel = best_of(1, lambda: Parser(tokens).parse(workers=workers))
+        assert parallel == ast
+        print(f"{workers:>8}{seconds:>10.2f}{serial / seconds:>10.2f}")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Parser throughput on expression-heavy generated code.
+
+Usage: python benchmarks/parse_expressions.py [statements]
+"""
+import random
+import sys
+
+from common import best_of
+
+from src.lexer.scanner import Scanner
+from src.parser.parser import Parser
+
+OPERANDS = ["a", "b", "c", "n", "1", "2", "3.5", "true", "f(a, b)", "p.x"]
+OPERATORS = ["+", "-", "*", "/", "%", "<", "<=", "==", "!=", "&&", "||"]
+
+
+def expression(rng: random.Random, depth: int = 0) -> str:
+    if depth > 3 or rng.random() < 0.3:
+        operand = rng.choice(OPERANDS)
+        return f"-{operand}" if rng.random() < 0.1 else operand
+    left = expression(rng, depth + 1)
+    right = expression(rng, depth + 1)
+    text = f"{left} {rng.choice(OPERATORS)} {right}"
+    return f"({text})" if rng.random() < 0.2 else text
+
+
+def expression_source(statements: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    lines = ["fn main() -> int {"]
+    lines += [f"    x = {expression(rng)};" for _ in range(statements)]
+    lines.append("    return 0;\n}\n")
+    return "\n".join(lines)
+
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    source = expression_source(statements)
+    tokens = Scanner(source).scan_tokens()
+
+    seconds, _ast = best_of(5, lambda: Parser(tokens).parse())
+    print(f"{statements} statements, {len(tokens)} tokens")
+    print(f"parse: {seconds:.3f} s, {len(tokens) / seconds / 1e6:.2f} Mtok/s")
+
+
+if __name__ == "__main__":
+    main()
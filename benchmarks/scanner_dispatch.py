@@ -0,0 +1,37 @@
+"""
+Scanner micro-benchmark on operator-heavy and identifier-heavy input.
+
+Usage: python benchmarks/scanner_dispatch.py [lines]
+"""
+import sys
+
+from common import best_of
+
+from src.lexer.scanner import ENGINES, Scanner
+
+OPERATOR_LINE = "a+=b-c*d/e%f==g!=h<=i>=j&&k||!l->m=(n<o)>p;[q],r:s.t{u}\n"
+IDENTIFIER_LINE = (
+    "int counter = total if value else result while flag return true "
+    "false null struct fn void float bool for alpha_beta gamma1 _delta\n"
+)
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    inputs = [
+        ("operator-heavy", OPERATOR_LINE * lines),
+        ("identifier-heavy", IDENTIFIER_LINE * lines),
+    ]
+
+    print(f"{'input':<18}{'engine':<8}{'tokens':>9}{'seconds':>10}{'Mtok/s':>9}")
+    for name, source in inputs:
+        for engine in ENGINES:
+            seconds, tokens = best_of(
+                5, lambda: Scanner(source, engine=engine).scan_tokens()
+            )
+            rate = len(tokens) / seconds / 1e6
+            print(f"{name:<18}{engine:<8}{len(tokens):>9}{seconds:>10.3f}{rate:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+On-disk token cache: load time of a cache hit against a full scan.
+
+Usage: python benchmarks/token_cache.py [functions]
+"""
+import sys
+import tempfile
+
+from common import best_of, synthetic_source
+
+from src.lexer.scanner import Scanner
+from src.lexer.token_cache import TokenCache
+
+
+def main():
+    functions = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    source = synthetic_source(functions)
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache = TokenCache(directory)
+        scan, buffer = best_of(3, lambda: Scanner(source).scan_buffer())
+        store, _ = best_of(1, lambda: Scanner(source, cache=cache).scan_buffer())
+        hit, cached = best_of(5, lambda: Scanner(source, cache=cache).scan_buffer())
+        assert len(cached) == len(buffer)
+        size = cache.path_for(source).stat().st_size
+
+    print(f"source: {len(source) / 1e6:.1f} MB, {len(buffer)} tokens, "
+          f"entry: {size / 1e6:.1f} MB")
+    print(f"{'':<14}{'seconds':>10}{'speedup':>10}")
+    print(f"{'scan':<14}{scan:>10.3f}{1.0:>10.2f}")
+    print(f"{'miss + store':<14}{store:>10.3f}{scan / store:>10.2f}")
+    print(f"{'hit':<14}{hit:>10.3f}{scan / hit:>10.2f}")
+    print(f"counters: {cache.hits} hits, {cache.misses} misses")
+
+
+if __name__ == "__main__":
+    main()
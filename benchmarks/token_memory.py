@@ -0,0 +1,57 @@
+"""
+Memory per token: list of Tokens vs. TokenBuffer.
+
+Usage: python benchmarks/token_memory.py [functions]
+"""
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Union
+
+from common import synthetic_source
+
+from src.lexer.scanner import Scanner
+
+
+@dataclass
+class DataclassToken:
+    """Replica of the former @dataclass Token, kept for comparison."""
+    type:    object
+    lexeme:  str
+    line:    int
+    column:  int
+    literal: Union[int, float, bool, str, None] = field(default=None)
+
+
+def _measure(build):
+    tracemalloc.start()
+    result = build()
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, result
+
+
+def main():
+    functions = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    source = synthetic_source(functions)
+    count = len(Scanner(source).scan_tokens())
+
+    def dataclass_tokens():
+        return [DataclassToken(t.type, t.lexeme, t.line, t.column, t.literal)
+                for t in Scanner(source).iter_tokens()]
+
+    rows = [
+        ("dataclass Token list", dataclass_tokens),
+        ("slotted Token list", lambda: Scanner(source).scan_tokens()),
+        ("TokenBuffer", lambda: Scanner(source).scan_buffer()),
+    ]
+
+    print(f"source: {len(source)} chars, {count} tokens")
+    print(f"{'representation':<24}{'bytes':>14}{'bytes/token':>14}")
+    for name, build in rows:
+        size, _ = _measure(build)
+        print(f"{name:<24}{size:>14}{size / count:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
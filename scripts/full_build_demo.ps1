@@ -1,6 +1,9 @@
 Write-Host "Sprint 8 full pipeline demo"
 New-Item -ItemType Directory -Force -Path build | Out-Null
 
+# The steps below share parsed and checked ASTs through this cache.
+if (-not $env:MINICC_AST_CACHE) { $env:MINICC_AST_CACHE = "build/.ast-cache" }
+
 Write-Host "Input: examples/demo/sprint8_full_pipeline.src"
 
 Write-Host ""
@@ -5,6 +5,9 @@ PY=${PYTHON_CMD:-py.exe}
 
 mkdir -p build
 
+# The steps below share parsed and checked ASTs through this cache.
+export MINICC_AST_CACHE="${MINICC_AST_CACHE:-build/.ast-cache}"
+
 echo "Sprint 8 full pipeline demo"
 echo "Selected Python: $PY"
 echo "Input: examples/demo/sprint8_full_pipeline.src"
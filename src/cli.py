@@ -1,5 +1,7 @@
 # src/cli.py
+import os
 import sys
+from contextlib import contextmanager
 from src.optimizer.optimizer import IROptimizer
 
 
@@ -37,10 +39,11 @@ def show_help():
     print("MiniCompiler - Command Line Interface")
     print()
     print("Commands:")
-    print("  lex --input FILE [--output FILE]")
+    print("  lex --input FILE [--output FILE] [--mmap]")
     print("      Tokenize source file and print tokens.")
     print()
-    print("  parse --input FILE [--output FILE] [--format {text|dot|json}]")
+    print("  parse --input FILE [--output FILE] [--format {text|dot|json}] [--mmap]")
+    print("        [--max-depth N] [--subtree NAME]")
     print("      Parse source file and output AST in specified format.")
     print()
     print("  semantic --input FILE [--output FILE] [--symbols]")
@@ -54,6 +57,13 @@ def show_help():
     print("  --input, -i FILE       Input source file")
     print("  --output, -o FILE      Output file")
     print("  --format, -f FORMAT    Output format")
+    print("  --mmap                 Lex the memory-mapped file as bytes (lex, parse)")
+    print("  --max-depth N          Print nodes deeper than N as placeholders (parse)")
+    print("  --subtree NAME         Print only the top-level declaration NAME (parse)")
+    print()
+    print("Environment:")
+    print("  MINICC_AST_CACHE=DIR   Reuse parsed and checked ASTs stored under DIR")
+    print("                         (parse, semantic, ir, ssa, asm; not with --mmap)")
     print("  asm --input FILE [--output FILE]")
     print("  codegen --input FILE [--output FILE]")
     print("      Generate x86-64 assembly from source file.")
@@ -86,6 +96,41 @@ def _write_or_print(text, output_file=None, success_message=None):
         print(text)
 
 
+def _stream_or_print(write, output_file=None, success_message=None):
+    """Like _write_or_print, for output that write(file) produces in pieces."""
+    if output_file:
+        try:
+            with open(output_file, "w", encoding="utf-8") as f:
+                write(f)
+            if success_message:
+                print(success_message)
+        except Exception as e:
+            print(f"Error writing output: {e}")
+            sys.exit(1)
+    else:
+        write(sys.stdout)
+
+
+@contextmanager
+def _open_scanner(input_file, use_mmap=False):
+    """A scanner for `input_file`; a mapped file is unmapped on exit."""
+    if use_mmap:
+        from src.lexer.bytes_scanner import BytesScanner
+
+        try:
+            scanner = BytesScanner.from_path(input_file)
+        except Exception as e:
+            print(f"Error reading file: {e}")
+            sys.exit(1)
+        with scanner:
+            yield scanner
+        return
+
+    from src.lexer.scanner import Scanner
+
+    yield Scanner(_read_source(input_file), filename=input_file)
+
+
 def _scan_source(source, filename="<unknown>"):
     from src.lexer.scanner import Scanner
 
@@ -106,13 +151,36 @@ def _scan_source(source, filename="<unknown>"):
     return tokens
 
 
-def _parse_source(source, filename="<unknown>"):
+def _ast_cache():
+    directory = os.environ.get("MINICC_AST_CACHE")
+    if not directory:
+        return None
+
+    from src.parser.ast_cache import ASTCache
+
+    return ASTCache(directory)
+
+
+def _parse_source(source, filename="<unknown>", scanner=None):
+    from src.lexer.scanner import Scanner
     from src.parser.parser import Parser
 
-    tokens = _scan_source(source, filename)
-    parser = Parser(tokens)
+    # A memory-mapped scanner has no text to key the cache on.
+    cache = _ast_cache() if source is not None else None
+    if cache is not None:
+        ast = cache.load(source)
+        if ast is not None:
+            return ast
+
+    if scanner is None:
+        scanner = Scanner(source, filename=filename)
+    parser = Parser(scanner.iter_tokens())
     ast = parser.parse()
 
+    if scanner.errors:
+        print("\n".join(map(str, scanner.errors)))
+        sys.exit(1)
+
     if ast is None or parser.errors:
         if parser.errors:
             print("\n".join(map(str, parser.errors)))
@@ -120,12 +188,34 @@ def _parse_source(source, filename="<unknown>"):
             print("Parse error: parser returned no AST.")
         sys.exit(1)
 
+    if cache is not None:
+        cache.store(source, ast)
     return ast
 
 
-def _semantic_check(source, filename="<unknown>"):
+def _generate_ir(ast):
+    from src.ir.ir_generator import IRGenerationError, IRGenerator
+
+    try:
+        return IRGenerator().generate(ast)
+    except IRGenerationError as e:
+        print(f"IR generation error: {e}")
+        sys.exit(1)
+
+
+def _semantic_check(source, filename="<unknown>", need_analyzer=False):
+    """
+    The checked AST and its analyzer. When the AST comes from the cache the
+    analysis is skipped and the analyzer is None, unless need_analyzer.
+    """
     from src.semantic.analyzer import SemanticAnalyzer
 
+    cache = _ast_cache()
+    if cache is not None and not need_analyzer:
+        ast = cache.load(source, checked=True)
+        if ast is not None:
+            return ast, None
+
     ast = _parse_source(source, filename)
     analyzer = SemanticAnalyzer(filename=filename, source=source)
     ok = analyzer.analyze(ast)
@@ -134,12 +224,15 @@ def _semantic_check(source, filename="<unknown>"):
         print(analyzer.format_errors())
         sys.exit(1)
 
+    if cache is not None:
+        cache.store(source, ast, checked=True)
     return ast, analyzer
 
 
 def lex_command():
     input_file = None
     output_file = None
+    use_mmap = False
 
     i = 2
     while i < len(sys.argv):
@@ -150,6 +243,9 @@ def lex_command():
         elif arg in ("--output", "-o") and i + 1 < len(sys.argv):
             output_file = sys.argv[i + 1]
             i += 2
+        elif arg == "--mmap":
+            use_mmap = True
+            i += 1
         else:
             print(f"Unknown argument for lex: {arg}")
             sys.exit(1)
@@ -158,12 +254,8 @@ def lex_command():
         print("Error: No input file specified. Use --input <file>")
         sys.exit(1)
 
-    source = _read_source(input_file)
-
-    from src.lexer.scanner import Scanner
-
-    scanner = Scanner(source, filename=input_file)
-    tokens = scanner.scan_tokens() if hasattr(scanner, "scan_tokens") else scanner.scan_all()
+    with _open_scanner(input_file, use_mmap) as scanner:
+        tokens = scanner.scan_tokens() if hasattr(scanner, "scan_tokens") else scanner.scan_all()
 
     if scanner.errors:
         output_text = "\n".join(map(str, scanner.errors))
@@ -181,6 +273,9 @@ def parse_command():
     input_file = None
     output_file = None
     fmt = "text"
+    use_mmap = False
+    max_depth = None
+    subtree = None
 
     i = 2
     while i < len(sys.argv):
@@ -194,6 +289,18 @@ def parse_command():
         elif arg in ("--format", "-f") and i + 1 < len(sys.argv):
             fmt = sys.argv[i + 1].lower()
             i += 2
+        elif arg == "--mmap":
+            use_mmap = True
+            i += 1
+        elif arg == "--max-depth" and i + 1 < len(sys.argv):
+            if not sys.argv[i + 1].isdigit():
+                print(f"Error: --max-depth expects a non-negative integer, got '{sys.argv[i + 1]}'")
+                sys.exit(1)
+            max_depth = int(sys.argv[i + 1])
+            i += 2
+        elif arg == "--subtree" and i + 1 < len(sys.argv):
+            subtree = sys.argv[i + 1]
+            i += 2
         else:
             print(f"Unknown argument for parse: {arg}")
             sys.exit(1)
@@ -206,40 +313,24 @@ def parse_command():
         print(f"Error: Unknown format '{fmt}'. Supported formats: text, dot, json")
         sys.exit(1)
 
-    source = _read_source(input_file)
-    ast = _parse_source(source, input_file)
-
-    if fmt == "text":
-        from src.parser.ast_printer import TextPrinter, ASTPrinter
-
-        if "TextPrinter" in globals():
-            output_text = TextPrinter().print(ast)
-        else:
-            # Fallback for older ast_printer.py
-            import io
-            buf = io.StringIO()
-            ASTPrinter().print_text(ast, buf)
-            output_text = buf.getvalue()
-
-    elif fmt == "dot":
-        from src.parser.ast_printer import DotPrinter
-
-        output_text = DotPrinter().generate(ast)
-
+    if use_mmap:
+        with _open_scanner(input_file, use_mmap) as scanner:
+            ast = _parse_source(None, input_file, scanner)
     else:
-        from src.parser.ast_printer import JsonPrinter
+        ast = _parse_source(_read_source(input_file), input_file)
 
-        printer = JsonPrinter()
-        if hasattr(printer, "print"):
-            output_text = printer.print(ast)
-        elif hasattr(printer, "generate"):
-            output_text = printer.generate(ast)
-        else:
-            print("JSON output is not supported by current JsonPrinter.")
+    if subtree is not None:
+        matches = [d for d in ast.declarations if d.name == subtree]
+        if not matches:
+            print(f"Error: No top-level declaration named '{subtree}'")
             sys.exit(1)
+        ast = matches[0]
 
-    _write_or_print(
-        output_text,
+    from src.parser.ast_printer import TextPrinter, DotPrinter, JsonPrinter
+
+    printer = {"text": TextPrinter, "dot": DotPrinter, "json": JsonPrinter}[fmt]()
+    _stream_or_print(
+        lambda out: printer.write(ast, out, max_depth),
         output_file,
         success_message=f"AST written to {output_file}" if output_file else None,
     )
@@ -272,7 +363,7 @@ def semantic_command():
         sys.exit(1)
 
     source = _read_source(input_file)
-    ast, analyzer = _semantic_check(source, input_file)
+    ast, analyzer = _semantic_check(source, input_file, need_analyzer=show_symbols)
 
     lines = ["Semantic analysis passed."]
 
@@ -314,9 +405,7 @@ def ir_command():
     source = _read_source(input_file)
     ast, _analyzer = _semantic_check(source, input_file)
 
-    from src.ir.ir_generator import IRGenerator
-
-    ir_program = IRGenerator().generate(ast)
+    ir_program = _generate_ir(ast)
     output_text = ir_program.dump()
 
     _write_or_print(
@@ -349,10 +438,9 @@ def ssa_command():
     source = _read_source(input_file)
     ast, _analyzer = _semantic_check(source, input_file)
 
-    from src.ir.ir_generator import IRGenerator
     from src.ssa.ssa_builder import SSABuilder
 
-    ir_program = IRGenerator().generate(ast)
+    ir_program = _generate_ir(ast)
     ssa_program = SSABuilder().build(ir_program)
 
     _write_or_print(
@@ -386,10 +474,9 @@ def asm_command():
     source = _read_source(input_file)
     ast, _analyzer = _semantic_check(source, input_file)
 
-    from src.ir.ir_generator import IRGenerator
     from src.codegen.x86_generator import X86Generator
 
-    ir_program = IRGenerator().generate(ast)
+    ir_program = _generate_ir(ast)
     assembly = X86Generator().generate(ir_program)
 
     _write_or_print(
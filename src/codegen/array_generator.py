@@ -5,19 +5,13 @@ Compatible with Python 3.8+.
 from dataclasses import dataclass
 from typing import List, Sequence
 
+from src.semantic.type_system import TYPE_SIZES
+
 
 class ArrayLayoutError(ValueError):
     pass
 
 
-TYPE_SIZES = {
-    "bool": 1,
-    "int": 8,
-    "float": 8,
-    "string": 8,
-}
-
-
 @dataclass
 class ArrayLayout:
     name: str
@@ -25,10 +25,12 @@ class StackSlot:
     offset: int
     size: int = 8
 
-    def asm(self) -> str:
-        if self.offset < 0:
-            return f"[rbp{self.offset}]"
-        return f"[rbp+{self.offset}]"
+    def asm(self, displacement: int = 0) -> str:
+        """Address of the slot, or of the byte `displacement` into it."""
+        offset = self.offset + displacement
+        if offset < 0:
+            return f"[rbp{offset}]"
+        return f"[rbp+{offset}]"
 
 
 @dataclass
@@ -41,9 +43,11 @@ class StackFrame:
         if name in self.slots:
             return self.slots[name]
 
-        slot = StackSlot(name=name, offset=self._next_offset, size=size)
+        # A slot's offset is its lowest address; larger slots (structs)
+        # extend upwards from it.
+        slot = StackSlot(name=name, offset=self._next_offset - (size - 8), size=size)
         self.slots[name] = slot
-        self._next_offset -= size
+        self._next_offset = slot.offset - 8
         return slot
 
     def get(self, name: str) -> StackSlot:
@@ -13,22 +13,29 @@ The generator intentionally uses a simple stack-based strategy:
 """
 from __future__ import annotations
 
-from typing import List, Set
+from typing import Dict, List, Optional, Set
 
 from src.ir.basic_block import IRProgram, IRFunction, BasicBlock
 from src.ir.ir_instructions import IRInstruction
+from src.semantic.type_system import StructLayout
 
 from .abi import INTEGER_ARGUMENT_REGISTERS
 from .stack_frame import StackFrame
 
 
+# Operand size and the matching part of rax, by field size in bytes.
+_FIELD_WIDTHS = {1: ("byte", "al"), 2: ("word", "ax"), 4: ("dword", "eax"), 8: ("qword", "rax")}
+
+
 class X86Generator:
     def __init__(self) -> None:
         self.lines: List[str] = []
         self.frame: StackFrame = StackFrame("<none>")
+        self.struct_layouts: Dict[str, StructLayout] = {}
 
     def generate(self, program: IRProgram) -> str:
         self.lines = []
+        self.struct_layouts = program.struct_layouts
         self._emit("section .text")
 
         if program.functions:
@@ -70,14 +77,15 @@ class X86Generator:
         self._emit("    ret")
 
     def _prepare_frame(self, function: IRFunction) -> None:
-        # Function parameters: "name: type"
+        # Function parameters: "name: type". A struct variable gets one slot
+        # of the struct's size, with each field at its layout offset.
         for param in function.params:
             name = param.split(":", 1)[0].strip()
             if name:
-                self.frame.allocate(name)
+                self.frame.allocate(name, self._slot_size(function.locals.get(name)))
 
-        for name in function.locals.keys():
-            self.frame.allocate(name)
+        for name, type_name in function.locals.items():
+            self.frame.allocate(name, self._slot_size(type_name))
 
         for block in function.blocks:
             for instr in block.instructions:
@@ -133,6 +141,26 @@ class X86Generator:
             self._emit(f"    mov qword {slot.asm()}, rax")
             return
 
+        if op == "LOAD_FIELD":
+            base, offset, size = instr.args[0], int(instr.args[1]), int(instr.args[2])
+            width, reg = _FIELD_WIDTHS[size]
+            address = self.frame.get(base).asm(offset)
+            if size >= 4:
+                # A dword load into eax clears the upper half of rax too.
+                self._emit(f"    mov {reg}, {width} {address}")
+            else:
+                self._emit(f"    movzx rax, {width} {address}")
+            self._store_dest(instr.dest, "rax")
+            return
+
+        if op == "STORE_FIELD":
+            base, offset, size, value = (instr.args[0], int(instr.args[1]),
+                                         int(instr.args[2]), instr.args[3])
+            width, reg = _FIELD_WIDTHS[size]
+            self._load_operand(value, "rax")
+            self._emit(f"    mov {width} {self.frame.get(base).asm(offset)}, {reg}")
+            return
+
         if op == "MOVE":
             self._load_operand(instr.args[0], "rax")
             self._store_dest(instr.dest, "rax")
@@ -275,6 +303,13 @@ class X86Generator:
         slot = self.frame.get(operand)
         self._emit(f"    mov {reg}, qword {slot.asm()}")
 
+    def _slot_size(self, type_name: Optional[str]) -> int:
+        layout = self.struct_layouts.get(type_name)
+        if layout is None:
+            return 8
+        # Slots are whole qwords, which also meets any field's alignment.
+        return max(8, -(-layout.size // 8) * 8)
+
     def _looks_like_temp(self, value: str) -> bool:
         return value.startswith("t") and value[1:].isdigit()
 
@@ -1,10 +1,11 @@
 from .ir_instructions import IROperand, Temp, Var, Const, Label, IRInstruction
 from .basic_block import BasicBlock, IRFunction, IRProgram
 from .control_flow import LabelManager, function_to_dot
-from .ir_generator import IRGenerator
+from .ir_generator import IRGenerationError, IRGenerator
 
 __all__ = [
     "IROperand", "Temp", "Var", "Const", "Label", "IRInstruction",
     "BasicBlock", "IRFunction", "IRProgram",
     "LabelManager", "function_to_dot", "IRGenerator",
+    "IRGenerationError",
 ]
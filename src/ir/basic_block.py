@@ -7,6 +7,7 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Dict, List
 
+from src.semantic.type_system import StructLayout
 from .ir_instructions import IRInstruction
 
 
@@ -51,6 +52,8 @@ class IRFunction:
 @dataclass
 class IRProgram:
     functions: Dict[str, IRFunction] = field(default_factory=dict)
+    # Layout of each struct type, for the frame slots of struct variables.
+    struct_layouts: Dict[str, StructLayout] = field(default_factory=dict)
 
     def add_function(self, function: IRFunction) -> None:
         self.functions[function.name] = function
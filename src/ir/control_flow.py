@@ -4,18 +4,20 @@ Compatible with Python 3.8+.
 """
 from __future__ import annotations
 
-from typing import List
+from typing import List, Optional
 
+from src.utils.interner import StringPool
 from .basic_block import IRFunction
 
 
 class LabelManager:
-    def __init__(self) -> None:
+    def __init__(self, pool: Optional[StringPool] = None) -> None:
         self._counter = 0
+        self.pool = pool if pool is not None else StringPool()
 
     def new_label(self, prefix: str = "L") -> str:
         self._counter += 1
-        return f"{prefix}{self._counter}"
+        return self.pool.intern(f"{prefix}{self._counter}")
 
 
 def function_to_dot(function: IRFunction) -> str:
@@ -4,22 +4,34 @@ Compatible with Python 3.8+.
 """
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from src.parser.ast_nodes import (
-    ASTVisitor,
+    ASTVisitor, walk,
     ProgramNode, FunctionDeclNode, StructDeclNode, ParamNode,
     BlockStmtNode, VarDeclStmtNode, ExprStmtNode,
     IfStmtNode, WhileStmtNode, ForStmtNode, ReturnStmtNode,
-    LiteralExprNode, IdentifierExprNode, BinaryExprNode,
+    LiteralExprNode, IdentifierExprNode, MemberExprNode, BinaryExprNode,
     UnaryExprNode, CallExprNode, AssignmentExprNode,
 )
 
+from src.semantic.type_system import (
+    TYPE_SIZES, WORD_SIZE, LayoutEngine, StructLayout, StructType, resolve_type,
+)
+from src.utils.interner import StringPool
 from .basic_block import IRProgram, IRFunction, BasicBlock
 from .control_flow import LabelManager
 from .ir_instructions import IRInstruction
 
 
+class IRGenerationError(RuntimeError):
+    """A construct that passed semantic analysis but has no IR lowering."""
+
+
+# Field sizes that LOAD_FIELD / STORE_FIELD can move in one register.
+_REGISTER_SIZES = (1, 2, 4, 8)
+
+
 class IRGenerator(ASTVisitor):
     _BIN_OPS = {
         "+": "ADD",
@@ -44,20 +56,27 @@ class IRGenerator(ASTVisitor):
         "/=": "DIV",
     }
 
-    def __init__(self) -> None:
+    def __init__(self, pool: Optional[StringPool] = None,
+                 struct_layouts: Optional[Dict[str, StructLayout]] = None) -> None:
+        # Temps and labels are interned with the scanner's identifiers when
+        # the compilation shares its pool.
+        self.pool = pool if pool is not None else StringPool()
+        # The analyser's layouts, which the field offsets on the AST follow;
+        # without them structs are laid out in declaration order.
+        self.struct_layouts = struct_layouts
         self.program = IRProgram()
         self.current_function: Optional[IRFunction] = None
         self.current_block: Optional[BasicBlock] = None
-        self.labels = LabelManager()
+        self.labels = LabelManager(self.pool)
         self._temp_counter = 0
 
     def generate(self, ast: ProgramNode) -> IRProgram:
         self.program = IRProgram()
         self.current_function = None
         self.current_block = None
-        self.labels = LabelManager()
+        self.labels = LabelManager(self.pool)
         self._temp_counter = 0
-        ast.accept(self)
+        walk(self, ast)
         return self.program
 
     def get_all_ir(self) -> IRProgram:
@@ -71,7 +90,7 @@ class IRGenerator(ASTVisitor):
 
     def _new_temp(self) -> str:
         self._temp_counter += 1
-        return f"t{self._temp_counter}"
+        return self.pool.intern(f"t{self._temp_counter}")
 
     def _emit(self, opcode: str, dest: Optional[str] = None,
               args: Optional[List[str]] = None, comment: str = "") -> IRInstruction:
@@ -94,9 +113,108 @@ class IRGenerator(ASTVisitor):
             return chr(34) + str(node.value).replace(chr(34), "\\\"") + chr(34)
         return str(node.value)
 
+    def _struct_layouts(self, node: ProgramNode) -> Dict[str, StructLayout]:
+        if self.struct_layouts is not None:
+            return self.struct_layouts
+        structs: Dict[str, StructType] = {}
+        for decl in node.declarations:
+            if isinstance(decl, StructDeclNode):
+                structs.setdefault(decl.name, StructType(decl.name))
+        for decl in node.declarations:
+            if isinstance(decl, StructDeclNode):
+                fields = structs[decl.name].fields
+                for field_node in decl.fields:
+                    ftype = resolve_type(field_node.var_type, structs)
+                    if ftype is not None:
+                        fields.setdefault(field_node.name, ftype)
+        engine = LayoutEngine()
+        return {name: engine.layout(st) for name, st in structs.items()}
+
+    def _field_address(self, node: MemberExprNode) -> Tuple[str, str, str]:
+        """
+        The variable a field chain starts from, the field's byte offset in
+        it, and the field's size in bytes.
+        """
+        size = self._field_size(node)
+        base, offset = self._place(node)
+        return base, str(offset), str(size)
+
+    def _field_size(self, node: MemberExprNode) -> int:
+        base_type = node.base.resolved_type or ""
+        layout = None
+        if base_type.startswith("struct "):
+            layout = self.program.struct_layouts.get(base_type[len("struct "):])
+        if layout is not None and node.field_name in layout.fields:
+            size = layout.fields[node.field_name].size
+        else:
+            size = TYPE_SIZES.get(node.resolved_type, WORD_SIZE)
+        self._check_register_size(node, size)
+        return size
+
+    def _value_size(self, node) -> int:
+        """Size in bytes of the value of an annotated expression."""
+        type_name = node.resolved_type or ""
+        if type_name.startswith("struct "):
+            layout = self.program.struct_layouts.get(type_name[len("struct "):])
+            if layout is not None:
+                return layout.size
+        return TYPE_SIZES.get(type_name, WORD_SIZE)
+
+    def _check_register_size(self, node, size: int) -> None:
+        if size not in _REGISTER_SIZES:
+            # Values live in registers and temps, so a struct is only moved
+            # whole through one if it fits; assignment statements between
+            # variables and fields copy it piecewise instead (_copy_struct).
+            what = (f"'{node}'" if isinstance(node, (IdentifierExprNode, MemberExprNode))
+                    else "this value")
+            raise IRGenerationError(
+                f"{node.line}:{node.column}: cannot load or store {what}: "
+                f"it is a {size}-byte {node.resolved_type}, and only values "
+                f"of 1, 2, 4 or 8 bytes can be moved outside an assignment "
+                f"statement")
+
+    def _needs_copy(self, node) -> bool:
+        """Whether `node` is a struct value too big to move in a register."""
+        return ((node.resolved_type or "").startswith("struct ")
+                and self._value_size(node) not in _REGISTER_SIZES)
+
+    def _copy_struct(self, target, source, where) -> None:
+        """
+        Copy a struct too big for a register from the variable or field
+        `source` to `target`, in the widest moves that fit what is left.
+        """
+        if not isinstance(source, (IdentifierExprNode, MemberExprNode)):
+            self._check_register_size(source, self._value_size(source))
+        size = self._value_size(source)
+        src_base, src_offset = self._place(source)
+        dst_base, dst_offset = self._place(target)
+        done = 0
+        while done < size:
+            chunk = next(n for n in reversed(_REGISTER_SIZES) if n <= size - done)
+            temp = self._new_temp()
+            self._emit("LOAD_FIELD", dest=temp,
+                       args=[src_base, str(src_offset + done), str(chunk)])
+            self._emit("STORE_FIELD",
+                       args=[dst_base, str(dst_offset + done), str(chunk), temp],
+                       comment=f"{where} [{done}:{done + chunk}]")
+            done += chunk
+
+    def _place(self, node) -> Tuple[str, int]:
+        """The variable `node` lies in and its byte offset there."""
+        offset = 0
+        while isinstance(node, MemberExprNode):
+            if node.offset is None:
+                raise IRGenerationError(
+                    f"{node.line}:{node.column}: field access '{node}' was not "
+                    f"resolved by semantic analysis")
+            offset += node.offset
+            node = node.base
+        return node.name, offset
+
     def visit_program(self, node: ProgramNode) -> None:
+        self.program.struct_layouts = self._struct_layouts(node)
         for decl in node.declarations:
-            decl.accept(self)
+            yield decl
 
     def visit_struct_decl(self, node: StructDeclNode) -> None:
         return None
@@ -115,7 +233,7 @@ class IRGenerator(ASTVisitor):
         for param in node.params:
             fn.locals[param.name] = param.param_type
 
-        node.body.accept(self)
+        yield node.body
 
         if self.current_block is not None:
             if not self.current_block.instructions or self.current_block.instructions[-1].opcode != "RETURN":
@@ -130,23 +248,34 @@ class IRGenerator(ASTVisitor):
 
     def visit_block_stmt(self, node: BlockStmtNode) -> None:
         for stmt in node.statements:
-            stmt.accept(self)
+            yield stmt
 
     def visit_var_decl_stmt(self, node: VarDeclStmtNode) -> None:
         if self.current_function is not None:
             self.current_function.locals[node.name] = node.var_type
 
-        if node.initializer is not None:
-            value = node.initializer.accept(self)
+        if node.initializer is not None and self._needs_copy(node.initializer):
+            self._copy_struct(
+                IdentifierExprNode(name=node.name, line=node.line, column=node.column),
+                node.initializer, f"{node.name} initialization")
+        elif node.initializer is not None:
+            value = yield node.initializer
             self._emit("STORE", args=[node.name, value], comment=f"{node.name} initialization")
         else:
             self._emit("DECLARE", args=[node.var_type, node.name])
 
     def visit_expr_stmt(self, node: ExprStmtNode) -> None:
-        node.expression.accept(self)
+        expr = node.expression
+        if (isinstance(expr, AssignmentExprNode) and expr.operator == "="
+                and self._needs_copy(expr.target)):
+            # The assignment's own value is unused, so nothing needs to
+            # hold the whole struct at once.
+            self._copy_struct(expr.target, expr.value, f"{expr.target} =")
+            return
+        yield expr
 
     def visit_if_stmt(self, node: IfStmtNode) -> None:
-        cond = node.condition.accept(self)
+        cond = yield node.condition
         else_label = self.labels.new_label("else")
         end_label = self.labels.new_label("endif")
 
@@ -155,12 +284,12 @@ class IRGenerator(ASTVisitor):
         else:
             self._emit("JUMP_IF_NOT", args=[cond, end_label], comment="if condition false")
 
-        node.then_branch.accept(self)
+        yield node.then_branch
         self._emit("JUMP", args=[end_label])
 
         if node.else_branch is not None:
             self._start_block(else_label)
-            node.else_branch.accept(self)
+            yield node.else_branch
             self._emit("JUMP", args=[end_label])
 
         self._start_block(end_label)
@@ -173,18 +302,18 @@ class IRGenerator(ASTVisitor):
         self._emit("JUMP", args=[header])
         self._start_block(header)
 
-        cond = node.condition.accept(self)
+        cond = yield node.condition
         self._emit("JUMP_IF_NOT", args=[cond, end])
 
         self._start_block(body)
-        node.body.accept(self)
+        yield node.body
         self._emit("JUMP", args=[header])
 
         self._start_block(end)
 
     def visit_for_stmt(self, node: ForStmtNode) -> None:
         if node.init is not None:
-            node.init.accept(self)
+            yield node.init
 
         header = self.labels.new_label("for")
         body = self.labels.new_label("for_body")
@@ -194,14 +323,14 @@ class IRGenerator(ASTVisitor):
         self._start_block(header)
 
         if node.condition is not None:
-            cond = node.condition.accept(self)
+            cond = yield node.condition
             self._emit("JUMP_IF_NOT", args=[cond, end])
 
         self._start_block(body)
-        node.body.accept(self)
+        yield node.body
 
         if node.update is not None:
-            node.update.accept(self)
+            yield node.update
 
         self._emit("JUMP", args=[header])
         self._start_block(end)
@@ -210,27 +339,35 @@ class IRGenerator(ASTVisitor):
         if node.value is None:
             self._emit("RETURN")
         else:
-            value = node.value.accept(self)
+            value = yield node.value
             self._emit("RETURN", args=[value])
 
     def visit_literal_expr(self, node: LiteralExprNode) -> str:
         return self._const_text(node)
 
     def visit_identifier_expr(self, node: IdentifierExprNode) -> str:
+        if self._needs_copy(node):
+            self._check_register_size(node, self._value_size(node))
         temp = self._new_temp()
         self._emit("LOAD", dest=temp, args=[node.name])
         return temp
 
+    def visit_member_expr(self, node: MemberExprNode) -> str:
+        temp = self._new_temp()
+        self._emit("LOAD_FIELD", dest=temp, args=list(self._field_address(node)),
+                   comment=str(node))
+        return temp
+
     def visit_binary_expr(self, node: BinaryExprNode) -> str:
-        left = node.left.accept(self)
-        right = node.right.accept(self)
+        left = yield node.left
+        right = yield node.right
         temp = self._new_temp()
         opcode = self._BIN_OPS.get(node.operator, f"BINOP_{node.operator}")
         self._emit(opcode, dest=temp, args=[left, right], comment=node.operator)
         return temp
 
     def visit_unary_expr(self, node: UnaryExprNode) -> str:
-        value = node.operand.accept(self)
+        value = yield node.operand
         temp = self._new_temp()
 
         if node.operator == "-":
@@ -243,26 +380,41 @@ class IRGenerator(ASTVisitor):
         return temp
 
     def visit_call_expr(self, node: CallExprNode) -> str:
-        args = [arg.accept(self) for arg in node.arguments]
+        args = []
+        for arg in node.arguments:
+            args.append((yield arg))
         temp = self._new_temp()
         self._emit("CALL", dest=temp, args=[node.callee] + args)
         return temp
 
     def visit_assignment_expr(self, node: AssignmentExprNode) -> str:
-        value = node.value.accept(self)
-
-        if node.operator == "=":
-            self._emit("STORE", args=[node.target, value], comment=f"{node.target} =")
-            return value
+        if self._needs_copy(node.target):
+            # Only an assignment statement can copy it (visit_expr_stmt).
+            self._check_register_size(node, self._value_size(node.target))
+        value = yield node.value
+        target = str(node.target)
 
         opcode = self._ASSIGN_COMPOUND.get(node.operator)
         if opcode is None:
-            self._emit("STORE", args=[node.target, value], comment=f"{node.target} {node.operator}")
+            self._store_target(node.target, value, comment=f"{target} {node.operator}")
             return value
 
         old_value = self._new_temp()
         result = self._new_temp()
-        self._emit("LOAD", dest=old_value, args=[node.target])
+        self._load_target(node.target, old_value)
         self._emit(opcode, dest=result, args=[old_value, value], comment=node.operator)
-        self._emit("STORE", args=[node.target, result])
+        self._store_target(node.target, result)
         return result
+
+    def _load_target(self, target, dest: str) -> None:
+        if isinstance(target, MemberExprNode):
+            self._emit("LOAD_FIELD", dest=dest, args=list(self._field_address(target)))
+        else:
+            self._emit("LOAD", dest=dest, args=[target.name])
+
+    def _store_target(self, target, value: str, comment: str = "") -> None:
+        if isinstance(target, MemberExprNode):
+            self._emit("STORE_FIELD", args=[*self._field_address(target), value],
+                       comment=comment)
+        else:
+            self._emit("STORE", args=[target.name, value], comment=comment)
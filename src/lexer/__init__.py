@@ -1,7 +1,14 @@
-from .token_types import Token, TokenType, KEYWORDS, TOKEN_NAMES
+from .token_types import (
+    Token, LazyToken, TokenType, KEYWORDS, KEYWORD_TOKENS, OPERATORS, OPERATOR_TABLE, TOKEN_NAMES,
+)
 from .scanner import Scanner, LexerError
+from .token_stream import TokenStream
+from .token_buffer import TokenBuffer
+from .token_cache import TokenCache, LEXER_VERSION
 
 __all__ = [
-    "Token", "TokenType", "KEYWORDS", "TOKEN_NAMES",
-    "Scanner", "LexerError",
+    "Token", "LazyToken", "TokenType", "KEYWORDS", "KEYWORD_TOKENS",
+    "OPERATORS", "OPERATOR_TABLE", "TOKEN_NAMES",
+    "Scanner", "LexerError", "TokenStream", "TokenBuffer",
+    "TokenCache", "LEXER_VERSION",
 ]
\ No newline at end of file
@@ -0,0 +1,419 @@
+"""
+Bytes-level scanner over raw UTF-8 input, typically an mmap of the file.
+
+Every token except identifiers and string literals is ASCII, so the source
+never has to be decoded as a whole: only identifier, number and string
+lexemes are decoded, one by one. Lines and columns are counted in
+characters exactly like Scanner; token offsets are byte offsets into the
+input.
+
+Non-ASCII bytes outside strings and comments (Unicode identifiers, stray
+characters) are rare, and their exact handling depends on str.isalpha()
+and friends. On the first one the scanner decodes the rest of the input
+and hands it to the regular regex engine, so diagnostics stay identical.
+"""
+from __future__ import annotations
+
+import mmap
+import re
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from .scanner import (
+    LexerError, Scanner, MAX_IDENTIFIER_LENGTH, INT_MIN, INT_MAX,
+    OPERATOR_PATTERN, _ESCAPES,
+)
+from .token_buffer import TokenBuffer
+from .token_types import Token, TokenType, KEYWORD_TOKENS, OPERATORS
+from src.utils.interner import StringPool
+
+Source = Union[bytes, mmap.mmap]
+
+# Same alternatives as scanner._MASTER_PATTERN, restricted to ASCII.
+# UNICODE catches any byte of a multi-byte character outside strings and
+# comments and triggers the decoded fallback.
+_BYTES_PATTERN = re.compile(rb"""
+    [ \t\r]*
+    (?:
+        (?P<IDENT>[A-Za-z_][A-Za-z0-9_]*)
+      | (?P<OP>""" + OPERATOR_PATTERN.encode("ascii") + rb""")
+      | (?P<NL>\n)
+      | (?P<NUMBER>[0-9]+(?:\.[0-9]+|\.)?)
+      | (?P<FLOAT>\.[0-9]+)
+      | (?P<STRING>"[^"\\\n]*")
+      | (?P<LINE_COMMENT>//[^\n]*)
+      | (?P<BLOCK_COMMENT>/\*)
+      | (?P<QUOTE>")
+      | (?P<UNICODE>[\x80-\xff])
+      | (?P<OTHER>[^ \t\r])
+    )
+""", re.VERBOSE)
+
+_IDENT_TAIL = re.compile(rb"[A-Za-z0-9_]*")
+_COMMENT_DELIM = re.compile(rb"/\*|\*/")
+_STRING_BODY = re.compile(rb'[^"\\\n]*')
+_CONTINUATION = re.compile(rb"[\x80-\xbf]*")
+_NON_ASCII = re.compile(rb"[\x80-\xff]")
+
+_BYTES_OPERATORS: Dict[bytes, Tuple[TokenType, str]] = {
+    lexeme.encode("ascii"): (ttype, lexeme) for lexeme, ttype in OPERATORS.items()
+}
+_BYTES_ESCAPES: Dict[bytes, bytes] = {
+    key.encode("ascii"): value.encode("ascii") for key, value in _ESCAPES.items()
+}
+
+# Raised by the number slow path when the lexeme runs into a non-ASCII
+# character; the caller switches to the decoded fallback.
+_FALLBACK = -1
+
+
+def map_source(path: Union[str, Path]) -> Source:
+    """Read-only mmap of `path`; empty files (which cannot be mapped) give b''."""
+    with open(path, "rb") as f:
+        try:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return b""
+
+
+class BytesScanner(Scanner):
+    """
+    Scanner over UTF-8 bytes. Produces the same tokens and diagnostics as
+    Scanner(source.decode()), except that Token.offset is a byte offset.
+
+    Only the regex engine is available and positions are always eager.
+    scan_buffer() decodes the input once, since a TokenBuffer slices its
+    lexemes from a str, and its offsets are character offsets.
+
+    A scanner made by from_path() holds the file mapped until close(); it
+    is also a context manager. Tokens and diagnostics stay valid after it
+    is closed.
+    """
+
+    def __init__(self, source: Source, filename: str = "<unknown>",
+                 pool: Optional[StringPool] = None) -> None:
+        super().__init__("", filename=filename, pool=pool)
+        self._source = source  # type: ignore[assignment]
+
+    @classmethod
+    def from_path(cls, path: Union[str, Path],
+                  pool: Optional[StringPool] = None) -> "BytesScanner":
+        return cls(map_source(path), filename=str(path), pool=pool)
+
+    def close(self) -> None:
+        """Unmap the input, if it is mapped."""
+        if isinstance(self._source, mmap.mmap):
+            self._source.close()
+
+    def __enter__(self) -> "BytesScanner":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def scan_buffer(self, workers: int = 1, chunk_size: int = 0) -> TokenBuffer:
+        """
+        Scan into a TokenBuffer over the decoded input, like
+        Scanner(text).scan_buffer(). Always scans in this process:
+        `workers` and `chunk_size` are accepted for compatibility.
+        """
+        data = self._source[:]
+        text = data.decode("utf-8")
+        tokens = self.iter_tokens()
+        if len(text) != len(data):
+            tokens = self._with_char_offsets(tokens, data)
+        return TokenBuffer.from_tokens(text, tokens, pool=self.pool)
+
+    @staticmethod
+    def _with_char_offsets(tokens: Iterator[Token], data: bytes) -> Iterator[Token]:
+        # Offsets only grow, so one pass over the gaps converts them all.
+        byte_pos = char_pos = 0
+        for token in tokens:
+            gap = data[byte_pos:token.offset]
+            char_pos += len(gap) if gap.isascii() else len(gap.decode("utf-8"))
+            byte_pos = token.offset
+            token.offset = char_pos
+            yield token
+
+    def iter_tokens(self) -> Iterator[Token]:
+        self.errors = []
+        self._pending = []
+        self._start = self._current = 0
+        self._line = self._col_start = self._col = 1
+        return self._iter_bytes()
+
+    def _iter_bytes(self) -> Iterator[Token]:
+        data = self._source
+        length = len(data)
+        finditer = _BYTES_PATTERN.finditer
+        pending = self._pending
+        keywords = KEYWORD_TOKENS
+        operators = _BYTES_OPERATORS
+        intern = self.pool.intern
+        # One cheap pass decides whether per-token fallback checks are needed.
+        has_unicode = _NON_ASCII.search(data) is not None
+
+        line = 1
+        line_start = 0
+        extra = 0          # continuation bytes on this line before `pos`
+        pos = 0
+
+        while pos < length:
+            for m in finditer(data, pos):
+                kind = m.lastgroup
+                if kind == "NL":
+                    line += 1
+                    line_start = m.end()
+                    extra = 0
+                    continue
+
+                start, end = m.span(kind)
+                col = start - line_start + 1 - extra
+
+                if kind == "UNICODE" or (
+                    has_unicode and end < length and data[end] >= 0x80
+                    and kind in ("IDENT", "NUMBER", "FLOAT", "OP")
+                ):
+                    yield from self._iter_decoded(start, line, col)
+                    return
+
+                if kind == "IDENT":
+                    lexeme = intern(data[start:end].decode("ascii"))
+                    if len(lexeme) > MAX_IDENTIFIER_LENGTH:
+                        self._bytes_error(
+                            start, line, col,
+                            f"identifier '{lexeme[:20]}...' exceeds maximum length "
+                            f"of {MAX_IDENTIFIER_LENGTH} characters",
+                            data[start:end],
+                        )
+                        yield from pending
+                        pending.clear()
+                    keyword = keywords.get(lexeme)
+                    if keyword is None:
+                        yield Token(TokenType.IDENTIFIER, lexeme, line, col, None, start)
+                    else:
+                        yield Token(keyword[0], lexeme, line, col, keyword[1], start)
+
+                elif kind == "OP":
+                    ttype, lexeme = operators[data[start:end]]
+                    yield Token(ttype, lexeme, line, col, None, start)
+
+                elif kind == "NUMBER":
+                    resume = self._bytes_number(start, end, line, col)
+                    if resume == _FALLBACK:
+                        yield from self._iter_decoded(start, line, col)
+                        return
+                    yield from pending
+                    pending.clear()
+                    if resume != end:
+                        break
+
+                elif kind == "FLOAT":
+                    lexeme = data[start:end].decode("ascii")
+                    yield Token(TokenType.FLOAT_LITERAL, lexeme, line, col, float(lexeme), start)
+
+                elif kind == "STRING":
+                    raw = data[start:end]
+                    lexeme = raw.decode("utf-8")
+                    if not raw.isascii():
+                        extra += len(raw) - len(lexeme)
+                    yield Token(TokenType.STRING_LITERAL, lexeme,
+                                line, col, lexeme[1:-1], start)
+
+                elif kind == "LINE_COMMENT":
+                    # Only matters for the EOF column when no newline follows.
+                    raw = data[start:end]
+                    if not raw.isascii():
+                        extra += len(raw) - len(raw.decode("utf-8"))
+
+                elif kind == "BLOCK_COMMENT":
+                    resume = self._bytes_block_comment(start, line, col)
+                    break
+
+                elif kind == "QUOTE":
+                    resume = self._bytes_string(start, line, col)
+                    break
+
+                else:
+                    c = chr(data[start])
+                    if c == '&':
+                        message = "unexpected character '&'; did you mean '&&'?"
+                    elif c == '|':
+                        message = "unexpected character '|'; did you mean '||'?"
+                    else:
+                        message = f"unexpected character {c!r}"
+                    self._bytes_error(start, line, col, message, data[start:end])
+                    yield from pending
+                    pending.clear()
+            else:
+                break
+
+            # A slow path consumed input past the match; restart from there.
+            yield from pending
+            pending.clear()
+            segment = data[start:resume]
+            newlines = segment.count(b'\n')
+            if newlines:
+                line += newlines
+                last = segment.rindex(b'\n') + 1
+                line_start = start + last
+                segment = segment[last:]
+                extra = 0
+            if not segment.isascii():
+                extra += len(segment) - len(segment.decode("utf-8"))
+            pos = resume
+
+        self._line = line
+        self._col = length - line_start + 1 - extra
+        self._current = length
+        yield Token(TokenType.EOF, "", self._line, self._col, offset=length)
+
+    def _iter_decoded(self, start: int, line: int, col: int) -> Iterator[Token]:
+        """Decode the input from `start` on and finish with the str engine."""
+        text = bytes(self._source[start:]).decode("utf-8")
+        scanner = Scanner(text, filename=self._filename, pool=self.pool)
+        scanner._make_token = Token
+
+        # Character and byte offsets advance together; only the gaps
+        # between tokens need re-encoding.
+        char_pos, byte_pos = 0, start
+        for token in scanner._iter_regex(line, 1 - col):
+            gap = text[char_pos:token.offset]
+            byte_pos += len(gap) if gap.isascii() else len(gap.encode("utf-8"))
+            char_pos = token.offset
+            token.offset = byte_pos
+            self.errors.extend(scanner.errors)
+            scanner.errors.clear()
+            yield token
+
+        self._line, self._col = scanner._line, scanner._col
+        self._current = len(self._source)
+
+    def _bytes_number(self, start: int, end: int, line: int, col: int) -> int:
+        data = self._source
+        raw = data[start:end]
+
+        if raw.endswith(b"."):
+            self._bytes_error(
+                start, line, col,
+                "float literal missing digits after decimal point",
+                raw,
+            )
+            return end
+
+        if end < len(data) and (data[end] == 0x5F or chr(data[end]).isalpha()):
+            end = _IDENT_TAIL.match(data, end).end()
+            if end < len(data) and data[end] >= 0x80:
+                return _FALLBACK
+            full_lexeme = data[start:end].decode("ascii")
+            self._bytes_error(
+                start, line, col,
+                f"invalid identifier starting with digit: '{full_lexeme}'",
+                data[start:end],
+            )
+            return end
+
+        lexeme = raw.decode("ascii")
+        if '.' in lexeme:
+            self._pending.append(
+                Token(TokenType.FLOAT_LITERAL, lexeme, line, col, float(lexeme), start)
+            )
+            return end
+
+        value = int(lexeme)
+        if not (INT_MIN <= value <= INT_MAX):
+            self._bytes_error(
+                start, line, col,
+                f"integer literal {value} is out of range [{INT_MIN}, {INT_MAX}]",
+                raw,
+            )
+        self._pending.append(
+            Token(TokenType.INT_LITERAL, lexeme, line, col, value, start)
+        )
+        return end
+
+    def _bytes_block_comment(self, start: int, line: int, col: int) -> int:
+        search = _COMMENT_DELIM.search
+        data = self._source
+        pos = start + 2
+        depth = 1
+
+        while depth > 0:
+            m = search(data, pos)
+            if m is None:
+                pos = len(data)
+                break
+            pos = m.end()
+            depth += 1 if data[m.start()] == 0x2F else -1
+
+        if depth > 0:
+            self._bytes_error(
+                start, line, col,
+                "unterminated block comment (/* ... */ not closed)",
+                data[start:pos],
+            )
+        return pos
+
+    def _bytes_string(self, start: int, line: int, col: int) -> int:
+        # Slow path: escapes, a missing closing quote or a raw newline.
+        data = self._source
+        length = len(data)
+        pos = start + 1
+        current_line = line
+        parts: List[bytes] = []
+
+        while True:
+            body_end = _STRING_BODY.match(data, pos).end()
+            parts.append(data[pos:body_end])
+            pos = body_end
+            if pos >= length:
+                self._bytes_error(
+                    start, line, col,
+                    "unterminated string literal (reached end of file)",
+                    data[start:pos],
+                )
+                return pos
+            c = data[pos]
+            if c == 0x22:
+                break
+            pos += 1
+            if c == 0x0A:
+                self._bytes_error(
+                    start, line, col,
+                    "unterminated string literal (newline before closing '\"')",
+                    data[start:pos],
+                )
+                return pos
+
+            escape = b''
+            if pos < length:
+                escape_end = pos + 1
+                if data[pos] >= 0xC0:
+                    escape_end = _CONTINUATION.match(data, escape_end).end()
+                escape = data[pos:escape_end]
+                pos = escape_end
+                if escape == b'\n':
+                    current_line += 1
+            value = _BYTES_ESCAPES.get(escape)
+            if value is None:
+                self._bytes_error(
+                    start, current_line, col,
+                    f"unknown escape sequence '\\{escape.decode('utf-8')}'",
+                    data[start:pos],
+                )
+                value = escape
+            parts.append(value)
+
+        pos += 1
+        self._pending.append(
+            Token(TokenType.STRING_LITERAL, data[start:pos].decode("utf-8"),
+                  line, col, b''.join(parts).decode("utf-8"), start)
+        )
+        return pos
+
+    def _bytes_error(self, start: int, line: int, col: int,
+                     message: str, lexeme: bytes) -> None:
+        self.errors.append(LexerError(message, line, col))
+        self._pending.append(
+            Token(TokenType.ERROR, lexeme.decode("utf-8"), line, col, None, start)
+        )
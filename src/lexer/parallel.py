@@ -0,0 +1,121 @@
+"""
+Parallel lexing of large sources.
+
+The source is cut after newlines that are provably at top level, i.e. not
+inside a (possibly nested) block comment or a string literal. Every chunk
+then starts at column 1 of a known line, so chunks can be scanned
+independently in a ProcessPoolExecutor and stitched back together by
+shifting offsets and line numbers.
+"""
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from .token_buffer import TokenBuffer
+
+PARALLEL_CHUNK_SIZE = 1 << 20
+
+# Only the constructs that can swallow a newline matter to the pre-scan.
+# '//' is listed before '/*' for the same reason the master pattern tries
+# LINE_COMMENT first: "//*" is a line comment.
+_OPENER = re.compile(r'//|/\*|"')
+_COMMENT_DELIM = re.compile(r"/\*|\*/")
+_STRING_BODY = re.compile(r'(?:[^"\\\n]|\\[\s\S])*')
+
+
+def _skip_construct(source: str, start: int) -> int:
+    """End of the comment or string literal opened at `start`."""
+    if source.startswith("//", start):
+        end = source.find("\n", start)
+        return len(source) if end < 0 else end
+
+    if source.startswith("/*", start):
+        pos = start + 2
+        depth = 1
+        while depth > 0:
+            m = _COMMENT_DELIM.search(source, pos)
+            if m is None:
+                return len(source)
+            pos = m.end()
+            depth += 1 if source[m.start()] == "/" else -1
+        return pos
+
+    # String literal: escapes may hide a newline; a raw newline ends it.
+    pos = _STRING_BODY.match(source, start + 1).end()
+    return pos + 1 if pos < len(source) else pos
+
+
+def find_safe_boundaries(source: str, chunk_size: int = PARALLEL_CHUNK_SIZE) -> List[int]:
+    """
+    Offsets at which `source` may be split for independent lexing.
+
+    Each boundary directly follows a top-level newline and lies at least
+    `chunk_size` characters after the previous one. Comments and strings
+    are skipped with the same rules the scanner uses, so a boundary never
+    falls inside them.
+    """
+    length = len(source)
+    boundaries: List[int] = []
+    pos = 0
+    target = chunk_size
+
+    while target < length:
+        m = _OPENER.search(source, pos)
+        opener = length if m is None else m.start()
+        if opener < target:
+            pos = _skip_construct(source, opener)
+            target = max(target, pos)
+            continue
+
+        newline = source.find("\n", target)
+        if newline < 0 or newline + 1 >= length:
+            break
+        if opener < newline:
+            pos = _skip_construct(source, opener)
+            target = max(target, pos)
+            continue
+
+        boundaries.append(newline + 1)
+        pos = newline + 1
+        target = pos + chunk_size
+
+    return boundaries
+
+
+def _lex_chunk(job: Tuple[str, str, str, int, int, bool]):
+    from .scanner import Scanner
+
+    text, filename, engine, offset, line, last = job
+    scanner = Scanner(text, filename=filename, engine=engine)
+    buffer = scanner.scan_buffer()
+    count = len(buffer) if last else len(buffer) - 1   # drop inner EOFs
+    for error in scanner.errors:
+        error.line += line
+    return buffer.pack(offset, line, count), scanner.errors
+
+
+def scan_parallel(source: str, filename: str = "<unknown>",
+                  engine: str = "regex", workers: Optional[int] = None,
+                  chunk_size: int = PARALLEL_CHUNK_SIZE):
+    """
+    Lex `source` in chunks on `workers` processes.
+
+    Returns (TokenBuffer, errors) identical to a serial Scanner run.
+    """
+    bounds = [0] + find_safe_boundaries(source, chunk_size) + [len(source)]
+    jobs = []
+    line = 0
+    for index, (start, end) in enumerate(zip(bounds, bounds[1:])):
+        text = source[start:end]
+        jobs.append((text, filename, engine, start, line,
+                     index == len(bounds) - 2))
+        line += text.count("\n")
+
+    buffer = TokenBuffer(source)
+    errors = []
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        for packed, chunk_errors in pool.map(_lex_chunk, jobs):
+            buffer.extend_packed(packed)
+            errors.extend(chunk_errors)
+    return buffer, errors
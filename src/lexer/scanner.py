@@ -1,13 +1,88 @@
 
 from __future__ import annotations
 
-from typing import List, Optional, Union, Dict, Set, Tuple
-from .token_types import Token, TokenType, KEYWORDS
+import re
+from functools import partial
+from typing import Callable, Iterator, List, Optional, Union, Dict, Set, Tuple
+from .token_types import (
+    Token, LazyToken, TokenType, KEYWORD_TOKENS, OPERATORS, OPERATOR_TABLE,
+)
+from .token_buffer import TokenBuffer
+from .token_cache import TokenCache
+from .parallel import PARALLEL_CHUNK_SIZE, scan_parallel
+from src.utils.interner import StringPool
+from src.utils.line_index import LineIndex
 
 MAX_IDENTIFIER_LENGTH = 255
 INT_MIN = -(2 ** 31)
 INT_MAX = 2 ** 31 - 1
 
+ENGINES = ("regex", "legacy")
+DEFAULT_ENGINE = "regex"
+
+
+def _operator_pattern() -> str:
+    """
+    Regex alternation generated from OPERATOR_TABLE: two-character
+    operators first, then single characters. '/' and '.' get lookaheads
+    so comments and '.5' floats are not split off as operators.
+    """
+    doubles = [re.escape(first + second)
+               for first, (_single, pairs) in OPERATOR_TABLE.items()
+               for second in pairs if second != "="]
+    eq_firsts = "".join(re.escape(first)
+                        for first, (_single, pairs) in OPERATOR_TABLE.items()
+                        if "=" in pairs)
+    singles = "".join(re.escape(first)
+                      for first, (single, _pairs) in OPERATOR_TABLE.items()
+                      if single is not None and first not in "/.")
+    return "|".join(doubles + [f"[{eq_firsts}]=", f"[{singles}]",
+                               r"/(?![/*])", r"\.(?!\d)"])
+
+
+OPERATOR_PATTERN = _operator_pattern()
+
+def _master_pattern(blanks: str, newline: str) -> "re.Pattern[str]":
+    return re.compile(r"""
+    [""" + blanks + r"""]*
+    (?:
+        (?P<IDENT>[^\W\d]\w*)
+      | (?P<OP>""" + OPERATOR_PATTERN + r""")""" + newline + r"""
+      | (?P<NUMBER>\d+(?:\.\d+|\.)?)
+      | (?P<FLOAT>\.\d+)
+      | (?P<STRING>"[^"\\\n]*")
+      | (?P<LINE_COMMENT>//[^\n]*)
+      | (?P<BLOCK_COMMENT>/\*)
+      | (?P<QUOTE>")
+      | (?P<OTHER>[^""" + blanks + r"""])
+    )
+""", re.VERBOSE)
+
+
+# Master pattern for the regex engine. Leading blanks are folded into every
+# match so finditer() never stops on whitespace; newlines are matched on their
+# own to keep line numbers. Alternatives are ordered by frequency, with
+# lookaheads where prefixes overlap ('/' vs comments, '.' vs '.5').
+# Strings with escapes or without a closing quote, nested block comments and
+# all error cases are finished by small hand-written loops.
+_MASTER_PATTERN = _master_pattern(r" \t\r", r"""
+      | (?P<NL>\n)""")
+# With lazy_positions nothing needs line numbers while scanning, so newlines
+# are skipped with the other blanks.
+_LAZY_PATTERN = _master_pattern(r" \t\r\n", "")
+
+_IDENT_TAIL = re.compile(r"\w*")
+_COMMENT_DELIM = re.compile(r"/\*|\*/")
+
+_ESCAPES: Dict[str, str] = {
+    "n": "\n",
+    "t": "\t",
+    "r": "\r",
+    "\\": "\\",
+    '"': '"',
+    "0": "\0",
+}
+
 
 class LexerError:
     def __init__(self, message: str, line: int, column: int) -> None:
@@ -20,10 +95,51 @@ class LexerError:
 
 
 class Scanner:
-    def __init__(self, source: str, filename: str = "<unknown>") -> None:
+    """
+    Converts source text into tokens: as a list (scan_tokens), lazily as a
+    stream (iter_tokens) or packed into a TokenBuffer (scan_buffer).
+
+    Two engines produce the same tokens and diagnostics:
+      - "regex"  – one compiled master pattern, matched token by token
+                   (default, faster on large inputs);
+      - "legacy" – the original character-at-a-time scanner.
+
+    With lazy_positions=True (regex engine only) tokens store just their
+    source offset; line and column are looked up in self.line_index when
+    read, and lines are not counted while scanning. That saves memory and
+    lexing time, but reading every position back (as the parser does)
+    costs more than it saves. The same index can be handed to
+    ErrorReporter for diagnostics.
+
+    Identifier lexemes are interned in self.pool; pass a shared StringPool
+    to keep names canonical across later stages.
+
+    With a TokenCache, scan_buffer returns the cached buffer and errors for
+    a source scanned before, and stores new results after a miss.
+    """
+
+    def __init__(self, source: str, filename: str = "<unknown>",
+                 engine: str = DEFAULT_ENGINE,
+                 lazy_positions: bool = False,
+                 pool: Optional[StringPool] = None,
+                 cache: Optional[TokenCache] = None) -> None:
+        if engine not in ENGINES:
+            raise ValueError(
+                f"unknown scanner engine {engine!r}; "
+                f"expected one of {', '.join(ENGINES)}"
+            )
+        if lazy_positions and engine != "regex":
+            raise ValueError("lazy_positions requires the regex engine")
         self._source:   str          = source
         self._filename: str          = filename
+        self.engine:    str          = engine
+        self.lazy_positions: bool    = lazy_positions
+        self.pool:      StringPool   = pool if pool is not None else StringPool()
+        self.cache:     Optional[TokenCache] = cache
+        self._line_index: Optional[LineIndex] = None
+        self._make_token: Callable[..., Token] = Token
         self._tokens:   List[Token]  = []
+        self._pending:  List[Token]  = []
         self.errors:    List[LexerError] = []
 
         self._start:    int = 0
@@ -36,98 +152,470 @@ class Scanner:
         return self.scan_all()
 
     def scan_all(self) -> List[Token]:
+        self._tokens = list(self.iter_tokens())
+        return self._tokens
+
+    def scan_buffer(self, workers: int = 1,
+                    chunk_size: int = PARALLEL_CHUNK_SIZE) -> TokenBuffer:
+        """
+        Scan into a compact TokenBuffer instead of a list of Tokens.
+
+        With workers > 1, sources longer than chunk_size are split at
+        top-level newlines and the chunks are lexed in worker processes;
+        positions are then stored eagerly even with lazy_positions, as
+        they are when a cache is set.
+        """
+        if self.cache is not None:
+            cached = self.cache.load(self._source, self.pool)
+            if cached is not None:
+                buffer, self.errors = cached
+                return buffer
+
+        if workers > 1 and len(self._source) > chunk_size:
+            buffer, self.errors = scan_parallel(
+                self._source, self._filename, self.engine, workers, chunk_size
+            )
+            buffer.pool = self.pool
+        else:
+            # Cached buffers need their positions stored eagerly.
+            lazy = self.lazy_positions and self.cache is None
+            buffer = TokenBuffer.from_tokens(
+                self._source, self.iter_tokens(),
+                line_index=self.line_index if lazy else None,
+                pool=self.pool,
+            )
+
+        if self.cache is not None:
+            self.cache.store(self._source, buffer, self.errors)
+        return buffer
+
+    @property
+    def line_index(self) -> LineIndex:
+        """Newline offset index of the source, built on first use."""
+        if self._line_index is None:
+            self._line_index = LineIndex(self._source)
+        return self._line_index
+
+    def relex(self, old_tokens: List[Token], edit_range: Tuple[int, int],
+              new_text: str) -> List[Token]:
+        """
+        Re-tokenize after replacing source[start:end] with `new_text`.
+
+        `old_tokens` and self.errors must come from the last scan of this
+        scanner. Scanning restarts after the last token that ends before
+        the edit and stops as soon as a new token starts at the same place
+        (relative to the edit) as an old one with the same content; the old
+        tokens and errors from there on are shifted and reused. Tokens past
+        the edit are updated in place, so `old_tokens` should not be used
+        afterwards. The source, errors and scan_all() state are replaced.
+        """
+        if self.lazy_positions:
+            raise ValueError("relex does not support lazy_positions")
+        start, end = edit_range
+        old_source = self._source
+        if not 0 <= start <= end <= len(old_source):
+            raise ValueError(f"edit range {edit_range!r} is outside the source")
+
+        source = old_source[:start] + new_text + old_source[end:]
+        delta = len(new_text) - (end - start)
+        edit_end = start + len(new_text)
+
+        # First token that reaches the edit; a token ending exactly at
+        # `start` may grow ('ab' + 'c'), so it is re-scanned too. Tokens
+        # sharing an offset (an error and its literal) stay together.
+        lo, hi = 0, len(old_tokens)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            token = old_tokens[mid]
+            if token.offset + len(token.lexeme) < start:
+                lo = mid + 1
+            else:
+                hi = mid
+        first = lo
+        while 0 < first < len(old_tokens) and \
+                old_tokens[first - 1].offset == old_tokens[first].offset:
+            first -= 1
+
+        if first == 0:
+            pos, line, line_start = 0, 1, 0
+        else:
+            # The last token of a group ends where the scanner resumed.
+            prev = old_tokens[first - 1]
+            pos = prev.offset + len(prev.lexeme)
+            line = prev.line + prev.lexeme.count('\n')
+            if '\n' in prev.lexeme:
+                line_start = prev.offset + prev.lexeme.rindex('\n') + 1
+            else:
+                line_start = prev.offset - prev.column + 1
+
+        prefix_errors = sum(1 for t in old_tokens[:first] if t.type == TokenType.ERROR)
+        old_errors = self.errors
+        self._source = source
+        self._line_index = None
+        self.errors = old_errors[:prefix_errors]
+        self._pending = []
+        self._make_token = Token
+
+        tokens = old_tokens[:first]
+        new_errors = prefix_errors
+        j = first
+        for token in self._iter_regex(line, line_start, pos):
+            if token.offset >= edit_end:
+                old_offset = token.offset - delta
+                while j < len(old_tokens) and old_tokens[j].offset < old_offset:
+                    j += 1
+                old = old_tokens[j] if j < len(old_tokens) else None
+                if (old is not None and old.offset == old_offset
+                        and old.type == token.type and old.lexeme == token.lexeme
+                        and old.literal == token.literal):
+                    line_end = old_source.find('\n', old_offset)
+                    self._resync(old_tokens, j, token, delta,
+                                 line_end if line_end >= 0 else len(old_source),
+                                 old_errors, new_errors)
+                    tokens.extend(old_tokens[j:])
+                    break
+            if token.type == TokenType.ERROR:
+                new_errors += 1
+            tokens.append(token)
+
+        eof = tokens[-1]
+        self._line, self._col, self._current = eof.line, eof.column, len(source)
+        self._tokens = tokens
+        return tokens
+
+    def _resync(self, old_tokens: List[Token], index: int, token: Token,
+                delta: int, line_end: int, old_errors: List[LexerError],
+                new_errors: int) -> None:
+        """
+        Shift old_tokens[index:] and their errors onto the new source.
+        Columns change only for tokens starting on the old line the resync
+        happened on, which ends at `line_end` (EOF may sit right there).
+        """
+        line_delta = token.line - old_tokens[index].line
+        col_delta = token.column - old_tokens[index].column
+
+        del self.errors[new_errors:]
+        error_index = sum(1 for t in old_tokens[:index] if t.type == TokenType.ERROR)
+        self.errors.extend(old_errors[error_index:])
+
+        for old in old_tokens[index:]:
+            if old.offset > line_end and not (delta or line_delta):
+                break   # same-length edit: only the resync line moved
+            if old.offset <= line_end:
+                old.column += col_delta
+                if old.type == TokenType.ERROR:
+                    old_errors[error_index].column += col_delta
+            if old.type == TokenType.ERROR:
+                old_errors[error_index].line += line_delta
+                error_index += 1
+            old.line += line_delta
+            old.offset += delta
+
+    def iter_tokens(self) -> Iterator[Token]:
+        """
+        Lazily yield tokens, ending with EOF.
+        Lexer errors are appended to self.errors as they are found.
+        """
+        self.errors = []
+        self._pending = []
+        self._start = self._current = 0
+        self._line = self._col_start = self._col = 1
+
+        if self.engine == "regex":
+            if self.lazy_positions:
+                self._make_token = partial(LazyToken, self.line_index)
+            else:
+                self._make_token = Token
+            return self._iter_regex()
+        return self._iter_legacy()
+
+    def _iter_legacy(self) -> Iterator[Token]:
+        pending = self._pending
         while not self._is_at_end():
             self._start      = self._current
             self._col_start  = self._col
             self._scan_token()
+            if pending:
+                yield from pending
+                pending.clear()
 
-        self._tokens.append(
-            Token(TokenType.EOF, "", self._line, self._col)
-        )
-        return self._tokens
+        yield Token(TokenType.EOF, "", self._line, self._col,
+                    offset=self._current)
 
     def _scan_token(self) -> None:
         c = self._advance()
 
-        if c in (' ', '\t', '\r'):
-            return
-        if c == '\n':
+        if c in (' ', '\t', '\r', '\n'):
             return
 
-        if c == '(':
-            self._add_token(TokenType.LPAREN)
-        elif c == ')':
-            self._add_token(TokenType.RPAREN)
-        elif c == '{':
-            self._add_token(TokenType.LBRACE)
-        elif c == '}':
-            self._add_token(TokenType.RBRACE)
-        elif c == '[':
-            self._add_token(TokenType.LBRACKET)
-        elif c == ']':
-            self._add_token(TokenType.RBRACKET)
-        elif c == ';':
-            self._add_token(TokenType.SEMICOLON)
-        elif c == ',':
-            self._add_token(TokenType.COMMA)
-        elif c == ':':
-            self._add_token(TokenType.COLON)
-        elif c == '%':
-            self._add_token(TokenType.PERCENT)
-        elif c == '*':
-            self._add_token(TokenType.STAR_ASSIGN if self._match('=') else TokenType.STAR)
-        elif c == '+':
-            self._add_token(TokenType.PLUS_ASSIGN if self._match('=') else TokenType.PLUS)
-        elif c == '!':
-            self._add_token(TokenType.BANG_EQ if self._match('=') else TokenType.BANG)
-        elif c == '=':
-            self._add_token(TokenType.EQ_EQ if self._match('=') else TokenType.ASSIGN)
-        elif c == '<':
-            self._add_token(TokenType.LT_EQ if self._match('=') else TokenType.LT)
-        elif c == '>':
-            self._add_token(TokenType.GT_EQ if self._match('=') else TokenType.GT)
-        elif c == '&':
-            if self._match('&'):
-                self._add_token(TokenType.AMP_AMP)
-            else:
-                self._error("unexpected character '&'; did you mean '&&'?")
-        elif c == '|':
-            if self._match('|'):
-                self._add_token(TokenType.PIPE_PIPE)
-            else:
-                self._error("unexpected character '|'; did you mean '||'?")
-        elif c == '-':
-            if self._match('>'):
-                self._add_token(TokenType.ARROW)
-            elif self._match('='):
-                self._add_token(TokenType.MINUS_ASSIGN)
-            else:
-                self._add_token(TokenType.MINUS)
-        elif c == '/':
+        if c == '/':
             if self._match('/'):
                 self._skip_line_comment()
-            elif self._match('*'):
+                return
+            if self._match('*'):
                 self._skip_block_comment()
-            elif self._match('='):
-                self._add_token(TokenType.SLASH_ASSIGN)
-            else:
-                self._add_token(TokenType.SLASH)
+                return
         elif c == '"':
             self._scan_string()
-        elif c == '.':
-            # Field/member access: p.x
-            # Floats like .5 are still supported.
-            if self._peek().isdigit():
-                self._scan_float_starting_with_dot()
+            return
+        elif c == '.' and self._peek().isdigit():
+            # Floats like .5; a plain '.' is field access (p.x).
+            self._scan_float_starting_with_dot()
+            return
+
+        entry = OPERATOR_TABLE.get(c)
+        if entry is not None:
+            single, pairs = entry
+            pair = pairs.get(self._peek())
+            if pair is not None:
+                self._advance()
+                self._add_token(pair)
+            elif single is not None:
+                self._add_token(single)
             else:
-                self._add_token(TokenType.DOT)
+                second = next(iter(pairs))
+                self._error(f"unexpected character {c!r}; did you mean '{c}{second}'?")
+        elif c.isdigit():
+            self._scan_number(c)
+        elif c.isalpha() or c == '_':
+            self._scan_identifier()
         else:
-            if c.isdigit():
-                self._scan_number(c)
-            elif c.isalpha() or c == '_':
-                self._scan_identifier()
+            self._error(f"unexpected character {c!r}")
+
+    # ── Regex engine ───────────────────────────────────────────────────────
+
+    def _iter_regex(self, line: int = 1, line_start: int = 0,
+                    pos: int = 0) -> Iterator[Token]:
+        # Resuming mid-source is used by relex() and by BytesScanner's
+        # decoded fallback; `pos` must be outside comments and strings.
+        source = self._source
+        length = len(source)
+        lazy = self.lazy_positions
+        finditer = (_LAZY_PATTERN if lazy else _MASTER_PATTERN).finditer
+        pending = self._pending
+        keywords = KEYWORD_TOKENS
+        operators = OPERATORS
+        make_token = self._make_token
+        intern = self.pool.intern
+
+        while pos < length:
+            for m in finditer(source, pos):
+                kind = m.lastgroup
+                if kind == "NL":
+                    line += 1
+                    line_start = m.end()
+                    continue
+
+                start, end = m.span(kind)
+                col = start - line_start + 1
+
+                if kind == "IDENT":
+                    lexeme = intern(source[start:end])
+                    first = lexeme[0]
+                    if first != '_' and not first.isalpha():
+                        # Unicode numerics such as '½' are word characters
+                        # for the regex module but not identifier starts.
+                        self._regex_error(start, line, col, f"unexpected character {first!r}", first)
+                        resume = start + 1
+                        break
+                    if len(lexeme) > MAX_IDENTIFIER_LENGTH:
+                        self._regex_error(
+                            start, line, col,
+                            f"identifier '{lexeme[:20]}...' exceeds maximum length "
+                            f"of {MAX_IDENTIFIER_LENGTH} characters",
+                            lexeme,
+                        )
+                        yield from pending
+                        pending.clear()
+                    keyword = keywords.get(lexeme)
+                    if keyword is None:
+                        yield make_token(TokenType.IDENTIFIER, lexeme, line, col, None, start)
+                    else:
+                        yield make_token(keyword[0], lexeme, line, col, keyword[1], start)
+
+                elif kind == "OP":
+                    lexeme = source[start:end]
+                    yield make_token(operators[lexeme], lexeme, line, col, None, start)
+
+                elif kind == "NUMBER":
+                    resume = self._regex_number(start, end, line, col)
+                    yield from pending
+                    pending.clear()
+                    if resume != end:
+                        break
+
+                elif kind == "FLOAT":
+                    lexeme = source[start:end]
+                    yield make_token(TokenType.FLOAT_LITERAL, lexeme, line, col, float(lexeme), start)
+
+                elif kind == "STRING":
+                    yield make_token(TokenType.STRING_LITERAL, source[start:end],
+                                     line, col, source[start + 1:end - 1], start)
+
+                elif kind == "LINE_COMMENT":
+                    pass
+
+                elif kind == "BLOCK_COMMENT":
+                    resume = self._regex_block_comment(start, line, col)
+                    break
+
+                elif kind == "QUOTE":
+                    resume = self._regex_string(start, line, col)
+                    break
+
+                else:
+                    c = source[start]
+                    if c == '&':
+                        message = "unexpected character '&'; did you mean '&&'?"
+                    elif c == '|':
+                        message = "unexpected character '|'; did you mean '||'?"
+                    else:
+                        message = f"unexpected character {c!r}"
+                    self._regex_error(start, line, col, message, c)
+                    yield from pending
+                    pending.clear()
             else:
-                self._error(f"unexpected character {c!r}")
+                break
+
+            # A slow path consumed input past the match; restart from there.
+            yield from pending
+            pending.clear()
+            newlines = 0 if lazy else source.count('\n', start, resume)
+            if newlines:
+                line += newlines
+                line_start = source.rindex('\n', start, resume) + 1
+            pos = resume
+
+        self._line = line
+        self._col = length - line_start + 1
+        self._current = length
+        yield make_token(TokenType.EOF, "", self._line, self._col, offset=length)
+
+    def _regex_number(self, start: int, end: int, line: int, col: int) -> int:
+        source = self._source
+        lexeme = source[start:end]
+
+        if lexeme[-1] == '.':
+            self._regex_error(
+                start, line, col,
+                "float literal missing digits after decimal point",
+                lexeme,
+            )
+            return end
+
+        if end < len(source) and (source[end] == '_' or source[end].isalpha()):
+            end = _IDENT_TAIL.match(source, end).end()
+            full_lexeme = source[start:end]
+            self._regex_error(
+                start, line, col,
+                f"invalid identifier starting with digit: '{full_lexeme}'",
+                full_lexeme,
+            )
+            return end
+
+        if '.' in lexeme:
+            self._pending.append(
+                self._make_token(TokenType.FLOAT_LITERAL, lexeme, line, col, float(lexeme), start)
+            )
+            return end
+
+        value = int(lexeme)
+        if not (INT_MIN <= value <= INT_MAX):
+            self._regex_error(
+                start, line, col,
+                f"integer literal {value} is out of range [{INT_MIN}, {INT_MAX}]",
+                lexeme,
+            )
+        self._pending.append(
+            self._make_token(TokenType.INT_LITERAL, lexeme, line, col, value, start)
+        )
+        return end
+
+    def _regex_block_comment(self, start: int, line: int, col: int) -> int:
+        search = _COMMENT_DELIM.search
+        source = self._source
+        pos = start + 2
+        depth = 1
+
+        while depth > 0:
+            m = search(source, pos)
+            if m is None:
+                pos = len(source)
+                break
+            pos = m.end()
+            depth += 1 if source[m.start()] == '/' else -1
+
+        if depth > 0:
+            self._regex_error(
+                start, line, col,
+                "unterminated block comment (/* ... */ not closed)",
+                source[start:pos],
+            )
+        return pos
+
+    def _regex_string(self, start: int, line: int, col: int) -> int:
+        # Slow path: escapes, a missing closing quote or a raw newline.
+        source = self._source
+        length = len(source)
+        pos = start + 1
+        current_line = line
+        chars: List[str] = []
+
+        while pos < length and source[pos] != '"':
+            c = source[pos]
+            pos += 1
+            if c == '\n':
+                self._regex_error(
+                    start, line, col,
+                    "unterminated string literal (newline before closing '\"')",
+                    source[start:pos],
+                )
+                return pos
+            if c == '\\':
+                escape = ''
+                if pos < length:
+                    escape = source[pos]
+                    pos += 1
+                    if escape == '\n':
+                        current_line += 1
+                value = _ESCAPES.get(escape)
+                if value is None:
+                    self._regex_error(
+                        start, current_line, col,
+                        f"unknown escape sequence '\\{escape}'",
+                        source[start:pos],
+                    )
+                    value = escape
+                chars.append(value)
+            else:
+                chars.append(c)
+
+        if pos >= length:
+            self._regex_error(
+                start, line, col,
+                "unterminated string literal (reached end of file)",
+                source[start:pos],
+            )
+            return pos
+
+        pos += 1
+        self._pending.append(
+            self._make_token(TokenType.STRING_LITERAL, source[start:pos],
+                             line, col, ''.join(chars), start)
+        )
+        return pos
+
+    def _regex_error(self, start: int, line: int, col: int,
+                     message: str, lexeme: str) -> None:
+        if self.lazy_positions:
+            # Lines are not counted while scanning, so `line` is 1 plus the
+            # lines the token spans before the error (see _regex_string).
+            first_line, col = self.line_index.position(start)
+            line += first_line - 1
+        self.errors.append(LexerError(message, line, col))
+        self._pending.append(self._make_token(TokenType.ERROR, lexeme, line, col, None, start))
+
+    # ── Legacy engine ──────────────────────────────────────────────────────
 
     def _skip_line_comment(self) -> None:
         while not self._is_at_end() and self._peek() != '\n':
@@ -196,9 +684,9 @@ class Scanner:
         self._advance()
         value = ''.join(chars)
         lexeme = self._source[self._start:self._current]
-        self._tokens.append(
+        self._pending.append(
             Token(TokenType.STRING_LITERAL, lexeme,
-                  start_line, start_col, value)
+                  start_line, start_col, value, self._start)
         )
 
     def _scan_number(self, first: str) -> None:
@@ -236,8 +724,9 @@ class Scanner:
             return
 
         if is_float:
-            self._tokens.append(
-                Token(TokenType.FLOAT_LITERAL, lexeme, self._line, self._col_start, float(lexeme))
+            self._pending.append(
+                Token(TokenType.FLOAT_LITERAL, lexeme, self._line, self._col_start,
+                      float(lexeme), self._start)
             )
         else:
             value = int(lexeme)
@@ -245,8 +734,9 @@ class Scanner:
                 self._error(
                     f"integer literal {value} is out of range [{INT_MIN}, {INT_MAX}]"
                 )
-            self._tokens.append(
-                Token(TokenType.INT_LITERAL, lexeme, self._line, self._col_start, value)
+            self._pending.append(
+                Token(TokenType.INT_LITERAL, lexeme, self._line, self._col_start,
+                      value, self._start)
             )
 
     def _scan_float_starting_with_dot(self) -> None:
@@ -254,9 +744,9 @@ class Scanner:
         while not self._is_at_end() and self._peek().isdigit():
             self._advance()
         lexeme = self._source[self._start:self._current]
-        self._tokens.append(
+        self._pending.append(
             Token(TokenType.FLOAT_LITERAL, lexeme,
-                  self._line, self._col_start, float(lexeme))
+                  self._line, self._col_start, float(lexeme), self._start)
         )
 
     def _scan_identifier(self) -> None:
@@ -265,7 +755,7 @@ class Scanner:
         ):
             self._advance()
 
-        lexeme = self._source[self._start:self._current]
+        lexeme = self.pool.intern(self._source[self._start:self._current])
 
         if len(lexeme) > MAX_IDENTIFIER_LENGTH:
             self._error(
@@ -273,27 +763,10 @@ class Scanner:
                 f"of {MAX_IDENTIFIER_LENGTH} characters"
             )
 
-        ttype = KEYWORDS.get(lexeme)
-        if ttype is not None:
-            if ttype == TokenType.KW_TRUE:
-                self._tokens.append(
-                    Token(TokenType.BOOL_LITERAL, lexeme,
-                          self._line, self._col_start, True)
-                )
-            elif ttype == TokenType.KW_FALSE:
-                self._tokens.append(
-                    Token(TokenType.BOOL_LITERAL, lexeme,
-                          self._line, self._col_start, False)
-                )
-            else:
-                self._tokens.append(
-                    Token(ttype, lexeme, self._line, self._col_start)
-                )
-        else:
-            self._tokens.append(
-                Token(TokenType.IDENTIFIER, lexeme,
-                      self._line, self._col_start)
-            )
+        ttype, literal = KEYWORD_TOKENS.get(lexeme, (TokenType.IDENTIFIER, None))
+        self._pending.append(
+            Token(ttype, lexeme, self._line, self._col_start, literal, self._start)
+        )
 
     def _is_at_end(self) -> bool:
         return self._current >= len(self._source)
@@ -329,8 +802,9 @@ class Scanner:
     def _add_token(self, ttype: TokenType,
                    literal: object = None) -> None:
         lexeme = self._source[self._start:self._current]
-        self._tokens.append(
-            Token(ttype, lexeme, self._line, self._col_start, literal)
+        self._pending.append(
+            Token(ttype, lexeme, self._line, self._col_start, literal,
+                  self._start)
         )
 
     def _error(self, message: str) -> None:
@@ -339,6 +813,6 @@ class Scanner:
     def _errors_at(self, line: int, col: int, message: str) -> None:
         self.errors.append(LexerError(message, line, col))
         lexeme = self._source[self._start:self._current]
-        self._tokens.append(
-            Token(TokenType.ERROR, lexeme, line, col)
+        self._pending.append(
+            Token(TokenType.ERROR, lexeme, line, col, offset=self._start)
         )
\ No newline at end of file
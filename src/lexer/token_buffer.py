@@ -0,0 +1,165 @@
+"""
+Compact struct-of-arrays storage for large token streams.
+
+A list of Token objects costs roughly one object plus one lexeme string per
+token. TokenBuffer instead keeps five packed int columns and a sparse literal
+table, and slices lexemes out of the source only when a token is read.
+"""
+from array import array
+from collections.abc import Sequence
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+from .token_types import Token, TokenType
+from src.utils.interner import StringPool
+from src.utils.line_index import LineIndex
+
+TOKEN_TYPES: List[TokenType] = list(TokenType)
+TOKEN_TYPE_IDS: Dict[TokenType, int] = {t: i for i, t in enumerate(TOKEN_TYPES)}
+
+Literal = Union[int, float, bool, str, None]
+
+
+class TokenBuffer(Sequence):
+    """
+    Indexable token container backed by array('i') columns.
+
+    buffer[i] returns a Token view rebuilt from the columns; the two most
+    recently built views are cached, which covers the parser's
+    _peek/_peek_next access pattern.
+
+    Given a LineIndex the line and column columns are left empty and token
+    positions are resolved from their offsets when a view is built. Given a
+    StringPool, identifier lexemes of the views are interned in it, as the
+    scanner interns those of its Tokens.
+    """
+
+    def __init__(self, source: str,
+                 line_index: Optional[LineIndex] = None,
+                 pool: Optional[StringPool] = None) -> None:
+        self.source = source
+        self.line_index = line_index
+        self.pool = pool
+        self._types   = array('i')
+        self._starts  = array('i')
+        self._lengths = array('i')
+        self._lines   = array('i')
+        self._columns = array('i')
+        self._literals: Dict[int, Literal] = {}
+
+        self._cache_index = [-1, -1]
+        self._cache_token: List[Token] = [None, None]  # type: ignore[list-item]
+
+    @classmethod
+    def from_tokens(cls, source: str, tokens: Iterable[Token],
+                    line_index: Optional[LineIndex] = None,
+                    pool: Optional[StringPool] = None) -> "TokenBuffer":
+        buffer = cls(source, line_index, pool)
+        for token in tokens:
+            buffer.append(token)
+        return buffer
+
+    def append(self, token: Token) -> None:
+        if token.offset < 0:
+            raise ValueError(f"token {token!r} has no source offset")
+        index = len(self._types)
+        self._types.append(TOKEN_TYPE_IDS[token.type])
+        self._starts.append(token.offset)
+        self._lengths.append(len(token.lexeme))
+        if self.line_index is None:
+            self._lines.append(token.line)
+            self._columns.append(token.column)
+        if token.literal is not None:
+            self._literals[index] = token.literal
+
+    def pack(self, offset: int = 0, line: int = 0, count: Optional[int] = None):
+        """
+        The first `count` tokens as plain columns, with offsets shifted by
+        `offset` and lines by `line`. Used to stitch chunks lexed in
+        other processes back together (see lexer/parallel.py) and to
+        store buffers in the token cache.
+        """
+        if count is None:
+            count = len(self._types)
+        starts = self._starts[:count]
+        lines = self._lines[:count]
+        return (
+            self._types[:count],
+            array('i', [start + offset for start in starts]) if offset else starts,
+            self._lengths[:count],
+            array('i', [ln + line for ln in lines]) if line else lines,
+            self._columns[:count],
+            {i: v for i, v in self._literals.items() if i < count},
+        )
+
+    def extend_packed(self, packed) -> None:
+        """Append columns produced by pack()."""
+        types, starts, lengths, lines, columns, literals = packed
+        base = len(self._types)
+        self._types.extend(types)
+        self._starts.extend(starts)
+        self._lengths.extend(lengths)
+        self._lines.extend(lines)
+        self._columns.extend(columns)
+        if base == 0:
+            self._literals.update(literals)
+        else:
+            for index, value in literals.items():
+                self._literals[base + index] = value
+
+    def __len__(self) -> int:
+        return len(self._types)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self._types)
+
+        cache = self._cache_index
+        if cache[0] == index:
+            return self._cache_token[0]
+        if cache[1] == index:
+            return self._cache_token[1]
+
+        start = self._starts[index]
+        if self.line_index is None:
+            line, column = self._lines[index], self._columns[index]
+        else:
+            line, column = self.line_index.position(start)
+        ttype = TOKEN_TYPES[self._types[index]]
+        lexeme = self.source[start:start + self._lengths[index]]
+        if self.pool is not None and ttype is TokenType.IDENTIFIER:
+            lexeme = self.pool.intern(lexeme)
+        token = Token(
+            ttype,
+            lexeme,
+            line,
+            column,
+            self._literals.get(index),
+            start,
+        )
+        cache[1] = cache[0]
+        self._cache_token[1] = self._cache_token[0]
+        cache[0] = index
+        self._cache_token[0] = token
+        return token
+
+    def type_at(self, index: int) -> TokenType:
+        return TOKEN_TYPES[self._types[index]]
+
+    def iter_types(self) -> Iterator[TokenType]:
+        """Token types in order, without building Token views."""
+        return map(TOKEN_TYPES.__getitem__, self._types)
+
+    def lexeme_at(self, index: int) -> str:
+        start = self._starts[index]
+        return self.source[start:start + self._lengths[index]]
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the packed columns (literal table excluded)."""
+        return sum(
+            column.itemsize * len(column)
+            for column in (self._types, self._starts, self._lengths,
+                           self._lines, self._columns)
+        )
@@ -0,0 +1,165 @@
+"""
+Persistent on-disk cache of scanner output.
+
+Entries are keyed by a hash of the source text and LEXER_VERSION, and hold
+a TokenBuffer's packed columns plus its literals and lexer errors in a flat
+binary file. Lexemes are not stored: they are sliced from the source the
+key was computed from. Loading maps the file and copies each section
+straight into an array, so a hit costs a few memcpy calls instead of a scan.
+"""
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+from itertools import accumulate
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from src.utils.interner import StringPool
+from .token_buffer import TokenBuffer
+
+# Bump whenever the tokens or diagnostics produced for a source may change.
+LEXER_VERSION = "1"
+
+_MAGIC = b"MCTOKEN1"
+# Section typecodes, in file order; "B" sections are raw UTF-8 blobs.
+_SECTIONS = (
+    "i", "i", "i", "i", "i",   # types, starts, lengths, lines, columns
+    "i", "q",                  # int literals: token index, value
+    "i", "d",                  # float literals
+    "i", "b",                  # bool literals
+    "i", "i", "B",             # string literals: index, lengths, text
+    "i", "i", "i", "B",        # errors: line, column, message lengths, text
+)
+_HEADER = struct.Struct(f"<8s{len(_SECTIONS)}q")
+_INT64 = (-(2 ** 63), 2 ** 63 - 1)
+
+
+def _encode_strings(strings: List[str]) -> Tuple[array, bytes]:
+    encoded = [text.encode("utf-8") for text in strings]
+    return array("i", map(len, encoded)), b"".join(encoded)
+
+
+def _decode_strings(lengths: array, blob: bytes) -> List[str]:
+    ends = list(accumulate(lengths))
+    starts = [0] + ends[:-1]
+    return [blob[a:b].decode("utf-8") for a, b in zip(starts, ends)]
+
+
+class TokenCache:
+    """
+    Directory of cached token buffers with hit/miss counters.
+
+    Unreadable or stale entries count as misses; writes go through a
+    temporary file so concurrent builds never see a partial entry.
+    """
+
+    def __init__(self, directory: Union[str, Path]) -> None:
+        self.directory = Path(directory)
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, source: str) -> str:
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(LEXER_VERSION.encode("ascii"))
+        digest.update(sys.byteorder.encode("ascii"))
+        digest.update(source.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def path_for(self, source: str) -> Path:
+        key = self.key(source)
+        return self.directory / key[:2] / f"{key}.tok"
+
+    def load(self, source: str, pool: Optional[StringPool] = None):
+        """
+        (TokenBuffer, errors) for `source`, or None on a miss. The buffer
+        interns identifier lexemes in `pool`, like a freshly scanned one.
+        """
+        from .scanner import LexerError
+
+        try:
+            with open(self.path_for(source), "rb") as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                magic, *sizes = _HEADER.unpack_from(data)
+                if magic != _MAGIC:
+                    raise ValueError("not a token cache entry")
+                sections = []
+                pos = _HEADER.size
+                for typecode, size in zip(_SECTIONS, sizes):
+                    chunk = data[pos:pos + size]
+                    pos += size
+                    if typecode == "B":
+                        sections.append(chunk)
+                    else:
+                        column = array(typecode)
+                        column.frombytes(chunk)
+                        sections.append(column)
+        except (OSError, ValueError, struct.error):
+            self.misses += 1
+            return None
+
+        (types, starts, lengths, lines, columns,
+         int_index, int_value, float_index, float_value,
+         bool_index, bool_value, str_index, str_lengths, str_blob,
+         err_lines, err_columns, err_lengths, err_blob) = sections
+
+        literals: Dict[int, object] = dict(zip(int_index, int_value))
+        literals.update(zip(float_index, float_value))
+        literals.update(zip(bool_index, map(bool, bool_value)))
+        literals.update(zip(str_index, _decode_strings(str_lengths, str_blob)))
+
+        buffer = TokenBuffer(source, pool=pool)
+        buffer.extend_packed((types, starts, lengths, lines, columns, literals))
+        errors = [
+            LexerError(message, line, column)
+            for message, line, column in zip(
+                _decode_strings(err_lengths, err_blob), err_lines, err_columns
+            )
+        ]
+        self.hits += 1
+        return buffer, errors
+
+    def store(self, source: str, buffer: TokenBuffer, errors) -> bool:
+        """Write an entry; returns False if the buffer cannot be cached."""
+        types, starts, lengths, lines, columns, literals = buffer.pack()
+        if len(lines) != len(types):
+            return False    # positions resolved lazily; nothing to store
+
+        groups: Dict[type, Tuple[array, list]] = {
+            int: (array("i"), []), float: (array("i"), []),
+            bool: (array("i"), []), str: (array("i"), []),
+        }
+        for index, value in literals.items():
+            indices, values = groups[type(value)]
+            indices.append(index)
+            values.append(value)
+
+        ints = groups[int][1]
+        if ints and not (_INT64[0] <= min(ints) and max(ints) <= _INT64[1]):
+            return False    # out-of-range literal, reported as an error anyway
+
+        str_lengths, str_blob = _encode_strings(groups[str][1])
+        err_lengths, err_blob = _encode_strings([e.message for e in errors])
+        sections = [
+            types, starts, lengths, lines, columns,
+            groups[int][0], array("q", ints),
+            groups[float][0], array("d", groups[float][1]),
+            groups[bool][0], array("b", groups[bool][1]),
+            groups[str][0], str_lengths, str_blob,
+            array("i", [e.line for e in errors]),
+            array("i", [e.column for e in errors]),
+            err_lengths, err_blob,
+        ]
+        blobs = [s if isinstance(s, bytes) else s.tobytes() for s in sections]
+
+        path = self.path_for(source)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, *map(len, blobs)))
+            for blob in blobs:
+                f.write(blob)
+        os.replace(tmp, path)
+        return True
@@ -0,0 +1,40 @@
+"""
+Bounded lookahead over a lazily produced token stream.
+"""
+from collections import deque
+from typing import Deque, Iterable, Iterator
+
+from .token_types import Token
+
+
+class TokenStream:
+    """
+    List-style indexing over a token iterator (e.g. Scanner.iter_tokens()).
+
+    Only a small window of tokens is kept in memory, so indices must be
+    requested in non-decreasing order, with at most one step back. That is
+    exactly what the parser does with _peek/_peek_next/_advance.
+    """
+
+    WINDOW = 2
+
+    def __init__(self, tokens: Iterable[Token]) -> None:
+        self._source: Iterator[Token] = iter(tokens)
+        self._window: Deque[Token] = deque()
+        self._offset: int = 0   # absolute index of self._window[0]
+
+    def __getitem__(self, index: int) -> Token:
+        window = self._window
+        while self._offset + len(window) <= index:
+            try:
+                window.append(next(self._source))
+            except StopIteration:
+                raise IndexError("token stream exhausted") from None
+
+        while index - self._offset >= self.WINDOW:
+            window.popleft()
+            self._offset += 1
+
+        if index < self._offset:
+            raise IndexError(f"token {index} has already been discarded")
+        return window[index - self._offset]
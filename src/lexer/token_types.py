@@ -2,8 +2,11 @@
 Token type definitions for Python 3.8+.
 """
 from enum import Enum
-from dataclasses import dataclass, field
-from typing import Union, Optional, Dict
+from typing import TYPE_CHECKING, Union, Optional, Dict, Tuple
+
+if TYPE_CHECKING:
+    from src.utils.line_index import LineIndex
+
 
 class TokenType(Enum):
     KW_IF       = "if"
@@ -84,6 +87,34 @@ KEYWORDS: Dict[str, TokenType] = {
     "null":   TokenType.KW_NULL,
 }
 
+# ── Dispatch tables ─────────────────────────────────────────────────────────
+# Generated from TokenType and KEYWORDS so the scanners never branch over
+# individual operators or keywords.
+
+# Every punctuation token, by lexeme.
+OPERATORS: Dict[str, TokenType] = {
+    t.value: t for t in TokenType if not t.value[0].isalnum()
+}
+
+# First character -> (one-character token or None, {second char: token}).
+# '&' and '|' only exist doubled, so their single entry is None.
+OPERATOR_TABLE: Dict[str, Tuple[Optional[TokenType], Dict[str, TokenType]]] = {}
+for _lexeme, _ttype in OPERATORS.items():
+    _single, _pairs = OPERATOR_TABLE.setdefault(_lexeme[0], (None, {}))
+    if len(_lexeme) == 1:
+        OPERATOR_TABLE[_lexeme] = (_ttype, _pairs)
+    else:
+        _pairs[_lexeme[1]] = _ttype
+del _lexeme, _ttype, _single, _pairs
+
+# Keyword -> (final token type, literal); true/false become BOOL_LITERAL.
+KEYWORD_TOKENS: Dict[str, Tuple[TokenType, Optional[bool]]] = {
+    word: (ttype, None) for word, ttype in KEYWORDS.items()
+}
+KEYWORD_TOKENS["true"] = (TokenType.BOOL_LITERAL, True)
+KEYWORD_TOKENS["false"] = (TokenType.BOOL_LITERAL, False)
+
+
 TOKEN_NAMES: Dict[TokenType, str] = {
     TokenType.KW_IF:       "keyword 'if'",
     TokenType.KW_ELSE:     "keyword 'else'",
@@ -119,13 +150,27 @@ TOKEN_NAMES: Dict[TokenType, str] = {
 }
 
 
-@dataclass
-class Token:
-    type:    TokenType
-    lexeme:  str
-    line:    int
-    column:  int
-    literal: Union[int, float, bool, str, None] = field(default=None)
+class _TokenBase:
+    """
+    What Token and LazyToken share: every slot but the position, which
+    each of them provides as `line` and `column`.
+    """
+
+    __slots__ = ("type", "lexeme", "literal", "offset")
+
+    line:   int
+    column: int
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, _TokenBase):
+            return NotImplemented
+        return (self.type == other.type
+                and self.lexeme == other.lexeme
+                and self.line == other.line
+                and self.column == other.column
+                and self.literal == other.literal)
+
+    __hash__ = None  # mutable, like the dataclass it replaces
 
     def __repr__(self) -> str:
         base = f"{self.line}:{self.column} {self.type.name} {self.lexeme!r}"
@@ -148,4 +193,58 @@ class Token:
             else:
                 lit = str(self.literal)
             base += f" {lit}"
-        return base
\ No newline at end of file
+        return base
+
+
+class Token(_TokenBase):
+    """
+    A single token. Slotted, so an instance is a small fixed-size record;
+    TokenBuffer hands out Token views rebuilt from its packed columns.
+
+    `offset` is the absolute start position in the source (-1 if unknown).
+    It is bookkeeping only and does not take part in equality.
+    """
+
+    __slots__ = ("line", "column")
+
+    def __init__(self, type: TokenType, lexeme: str, line: int, column: int,
+                 literal: Union[int, float, bool, str, None] = None,
+                 offset: int = -1) -> None:
+        self.type    = type
+        self.lexeme  = lexeme
+        self.line    = line
+        self.column  = column
+        self.literal = literal
+        self.offset  = offset
+
+
+class LazyToken(_TokenBase):
+    """
+    Token that stores only its source offset; line and column are resolved
+    on demand through a shared LineIndex (see Scanner(lazy_positions=True)).
+
+    The constructor takes the same arguments as Token after the index, so
+    the scanner can build either kind through one call site; line and
+    column are not stored, and there are no slots for them: an instance is
+    one slot smaller than a Token.
+    """
+
+    __slots__ = ("_lines",)
+
+    def __init__(self, lines: "LineIndex", type: TokenType, lexeme: str,
+                 line: int = 0, column: int = 0,
+                 literal: Union[int, float, bool, str, None] = None,
+                 offset: int = -1) -> None:
+        self._lines  = lines
+        self.type    = type
+        self.lexeme  = lexeme
+        self.literal = literal
+        self.offset  = offset
+
+    @property
+    def line(self) -> int:
+        return self._lines.line_of(self.offset)
+
+    @property
+    def column(self) -> int:
+        return self._lines.column_of(self.offset)
@@ -1,21 +1,25 @@
 from .ast_nodes import (
-    ASTNode, ASTVisitor, ExpressionNode, StatementNode, DeclarationNode,
-    ProgramNode, FunctionDeclNode, StructDeclNode, ParamNode,
+    ASTNode, ASTVisitor, walk, iter_nodes,
+    ExpressionNode, StatementNode, DeclarationNode,
+    ProgramNode, FunctionDeclNode, LazyFunctionDeclNode, StructDeclNode, ParamNode,
     BlockStmtNode, VarDeclStmtNode, ExprStmtNode,
     IfStmtNode, WhileStmtNode, ForStmtNode, ReturnStmtNode,
-    LiteralExprNode, IdentifierExprNode, BinaryExprNode,
+    LiteralExprNode, IdentifierExprNode, MemberExprNode, BinaryExprNode,
     UnaryExprNode, CallExprNode, AssignmentExprNode,
 )
 from .parser import Parser, ParseError, ParserDiagnostic
 from .ast_printer import TextPrinter, DotPrinter, JsonPrinter
+from .ast_cache import ASTCache, AST_CACHE_VERSION
 
 __all__ = [
-    "ASTNode", "ASTVisitor", "ExpressionNode", "StatementNode",
-    "DeclarationNode", "ProgramNode", "FunctionDeclNode", "StructDeclNode",
-    "ParamNode", "BlockStmtNode", "VarDeclStmtNode", "ExprStmtNode",
-    "IfStmtNode", "WhileStmtNode", "ForStmtNode", "ReturnStmtNode",
-    "LiteralExprNode", "IdentifierExprNode", "BinaryExprNode",
+    "ASTNode", "ASTVisitor", "walk", "iter_nodes", "ExpressionNode",
+    "StatementNode", "DeclarationNode", "ProgramNode", "FunctionDeclNode",
+    "LazyFunctionDeclNode", "StructDeclNode", "ParamNode", "BlockStmtNode",
+    "VarDeclStmtNode", "ExprStmtNode", "IfStmtNode", "WhileStmtNode",
+    "ForStmtNode", "ReturnStmtNode",
+    "LiteralExprNode", "IdentifierExprNode", "MemberExprNode", "BinaryExprNode",
     "UnaryExprNode", "CallExprNode", "AssignmentExprNode",
     "Parser", "ParseError", "ParserDiagnostic",
     "TextPrinter", "DotPrinter", "JsonPrinter",
+    "ASTCache", "AST_CACHE_VERSION",
 ]
\ No newline at end of file
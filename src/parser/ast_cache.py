@@ -0,0 +1,72 @@
+"""
+Persistent on-disk cache of parsed, and optionally checked, programs.
+
+Entries are keyed by a hash of the source text, AST_CACHE_VERSION, the
+lexer version and the node schema (and for checked trees, the struct
+layout version), and hold the tree in the compact
+encoding of ast_serializer. Only trees that came out without errors are
+stored, so a hit stands for a successful run of the stages it covers:
+a plain entry for lexing and parsing, a `checked` entry also for
+semantic analysis, with every expression's resolved_type filled in.
+"""
+import hashlib
+import os
+from pathlib import Path
+from typing import Optional, Union
+
+from src.lexer.token_cache import LEXER_VERSION
+from src.semantic.type_system import LAYOUT_VERSION
+from . import ast_serializer
+from .ast_nodes import ProgramNode
+
+# Bump whenever the tree (or annotations) produced for a source may change
+# without the node classes changing. Field offsets follow LAYOUT_VERSION.
+AST_CACHE_VERSION = "1"
+
+
+class ASTCache:
+    """
+    Directory of serialized ASTs with hit/miss counters.
+
+    Unreadable or stale entries count as misses; writes go through a
+    temporary file so concurrent builds never see a partial entry.
+    """
+
+    def __init__(self, directory: Union[str, Path]) -> None:
+        self.directory = Path(directory)
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, source: str, checked: bool = False) -> str:
+        digest = hashlib.blake2b(digest_size=20)
+        parts = [AST_CACHE_VERSION, LEXER_VERSION, ast_serializer.SCHEMA_ID,
+                 "checked" if checked else "parsed"]
+        if checked:
+            parts.append(LAYOUT_VERSION)
+        for part in parts:
+            digest.update(part.encode("ascii") + b"\0")
+        digest.update(source.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def path_for(self, source: str, checked: bool = False) -> Path:
+        key = self.key(source, checked)
+        return self.directory / key[:2] / f"{key}.ast"
+
+    def load(self, source: str, checked: bool = False) -> Optional[ProgramNode]:
+        """The cached tree for `source`, or None on a miss."""
+        try:
+            tree = ast_serializer.loads(self.path_for(source, checked).read_bytes())
+            if not isinstance(tree, ProgramNode):
+                raise ValueError("not a program")
+        except (OSError, ValueError, TypeError, IndexError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return tree
+
+    def store(self, source: str, ast: ProgramNode, checked: bool = False) -> None:
+        path = self.path_for(source, checked)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(ast_serializer.dumps(ast))
+        os.replace(tmp, path)
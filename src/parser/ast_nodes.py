@@ -1,9 +1,13 @@
 """
-AST Nodes compatible with Python 3.8+.
+AST Nodes compatible with Python 3.10+.
 """
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
-from typing import Optional, List, Any
+from dataclasses import dataclass, field, fields
+from operator import attrgetter, methodcaller
+from types import GeneratorType
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, get_args
+
+from src.utils import trampoline
 
 class ASTVisitor(ABC):
     @abstractmethod
@@ -33,6 +37,8 @@ class ASTVisitor(ABC):
     @abstractmethod
     def visit_identifier_expr(self, node: "IdentifierExprNode") -> Any: pass
     @abstractmethod
+    def visit_member_expr(self, node: "MemberExprNode") -> Any: pass
+    @abstractmethod
     def visit_binary_expr(self, node: "BinaryExprNode") -> Any: pass
     @abstractmethod
     def visit_unary_expr(self, node: "UnaryExprNode") -> Any: pass
@@ -42,7 +48,56 @@ class ASTVisitor(ABC):
     def visit_assignment_expr(self, node: "AssignmentExprNode") -> Any: pass
 
 
-@dataclass
+def walk(visitor: ASTVisitor, node: "ASTNode") -> Any:
+    """
+    Visit `node` with an explicit stack instead of Python recursion.
+
+    Visit methods opt in by writing `result = yield child` where they
+    would write `result = child.accept(self)`; the driver visits the child
+    and resumes the method with its result. Methods that do not descend
+    stay plain functions, and a visitor without any generator methods
+    behaves exactly as with node.accept(visitor).
+    """
+    result = node.accept(visitor)
+    if type(result) is not GeneratorType:
+        return result
+    return trampoline.run(result, methodcaller("accept", visitor))
+
+
+def iter_nodes(root: "ASTNode") -> Iterator["ASTNode"]:
+    """Every node of the tree under `root`, root first, in source order."""
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        yield node
+        cls = type(node)
+        names = _CHILD_FIELDS.get(cls)
+        if names is None:
+            names = _CHILD_FIELDS[cls] = tuple(
+                f.name for f in fields(cls) if _holds_nodes(f.type)
+            )
+        for name in reversed(names):
+            value = getattr(node, name)
+            if type(value) is list:
+                stack.extend(reversed(value))
+            elif value is not None:
+                stack.append(value)
+
+
+def _holds_nodes(annotation: Any) -> bool:
+    if isinstance(annotation, type):
+        return issubclass(annotation, ASTNode)
+    return any(_holds_nodes(arg) for arg in get_args(annotation))
+
+
+_CHILD_FIELDS: Dict[type, Tuple[str, ...]] = {}
+
+# Metadata marking init fields that the semantic analyser fills in rather
+# than the parser; ast_serializer.fingerprint leaves them out.
+ANNOTATION = {"annotation": True}
+
+
+@dataclass(slots=True)
 class ASTNode(ABC):
     line:   int
     column: int
@@ -51,23 +106,38 @@ class ASTNode(ABC):
     @abstractmethod
     def accept(self, visitor: ASTVisitor) -> Any: pass
 
+    def __reduce__(self):
+        # Pickle as constructor arguments: about half the size and twice
+        # as fast as the generic slot-state protocol, which matters when
+        # parallel parsing ships whole subtrees between processes.
+        cls = type(self)
+        getter = _INIT_ARGS.get(cls)
+        if getter is None:
+            getter = _INIT_ARGS[cls] = attrgetter(*(f.name for f in fields(cls) if f.init))
+        if self.resolved_type is None:
+            return (cls, getter(self))
+        return (cls, getter(self), (None, {"resolved_type": self.resolved_type}))
+
+
+_INIT_ARGS: Dict[type, attrgetter] = {}
+
 
-@dataclass
+@dataclass(slots=True)
 class ExpressionNode(ASTNode, ABC):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class StatementNode(ASTNode, ABC):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class DeclarationNode(ASTNode, ABC):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class LiteralExprNode(ExpressionNode):
     value:    Any
     kind:     str
@@ -76,15 +146,37 @@ class LiteralExprNode(ExpressionNode):
         return visitor.visit_literal_expr(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class IdentifierExprNode(ExpressionNode):
     name: str
 
     def accept(self, visitor: ASTVisitor) -> Any:
         return visitor.visit_identifier_expr(self)
 
+    def __str__(self) -> str:
+        return self.name
+
+
+@dataclass(slots=True)
+class MemberExprNode(ExpressionNode):
+    """
+    Field access `base.field_name`. The semantic analyser fills in the
+    field's position in its struct and its byte offset from the start of
+    `base`, so later stages address it without looking the struct up.
+    """
+    base:        ExpressionNode
+    field_name:  str
+    field_index: Optional[int] = field(default=None, metadata=ANNOTATION)
+    offset:      Optional[int] = field(default=None, metadata=ANNOTATION)
+
+    def accept(self, visitor: ASTVisitor) -> Any:
+        return visitor.visit_member_expr(self)
+
+    def __str__(self) -> str:
+        return f"{self.base}.{self.field_name}"
 
-@dataclass
+
+@dataclass(slots=True)
 class BinaryExprNode(ExpressionNode):
     left:     ExpressionNode
     operator: str
@@ -94,7 +186,7 @@ class BinaryExprNode(ExpressionNode):
         return visitor.visit_binary_expr(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class UnaryExprNode(ExpressionNode):
     operator: str
     operand:  ExpressionNode
@@ -103,7 +195,7 @@ class UnaryExprNode(ExpressionNode):
         return visitor.visit_unary_expr(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class CallExprNode(ExpressionNode):
     callee:    str
     arguments: List[ExpressionNode]
@@ -112,9 +204,9 @@ class CallExprNode(ExpressionNode):
         return visitor.visit_call_expr(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class AssignmentExprNode(ExpressionNode):
-    target:   str
+    target:   ExpressionNode    # IdentifierExprNode or MemberExprNode
     operator: str
     value:    ExpressionNode
 
@@ -122,7 +214,7 @@ class AssignmentExprNode(ExpressionNode):
         return visitor.visit_assignment_expr(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class BlockStmtNode(StatementNode):
     statements: List[StatementNode]
 
@@ -130,7 +222,7 @@ class BlockStmtNode(StatementNode):
         return visitor.visit_block_stmt(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class VarDeclStmtNode(StatementNode):
     var_type:    str
     name:        str
@@ -140,7 +232,7 @@ class VarDeclStmtNode(StatementNode):
         return visitor.visit_var_decl_stmt(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class ExprStmtNode(StatementNode):
     expression: ExpressionNode
 
@@ -148,7 +240,7 @@ class ExprStmtNode(StatementNode):
         return visitor.visit_expr_stmt(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class IfStmtNode(StatementNode):
     condition:   ExpressionNode
     then_branch: StatementNode
@@ -158,7 +250,7 @@ class IfStmtNode(StatementNode):
         return visitor.visit_if_stmt(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class WhileStmtNode(StatementNode):
     condition: ExpressionNode
     body:      StatementNode
@@ -167,7 +259,7 @@ class WhileStmtNode(StatementNode):
         return visitor.visit_while_stmt(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class ForStmtNode(StatementNode):
     init:      Optional[StatementNode]
     condition: Optional[ExpressionNode]
@@ -178,7 +270,7 @@ class ForStmtNode(StatementNode):
         return visitor.visit_for_stmt(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class ReturnStmtNode(StatementNode):
     value: Optional[ExpressionNode]
 
@@ -186,7 +278,7 @@ class ReturnStmtNode(StatementNode):
         return visitor.visit_return_stmt(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class ParamNode(ASTNode):
     param_type: str
     name:       str
@@ -195,7 +287,7 @@ class ParamNode(ASTNode):
         return visitor.visit_param(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class FunctionDeclNode(DeclarationNode):
     return_type: str
     name:        str
@@ -206,7 +298,48 @@ class FunctionDeclNode(DeclarationNode):
         return visitor.visit_function_decl(self)
 
 
-@dataclass
+_FUNCTION_BODY = FunctionDeclNode.body     # the slot behind the property below
+
+
+class LazyFunctionDeclNode(FunctionDeclNode):
+    """
+    FunctionDeclNode whose body is parsed the first time `body` is read,
+    as produced by Parser(tokens, lazy_bodies=True). Until then only the
+    signature exists; `body_parsed` tells whether reading it would parse.
+    """
+    __slots__ = ("_parse_body",)
+
+    def __init__(self, return_type: str, name: str, params: List[ParamNode],
+                 parse_body: Callable[[], BlockStmtNode],
+                 line: int, column: int) -> None:
+        FunctionDeclNode.__init__(self, line=line, column=column, return_type=return_type,
+                                  name=name, params=params, body=None)
+        self._parse_body: Optional[Callable[[], BlockStmtNode]] = parse_body
+
+    @property
+    def body(self) -> BlockStmtNode:
+        parse_body = self._parse_body
+        if parse_body is not None:
+            self._parse_body = None
+            _FUNCTION_BODY.__set__(self, parse_body())
+        return _FUNCTION_BODY.__get__(self)
+
+    @body.setter
+    def body(self, value: BlockStmtNode) -> None:
+        self._parse_body = None
+        _FUNCTION_BODY.__set__(self, value)
+
+    @property
+    def body_parsed(self) -> bool:
+        return self._parse_body is None
+
+    def __reduce__(self):
+        # The parse callback holds the whole parser; pickle as a plain node.
+        return (FunctionDeclNode, (self.line, self.column, self.return_type,
+                                   self.name, self.params, self.body))
+
+
+@dataclass(slots=True)
 class StructDeclNode(DeclarationNode):
     name:   str
     fields: List[VarDeclStmtNode]
@@ -215,7 +348,7 @@ class StructDeclNode(DeclarationNode):
         return visitor.visit_struct_decl(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class ProgramNode(ASTNode):
     declarations: List[DeclarationNode]
 
@@ -1,19 +1,81 @@
 """
 AST pretty-printer and Graphviz DOT generator.
+
+Every printer has a string API (print / generate / serialise) and a
+write() that streams the same output to a file object line by line, so
+dumping a huge tree costs memory in its depth rather than its size. Both
+take max_depth: nodes nested deeper than that are printed as a one-line
+placeholder instead of being descended into.
 """
 from __future__ import annotations
 
 import json
-from typing import Any, List
+from types import GeneratorType
+from typing import IO, Any, Callable, List, NamedTuple, Optional
 
 from .ast_nodes import (
-    ASTVisitor, ASTNode,
+    ASTVisitor, ASTNode, walk,
     ProgramNode, FunctionDeclNode, StructDeclNode, ParamNode,
     BlockStmtNode, VarDeclStmtNode, ExprStmtNode,
     IfStmtNode, WhileStmtNode, ForStmtNode, ReturnStmtNode,
-    LiteralExprNode, IdentifierExprNode, BinaryExprNode,
+    LiteralExprNode, IdentifierExprNode, MemberExprNode, BinaryExprNode,
     UnaryExprNode, CallExprNode, AssignmentExprNode,
 )
+from src.utils import trampoline
+
+
+# Node names as they appear in the JSON output, shared by the placeholders
+# that stand in for subtrees cut off by max_depth.
+_KINDS = {
+    ProgramNode: "Program", FunctionDeclNode: "FunctionDecl",
+    StructDeclNode: "StructDecl", ParamNode: "Param",
+    BlockStmtNode: "Block", VarDeclStmtNode: "VarDecl",
+    ExprStmtNode: "ExprStmt", IfStmtNode: "If", WhileStmtNode: "While",
+    ForStmtNode: "For", ReturnStmtNode: "Return",
+    LiteralExprNode: "Literal", IdentifierExprNode: "Identifier",
+    MemberExprNode: "Member", BinaryExprNode: "Binary",
+    UnaryExprNode: "Unary", CallExprNode: "Call",
+    AssignmentExprNode: "Assignment",
+}
+
+
+def _kind(node: ASTNode) -> str:
+    for cls in type(node).__mro__:
+        if cls in _KINDS:
+            return _KINDS[cls]
+    return type(node).__name__
+
+
+def _walk_limited(visitor: ASTVisitor, root: ASTNode, max_depth: Optional[int],
+                  elide: Callable[[ASTNode], Any]) -> Any:
+    """
+    walk(visitor, root), except that nodes more than `max_depth` levels
+    below `root` are not visited: elide(node) is sent back in their place.
+    """
+    if max_depth is None:
+        return walk(visitor, root)
+    depth = 0       # visits in progress, i.e. the depth of their children
+
+    def tracked(task):
+        nonlocal depth
+        depth += 1
+        try:
+            return (yield from task)
+        finally:
+            depth -= 1
+
+    def visit(node: ASTNode) -> Any:
+        if depth > max_depth:
+            return elide(node)
+        result = node.accept(visitor)
+        if type(result) is not GeneratorType:
+            return result
+        return tracked(result)
+
+    result = visit(root)
+    if type(result) is not GeneratorType:
+        return result
+    return trampoline.run(result, visit)
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -25,17 +87,32 @@ class TextPrinter(ASTVisitor):
 
     def __init__(self) -> None:
         self._lines: list[str] = []
+        self._emit: Callable[[str], Any] = self._lines.append
         self._depth: int = 0
 
-    def print(self, node: ASTNode) -> str:
+    def print(self, node: ASTNode, max_depth: Optional[int] = None) -> str:
         self._lines.clear()
+        self._emit = self._lines.append
         self._depth = 0
-        node.accept(self)
+        _walk_limited(self, node, max_depth, self._elide)
         return '\n'.join(self._lines)
 
+    def write(self, node: ASTNode, out: IO[str],
+              max_depth: Optional[int] = None) -> None:
+        """Stream print(node, max_depth) to `out`, one line at a time."""
+        self._emit = lambda line: out.write(line + "\n")
+        self._depth = 0
+        try:
+            _walk_limited(self, node, max_depth, self._elide)
+        finally:
+            self._emit = self._lines.append
+
     # ── helpers ────────────────────────────────────────────────────────────
     def _w(self, text: str) -> None:
-        self._lines.append("  " * self._depth + text)
+        self._emit("  " * self._depth + text)
+
+    def _elide(self, node: ASTNode) -> None:
+        self._w(f"{_kind(node)} ... {self._loc(node)}")
 
     def _loc(self, node: ASTNode) -> str:
         return f"[{node.line}:{node.column}]"
@@ -50,7 +127,7 @@ class TextPrinter(ASTVisitor):
         self._w(f"Program {self._loc(node)}")
         self._depth += 1
         for decl in node.declarations:
-            decl.accept(self)
+            yield decl
         self._depth -= 1
 
     def visit_function_decl(self, node: FunctionDeclNode) -> None:
@@ -58,14 +135,14 @@ class TextPrinter(ASTVisitor):
         self._w(f"FunctionDecl: {node.name}({params}) -> {node.return_type}"
                 f" {self._loc(node)}")
         self._depth += 1
-        node.body.accept(self)
+        yield node.body
         self._depth -= 1
 
     def visit_struct_decl(self, node: StructDeclNode) -> None:
         self._w(f"StructDecl: {node.name} {self._loc(node)}")
         self._depth += 1
         for f in node.fields:
-            f.accept(self)
+            yield f
         self._depth -= 1
 
     def visit_param(self, node: ParamNode) -> None:
@@ -76,7 +153,7 @@ class TextPrinter(ASTVisitor):
         self._w(f"Block {self._loc(node)}")
         self._depth += 1
         for s in node.statements:
-            s.accept(self)
+            yield s
         self._depth -= 1
 
     def visit_var_decl_stmt(self, node: VarDeclStmtNode) -> None:
@@ -87,13 +164,13 @@ class TextPrinter(ASTVisitor):
                 f"{self._type_ann(node)} {self._loc(node)}")
         if node.initializer:
             self._depth += 1
-            node.initializer.accept(self)
+            yield node.initializer
             self._depth -= 1
 
     def visit_expr_stmt(self, node: ExprStmtNode) -> None:
         self._w(f"ExprStmt {self._loc(node)}")
         self._depth += 1
-        node.expression.accept(self)
+        yield node.expression
         self._depth -= 1
 
     def visit_if_stmt(self, node: IfStmtNode) -> None:
@@ -101,16 +178,16 @@ class TextPrinter(ASTVisitor):
         self._depth += 1
         self._w("Condition:")
         self._depth += 1
-        node.condition.accept(self)
+        yield node.condition
         self._depth -= 1
         self._w("Then:")
         self._depth += 1
-        node.then_branch.accept(self)
+        yield node.then_branch
         self._depth -= 1
         if node.else_branch:
             self._w("Else:")
             self._depth += 1
-            node.else_branch.accept(self)
+            yield node.else_branch
             self._depth -= 1
         self._depth -= 1
 
@@ -119,11 +196,11 @@ class TextPrinter(ASTVisitor):
         self._depth += 1
         self._w("Condition:")
         self._depth += 1
-        node.condition.accept(self)
+        yield node.condition
         self._depth -= 1
         self._w("Body:")
         self._depth += 1
-        node.body.accept(self)
+        yield node.body
         self._depth -= 1
         self._depth -= 1
 
@@ -133,21 +210,21 @@ class TextPrinter(ASTVisitor):
         if node.init:
             self._w("Init:")
             self._depth += 1
-            node.init.accept(self)
+            yield node.init
             self._depth -= 1
         if node.condition:
             self._w("Condition:")
             self._depth += 1
-            node.condition.accept(self)
+            yield node.condition
             self._depth -= 1
         if node.update:
             self._w("Update:")
             self._depth += 1
-            node.update.accept(self)
+            yield node.update
             self._depth -= 1
         self._w("Body:")
         self._depth += 1
-        node.body.accept(self)
+        yield node.body
         self._depth -= 1
         self._depth -= 1
 
@@ -155,7 +232,7 @@ class TextPrinter(ASTVisitor):
         self._w(f"Return{self._type_ann(node)} {self._loc(node)}")
         if node.value:
             self._depth += 1
-            node.value.accept(self)
+            yield node.value
             self._depth -= 1
 
     # ── Expressions ────────────────────────────────────────────────────────
@@ -167,19 +244,26 @@ class TextPrinter(ASTVisitor):
         self._w(f"Identifier: {node.name}{self._type_ann(node)}"
                 f" {self._loc(node)}")
 
+    def visit_member_expr(self, node: MemberExprNode) -> None:
+        self._w(f"Member: .{node.field_name}{self._type_ann(node)}"
+                f" {self._loc(node)}")
+        self._depth += 1
+        yield node.base
+        self._depth -= 1
+
     def visit_binary_expr(self, node: BinaryExprNode) -> None:
         self._w(f"Binary: {node.operator!r}{self._type_ann(node)}"
                 f" {self._loc(node)}")
         self._depth += 1
-        node.left.accept(self)
-        node.right.accept(self)
+        yield node.left
+        yield node.right
         self._depth -= 1
 
     def visit_unary_expr(self, node: UnaryExprNode) -> None:
         self._w(f"Unary: {node.operator!r}{self._type_ann(node)}"
                 f" {self._loc(node)}")
         self._depth += 1
-        node.operand.accept(self)
+        yield node.operand
         self._depth -= 1
 
     def visit_call_expr(self, node: CallExprNode) -> None:
@@ -187,14 +271,14 @@ class TextPrinter(ASTVisitor):
                 f" {self._loc(node)}")
         self._depth += 1
         for arg in node.arguments:
-            arg.accept(self)
+            yield arg
         self._depth -= 1
 
     def visit_assignment_expr(self, node: AssignmentExprNode) -> None:
         self._w(f"Assignment: {node.target} {node.operator}"
                 f"{self._type_ann(node)} {self._loc(node)}")
         self._depth += 1
-        node.value.accept(self)
+        yield node.value
         self._depth -= 1
 
 
@@ -214,23 +298,43 @@ class DotPrinter(ASTVisitor):
         "param":       "#D7BDE2",
     }
 
+    _HEADER = ("digraph AST {", '  node [shape=box fontname="Courier"];')
+
     def __init__(self) -> None:
         self._nodes: list[str] = []
         self._edges: list[str] = []
+        self._emit_node: Callable[[str], Any] = self._nodes.append
+        self._emit_edge: Callable[[str], Any] = self._edges.append
         self._counter: int = 0
 
-    def generate(self, root: ASTNode) -> str:
+    def generate(self, root: ASTNode, max_depth: Optional[int] = None) -> str:
         self._nodes.clear()
         self._edges.clear()
         self._counter = 0
-        root.accept(self)
-        lines = ["digraph AST {",
-                 '  node [shape=box fontname="Courier"];']
+        _walk_limited(self, root, max_depth, self._elide)
+        lines = list(self._HEADER)
         lines.extend(self._nodes)
         lines.extend(self._edges)
         lines.append("}")
         return '\n'.join(lines)
 
+    def write(self, root: ASTNode, out: IO[str],
+              max_depth: Optional[int] = None) -> None:
+        """
+        Stream the graph to `out`. Edges follow the nodes they join instead
+        of being collected after all nodes, which describes the same graph.
+        """
+        self._counter = 0
+        emit = self._emit_node = self._emit_edge = lambda line: out.write(line + "\n")
+        for line in self._HEADER:
+            emit(line)
+        try:
+            _walk_limited(self, root, max_depth, self._elide)
+        finally:
+            self._emit_node = self._nodes.append
+            self._emit_edge = self._edges.append
+        emit("}")
+
     def _new_id(self) -> str:
         self._counter += 1
         return f"n{self._counter}"
@@ -239,14 +343,17 @@ class DotPrinter(ASTVisitor):
         nid    = self._new_id()
         colour = self._COLOURS.get(category, "#FFFFFF")
         safe   = label.replace('"', '\\"')
-        self._nodes.append(
+        self._emit_node(
             f'  {nid} [label="{safe}" style=filled fillcolor="{colour}"];'
         )
         return nid
 
+    def _elide(self, node: ASTNode) -> str:
+        return self._node(f"{_kind(node)}\\n...", "elided")
+
     def _edge(self, parent: str, child: str, label: str = "") -> None:
         lbl = f' [label="{label}"]' if label else ""
-        self._edges.append(f"  {parent} -> {child}{lbl};")
+        self._emit_edge(f"  {parent} -> {child}{lbl};")
 
     # All visitor methods share the same pattern: create node, recurse,
     # add edges.  Only a representative subset is shown for brevity.
@@ -254,7 +361,7 @@ class DotPrinter(ASTVisitor):
     def visit_program(self, node: ProgramNode) -> str:
         nid = self._node("Program", "program")
         for decl in node.declarations:
-            child = decl.accept(self)
+            child = yield decl
             self._edge(nid, child)
         return nid
 
@@ -262,16 +369,16 @@ class DotPrinter(ASTVisitor):
         label = f"fn {node.name}\\n-> {node.return_type}"
         nid   = self._node(label, "declaration")
         for p in node.params:
-            child = p.accept(self)
+            child = yield p
             self._edge(nid, child, "param")
-        body = node.body.accept(self)
+        body = yield node.body
         self._edge(nid, body, "body")
         return nid
 
     def visit_struct_decl(self, node: StructDeclNode) -> str:
         nid = self._node(f"struct {node.name}", "declaration")
         for f in node.fields:
-            child = f.accept(self)
+            child = yield f
             self._edge(nid, child, "field")
         return nid
 
@@ -281,61 +388,61 @@ class DotPrinter(ASTVisitor):
     def visit_block_stmt(self, node: BlockStmtNode) -> str:
         nid = self._node("Block", "statement")
         for s in node.statements:
-            child = s.accept(self)
+            child = yield s
             self._edge(nid, child)
         return nid
 
     def visit_var_decl_stmt(self, node: VarDeclStmtNode) -> str:
         nid = self._node(f"VarDecl\\n{node.var_type} {node.name}", "statement")
         if node.initializer:
-            child = node.initializer.accept(self)
+            child = yield node.initializer
             self._edge(nid, child, "init")
         return nid
 
     def visit_expr_stmt(self, node: ExprStmtNode) -> str:
         nid   = self._node("ExprStmt", "statement")
-        child = node.expression.accept(self)
+        child = yield node.expression
         self._edge(nid, child)
         return nid
 
     def visit_if_stmt(self, node: IfStmtNode) -> str:
         nid  = self._node("If", "statement")
-        cond = node.condition.accept(self)
+        cond = yield node.condition
         self._edge(nid, cond, "cond")
-        then = node.then_branch.accept(self)
+        then = yield node.then_branch
         self._edge(nid, then, "then")
         if node.else_branch:
-            else_ = node.else_branch.accept(self)
+            else_ = yield node.else_branch
             self._edge(nid, else_, "else")
         return nid
 
     def visit_while_stmt(self, node: WhileStmtNode) -> str:
         nid  = self._node("While", "statement")
-        cond = node.condition.accept(self)
+        cond = yield node.condition
         self._edge(nid, cond, "cond")
-        body = node.body.accept(self)
+        body = yield node.body
         self._edge(nid, body, "body")
         return nid
 
     def visit_for_stmt(self, node: ForStmtNode) -> str:
         nid = self._node("For", "statement")
         if node.init:
-            c = node.init.accept(self)
+            c = yield node.init
             self._edge(nid, c, "init")
         if node.condition:
-            c = node.condition.accept(self)
+            c = yield node.condition
             self._edge(nid, c, "cond")
         if node.update:
-            c = node.update.accept(self)
+            c = yield node.update
             self._edge(nid, c, "update")
-        body = node.body.accept(self)
+        body = yield node.body
         self._edge(nid, body, "body")
         return nid
 
     def visit_return_stmt(self, node: ReturnStmtNode) -> str:
         nid = self._node("Return", "statement")
         if node.value:
-            child = node.value.accept(self)
+            child = yield node.value
             self._edge(nid, child, "value")
         return nid
 
@@ -345,30 +452,36 @@ class DotPrinter(ASTVisitor):
     def visit_identifier_expr(self, node: IdentifierExprNode) -> str:
         return self._node(f"Identifier\\n{node.name}", "expression")
 
+    def visit_member_expr(self, node: MemberExprNode) -> str:
+        nid  = self._node(f"Member\\n.{node.field_name}", "expression")
+        base = yield node.base
+        self._edge(nid, base, "base")
+        return nid
+
     def visit_binary_expr(self, node: BinaryExprNode) -> str:
         nid   = self._node(f"Binary\\n{node.operator}", "expression")
-        left  = node.left.accept(self)
-        right = node.right.accept(self)
+        left  = yield node.left
+        right = yield node.right
         self._edge(nid, left,  "left")
         self._edge(nid, right, "right")
         return nid
 
     def visit_unary_expr(self, node: UnaryExprNode) -> str:
         nid     = self._node(f"Unary\\n{node.operator}", "expression")
-        operand = node.operand.accept(self)
+        operand = yield node.operand
         self._edge(nid, operand)
         return nid
 
     def visit_call_expr(self, node: CallExprNode) -> str:
         nid = self._node(f"Call\\n{node.callee}()", "expression")
         for i, arg in enumerate(node.arguments):
-            child = arg.accept(self)
+            child = yield arg
             self._edge(nid, child, f"arg{i}")
         return nid
 
     def visit_assignment_expr(self, node: AssignmentExprNode) -> str:
         nid   = self._node(f"Assign\\n{node.target} {node.operator}", "expression")
-        child = node.value.accept(self)
+        child = yield node.value
         self._edge(nid, child, "value")
         return nid
 
@@ -377,21 +490,101 @@ class DotPrinter(ASTVisitor):
 #  JSON serialiser
 # ══════════════════════════════════════════════════════════════════════════════
 
+_encode_scalar = json.JSONEncoder(default=str).encode
+
+
+class _Subtree(NamedTuple):
+    """A node not yet visited by JsonPrinter, `depth` levels below the root."""
+    node:  ASTNode
+    depth: int
+
+
+def _encode_json(value: Any, level: int, write: Callable[[str], Any],
+                 expand: Callable[[_Subtree], dict]):
+    """
+    Write `value` out as json.dumps(value, indent=2, default=str) would
+    format it, turning each _Subtree into its dict with `expand` only when
+    the encoder reaches it. Nested containers are yielded as sub-tasks for
+    trampoline.run, since the stdlib encoder recurses once per level.
+    """
+    if isinstance(value, _Subtree):
+        value = expand(value)
+    if isinstance(value, dict):
+        items = value.items()
+        opening, closing = "{", "}"
+    elif isinstance(value, list):
+        items = ((None, item) for item in value)
+        opening, closing = "[", "]"
+    else:
+        write(_encode_scalar(value))
+        return
+
+    indent = "\n" + "  " * (level + 1)
+    separator = opening + indent
+    empty = True
+    for key, item in items:
+        write(separator)
+        if key is not None:
+            write(_encode_scalar(key) + ": ")
+        if isinstance(item, (dict, list, _Subtree)):
+            yield _encode_json(item, level + 1, write, expand)
+        else:
+            write(_encode_scalar(item))
+        separator = "," + indent
+        empty = False
+    write(opening + closing if empty else "\n" + "  " * level + closing)
+
+
 class JsonPrinter(ASTVisitor):
-    """Serialises the AST to a JSON-compatible dict tree."""
+    """
+    Serialises the AST to a JSON-compatible dict tree. walk(printer, node)
+    builds the whole tree; serialise() and write() build one node's dict
+    at a time, as the encoder reaches it.
+    """
 
-    def serialise(self, node: ASTNode) -> str:
-        data = node.accept(self)
-        return json.dumps(data, indent=2, default=str)
+    def __init__(self) -> None:
+        self._max_depth: Optional[int] = None
+
+    def serialise(self, node: ASTNode, max_depth: Optional[int] = None) -> str:
+        out: List[str] = []
+        self._encode(node, out.append, max_depth)
+        return "".join(out)
+
+    def write(self, node: ASTNode, out: IO[str],
+              max_depth: Optional[int] = None) -> None:
+        """Stream serialise(node, max_depth) to `out`."""
+        self._encode(node, out.write, max_depth)
+        out.write("\n")
+
+    def _encode(self, node: ASTNode, write: Callable[[str], Any],
+                max_depth: Optional[int]) -> None:
+        self._max_depth = max_depth
+        trampoline.run(_encode_json(_Subtree(node, 0), 0, write, self._expand))
+
+    def _expand(self, subtree: _Subtree) -> dict:
+        # Visit one node, leaving each child as a _Subtree in its dict.
+        node, depth = subtree
+        if self._max_depth is not None and depth > self._max_depth:
+            return {"node": _kind(node), **self._loc(node), "elided": True}
+        result = node.accept(self)
+        if type(result) is not GeneratorType:
+            return result
+        return trampoline.run(result, lambda child: _Subtree(child, depth + 1))
 
     def _loc(self, node: ASTNode) -> dict:
         return {"line": node.line, "column": node.column}
 
+    def _each(self, nodes: List[ASTNode]):
+        items = []
+        for child in nodes:
+            items.append((yield child))
+        return items
+
     def visit_program(self, node: ProgramNode) -> dict:
         return {
             "node": "Program",
             **self._loc(node),
-            "declarations": [d.accept(self) for d in node.declarations],
+            "declarations": (yield from self._each(node.declarations)),
         }
 
     def visit_function_decl(self, node: FunctionDeclNode) -> dict:
@@ -400,8 +593,8 @@ class JsonPrinter(ASTVisitor):
             **self._loc(node),
             "name": node.name,
             "return_type": node.return_type,
-            "params": [p.accept(self) for p in node.params],
-            "body": node.body.accept(self),
+            "params": (yield from self._each(node.params)),
+            "body": (yield node.body),
         }
 
     def visit_struct_decl(self, node: StructDeclNode) -> dict:
@@ -409,7 +602,7 @@ class JsonPrinter(ASTVisitor):
             "node": "StructDecl",
             **self._loc(node),
             "name": node.name,
-            "fields": [f.accept(self) for f in node.fields],
+            "fields": (yield from self._each(node.fields)),
         }
 
     def visit_param(self, node: ParamNode) -> dict:
@@ -418,44 +611,44 @@ class JsonPrinter(ASTVisitor):
 
     def visit_block_stmt(self, node: BlockStmtNode) -> dict:
         return {"node": "Block", **self._loc(node),
-                "statements": [s.accept(self) for s in node.statements]}
+                "statements": (yield from self._each(node.statements))}
 
     def visit_var_decl_stmt(self, node: VarDeclStmtNode) -> dict:
         return {
             "node": "VarDecl", **self._loc(node),
             "type": node.var_type, "name": node.name,
-            "initializer": node.initializer.accept(self) if node.initializer else None,
+            "initializer": (yield node.initializer) if node.initializer else None,
         }
 
     def visit_expr_stmt(self, node: ExprStmtNode) -> dict:
         return {"node": "ExprStmt", **self._loc(node),
-                "expression": node.expression.accept(self)}
+                "expression": (yield node.expression)}
 
     def visit_if_stmt(self, node: IfStmtNode) -> dict:
         return {
             "node": "If", **self._loc(node),
-            "condition":   node.condition.accept(self),
-            "then_branch": node.then_branch.accept(self),
-            "else_branch": node.else_branch.accept(self) if node.else_branch else None,
+            "condition":   (yield node.condition),
+            "then_branch": (yield node.then_branch),
+            "else_branch": (yield node.else_branch) if node.else_branch else None,
         }
 
     def visit_while_stmt(self, node: WhileStmtNode) -> dict:
         return {"node": "While", **self._loc(node),
-                "condition": node.condition.accept(self),
-                "body":      node.body.accept(self)}
+                "condition": (yield node.condition),
+                "body":      (yield node.body)}
 
     def visit_for_stmt(self, node: ForStmtNode) -> dict:
         return {
             "node": "For", **self._loc(node),
-            "init":      node.init.accept(self) if node.init else None,
-            "condition": node.condition.accept(self) if node.condition else None,
-            "update":    node.update.accept(self) if node.update else None,
-            "body":      node.body.accept(self),
+            "init":      (yield node.init) if node.init else None,
+            "condition": (yield node.condition) if node.condition else None,
+            "update":    (yield node.update) if node.update else None,
+            "body":      (yield node.body),
         }
 
     def visit_return_stmt(self, node: ReturnStmtNode) -> dict:
         return {"node": "Return", **self._loc(node),
-                "value": node.value.accept(self) if node.value else None}
+                "value": (yield node.value) if node.value else None}
 
     def visit_literal_expr(self, node: LiteralExprNode) -> dict:
         return {"node": "Literal", **self._loc(node),
@@ -466,29 +659,36 @@ class JsonPrinter(ASTVisitor):
         return {"node": "Identifier", **self._loc(node),
                 "name": node.name, "type": node.resolved_type}
 
+    def visit_member_expr(self, node: MemberExprNode) -> dict:
+        return {"node": "Member", **self._loc(node),
+                "field": node.field_name,
+                "base": (yield node.base),
+                "field_index": node.field_index, "offset": node.offset,
+                "type": node.resolved_type}
+
     def visit_binary_expr(self, node: BinaryExprNode) -> dict:
         return {"node": "Binary", **self._loc(node),
                 "operator": node.operator,
-                "left":  node.left.accept(self),
-                "right": node.right.accept(self),
+                "left":  (yield node.left),
+                "right": (yield node.right),
                 "type":  node.resolved_type}
 
     def visit_unary_expr(self, node: UnaryExprNode) -> dict:
         return {"node": "Unary", **self._loc(node),
                 "operator": node.operator,
-                "operand":  node.operand.accept(self),
+                "operand":  (yield node.operand),
                 "type":     node.resolved_type}
 
     def visit_call_expr(self, node: CallExprNode) -> dict:
         return {"node": "Call", **self._loc(node),
                 "callee": node.callee,
-                "arguments": [a.accept(self) for a in node.arguments],
+                "arguments": (yield from self._each(node.arguments)),
                 "type": node.resolved_type}
 
     def visit_assignment_expr(self, node: AssignmentExprNode) -> dict:
         return {"node": "Assignment", **self._loc(node),
-                "target": node.target, "operator": node.operator,
-                "value": node.value.accept(self),
+                "target": str(node.target), "operator": node.operator,
+                "value": (yield node.value),
                 "type":  node.resolved_type}
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -0,0 +1,169 @@
+"""
+Compact binary encoding of AST trees.
+
+A tree is flattened into a tuple of records, one per node:
+(tag, resolved_type, line, column, *fields). A child node is stored as
+the number of its record and a list of nodes as a tuple of numbers.
+Children are always numbered after their parent, so loading builds the
+records back to front and every child exists before its parent. The
+records go through marshal, which encodes flat tuples of scalars in C;
+neither direction recurses on deep trees.
+
+The record layout is derived from the node dataclasses; SCHEMA_ID changes
+whenever a node class or field does, and stale data is rejected.
+
+fingerprint() digests the same records without what the semantic analyser
+adds, for telling whether two subtrees would be analysed alike.
+"""
+import hashlib
+import marshal
+from dataclasses import fields
+from inspect import isabstract
+from operator import attrgetter
+from typing import Dict, List, Tuple, Type, Union, get_args, get_origin
+
+from . import ast_nodes
+from .ast_nodes import ASTNode, FunctionDeclNode, LazyFunctionDeclNode
+
+_MAGIC = "MCAST1"
+
+_VALUE, _NODE, _NODES = 0, 1, 2
+
+
+def _field_kind(annotation) -> int:
+    origin = get_origin(annotation)
+    if origin is list:
+        (item,) = get_args(annotation)
+        return _NODES if issubclass(item, ASTNode) else _VALUE
+    if origin is Union:
+        args = [a for a in get_args(annotation) if a is not type(None)]
+        return _field_kind(args[0]) if len(args) == 1 else _VALUE
+    if isinstance(annotation, type) and issubclass(annotation, ASTNode):
+        return _NODE
+    return _VALUE
+
+
+# Concrete node classes, by tag. LazyFunctionDeclNode is not among them:
+# it is written as the FunctionDeclNode it stands for.
+_CLASSES: List[Type[ASTNode]] = sorted(
+    (cls for cls in vars(ast_nodes).values()
+     if isinstance(cls, type) and issubclass(cls, ASTNode)
+     and "__dataclass_params__" in cls.__dict__ and not isabstract(cls)),
+    key=lambda cls: cls.__name__,
+)
+_TAGS: Dict[type, int] = {cls: tag for tag, cls in enumerate(_CLASSES)}
+_TAGS[LazyFunctionDeclNode] = _TAGS[FunctionDeclNode]
+
+# Per tag: init field names, a getter returning their values as a tuple,
+# and the (position, kind) of the fields among them that hold nodes.
+_FIELDS: List[Tuple[str, ...]] = []
+_GETTERS: List[attrgetter] = []
+_LINKS: List[Tuple[Tuple[int, int], ...]] = []
+for _cls in _CLASSES:
+    _init = [f for f in fields(_cls) if f.init]
+    _FIELDS.append(tuple(f.name for f in _init))
+    _GETTERS.append(attrgetter(*_FIELDS[-1]))
+    _LINKS.append(tuple(
+        (position, kind)
+        for position, kind in enumerate(_field_kind(f.type) for f in _init)
+        if kind != _VALUE
+    ))
+
+# The same per tag for fingerprint(), leaving out annotation fields.
+_KEY_GETTERS: List[attrgetter] = []
+_KEY_LINKS: List[Tuple[Tuple[int, int], ...]] = []
+for _cls in _CLASSES:
+    _init = [f for f in fields(_cls) if f.init and not f.metadata.get("annotation")]
+    _KEY_GETTERS.append(attrgetter(*(f.name for f in _init)))
+    _KEY_LINKS.append(tuple(
+        (position, kind)
+        for position, kind in enumerate(_field_kind(f.type) for f in _init)
+        if kind != _VALUE
+    ))
+
+SCHEMA_ID = hashlib.blake2b(
+    repr([(cls.__name__, names, links)
+          for cls, names, links in zip(_CLASSES, _FIELDS, _LINKS)]).encode(),
+    digest_size=8,
+).hexdigest()
+
+
+def dumps(tree: ASTNode) -> bytes:
+    """Encode `tree` (usually a ProgramNode) and everything below it."""
+    records: List[tuple] = [()]
+    stack: List[Tuple[ASTNode, int]] = [(tree, 0)]
+    while stack:
+        node, number = stack.pop()
+        tag = _TAGS[type(node)]
+        values = list(_GETTERS[tag](node))
+        for position, kind in _LINKS[tag]:
+            value = values[position]
+            if kind == _NODE:
+                if value is not None:
+                    values[position] = len(records)
+                    records.append(())
+                    stack.append((value, values[position]))
+            else:
+                first = len(records)
+                records.extend(() for _ in value)
+                stack.extend(zip(value, range(first, len(records))))
+                values[position] = tuple(range(first, len(records)))
+        records[number] = (tag, node.resolved_type, *values)
+    return marshal.dumps((_MAGIC, SCHEMA_ID, tuple(records)))
+
+
+def fingerprint(tree: ASTNode) -> bytes:
+    """
+    Digest of `tree` as the parser built it. Resolved types and other
+    annotation fields are left out, and lines count from tree.line, so a
+    subtree that was only moved up or down keeps its fingerprint.
+    """
+    records: List[tuple] = []
+    base = tree.line
+    stack: List[ASTNode] = [tree]
+    while stack:
+        node = stack.pop()
+        tag = _TAGS[type(node)]
+        values = list(_KEY_GETTERS[tag](node))
+        values[0] -= base       # line is the first init field
+        for position, kind in _KEY_LINKS[tag]:
+            value = values[position]
+            if kind == _NODE:
+                if value is not None:
+                    values[position] = True
+                    stack.append(value)
+            else:
+                values[position] = len(value)
+                stack.extend(value)
+        records.append((tag, *values))
+    return hashlib.blake2b(marshal.dumps(tuple(records)), digest_size=16).digest()
+
+
+def loads(data: bytes) -> ASTNode:
+    """
+    Decode a tree written by dumps(). Raises ValueError if `data` was not
+    produced by this version of the node classes.
+    """
+    try:
+        magic, schema, records = marshal.loads(data)
+    except (EOFError, TypeError, ValueError) as exc:
+        raise ValueError(f"not an encoded AST: {exc}") from None
+    if magic != _MAGIC or schema != SCHEMA_ID or not records:
+        raise ValueError("AST encoded with a different node schema")
+
+    nodes: List[ASTNode] = [None] * len(records)   # type: ignore[list-item]
+    for number in range(len(records) - 1, -1, -1):
+        tag, resolved_type, *args = records[number]
+        for position, kind in _LINKS[tag]:
+            value = args[position]
+            if kind == _NODE:
+                if value is not None:
+                    args[position] = nodes[value]
+            else:
+                args[position] = [nodes[i] for i in value]
+        node = _CLASSES[tag](*args)
+        if resolved_type is not None:
+            node.resolved_type = resolved_type
+        nodes[number] = node
+    return nodes[0]
+
@@ -0,0 +1,116 @@
+"""
+Parallel parsing of large token sequences.
+
+The tokens are cut before `fn` and `struct` keywords at brace depth 0.
+Each chunk ends where the next top-level declaration begins, so the chunks
+can be parsed independently in a ProcessPoolExecutor and their
+declarations and diagnostics concatenated in order.
+
+A chunk ends in an EOF token placed where the serial parser would see the
+next chunk's `fn`/`struct`. Both stop _synchronize_declaration and the
+declaration loop, so a chunk parses exactly as that stretch of the serial
+parse does, unless a rule runs into the chunk's end mid-declaration. That
+case is detected (a diagnostic lands on the chunk's EOF) and the whole
+sequence is parsed serially instead.
+"""
+import gc
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+
+from src.lexer.token_buffer import TokenBuffer
+from src.lexer.token_types import Token, TokenType
+
+PARALLEL_CHUNK_TOKENS = 1 << 16
+
+_DECLARATION_KEYWORDS = (TokenType.KW_FN, TokenType.KW_STRUCT)
+
+_TOKENS: Sequence[Token] = ()      # set in each worker by _init_worker
+
+
+def find_declaration_boundaries(tokens: Sequence[Token],
+                                chunk_size: int = PARALLEL_CHUNK_TOKENS) -> List[int]:
+    """
+    Token indices at which `tokens` may be split for independent parsing.
+
+    Each boundary is a top-level `fn` or `struct` keyword at least
+    `chunk_size` tokens after the previous boundary.
+    """
+    if isinstance(tokens, TokenBuffer):
+        types = tokens.iter_types()
+    else:
+        types = (token.type for token in tokens)
+
+    lbrace, rbrace = TokenType.LBRACE, TokenType.RBRACE
+    boundaries: List[int] = []
+    depth = 0
+    target = chunk_size
+    for index, ttype in enumerate(types):
+        if ttype is lbrace:
+            depth += 1
+        elif ttype is rbrace:
+            depth -= 1
+        elif depth == 0 and index >= target and ttype in _DECLARATION_KEYWORDS:
+            boundaries.append(index)
+            target = index + chunk_size
+    return boundaries
+
+
+def _init_worker(tokens: Sequence[Token]) -> None:
+    global _TOKENS
+    _TOKENS = tokens
+    # Objects inherited from the parent are never garbage; keep the
+    # collector off them (and off their copy-on-write pages).
+    gc.freeze()
+
+
+def _parse_chunk(job: Tuple[int, int]):
+    from .parser import Parser
+
+    start, end = job
+    chunk = _TOKENS[start:end]
+    if end < len(_TOKENS):
+        nxt = _TOKENS[end]
+        eof = Token(TokenType.EOF, "", nxt.line, nxt.column, None, nxt.offset)
+        chunk.append(eof)
+    else:
+        eof = chunk[-1]
+
+    parser = Parser(chunk)
+    ast = parser.parse()
+    spilled = end < len(_TOKENS) and any(
+        (e.line, e.column) == (eof.line, eof.column) for e in parser.errors
+    )
+    return ast.declarations, parser.errors, spilled
+
+
+def parse_parallel(tokens: Sequence[Token], workers: Optional[int] = None,
+                   chunk_size: int = PARALLEL_CHUNK_TOKENS):
+    """
+    Parse `tokens` in chunks of whole declarations on `workers` processes.
+
+    Returns (declarations, errors) identical to a serial Parser run, or
+    None if a chunk could not be parsed independently.
+    """
+    bounds = [0] + find_declaration_boundaries(tokens, chunk_size) + [len(tokens)]
+    jobs = list(zip(bounds, bounds[1:]))
+
+    declarations = []
+    errors = []
+    # Unpickling the fragments allocates a whole AST's worth of acyclic
+    # objects in bursts, which would trigger a full collection every few
+    # chunks; the collector is paused until they are all in.
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count(),
+                                 initializer=_init_worker, initargs=(tokens,)) as pool:
+            for chunk_decls, chunk_errors, spilled in pool.map(_parse_chunk, jobs):
+                if spilled:
+                    return None
+                declarations.extend(chunk_decls)
+                errors.extend(chunk_errors)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return declarations, errors
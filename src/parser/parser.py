@@ -1,13 +1,21 @@
 
-from typing import List, Optional, Callable, Set
+from array import array
+from bisect import bisect_right
+from collections.abc import Sequence
+from functools import partial
+from typing import Any, Dict, Generator, Iterable, List, Optional, Set, Tuple, TypeVar, Union
 from src.lexer.token_types import Token, TokenType
+from src.lexer.token_buffer import TokenBuffer
+from src.lexer.token_stream import TokenStream
+from src.utils import trampoline
+from .parallel import PARALLEL_CHUNK_TOKENS, parse_parallel
 from .ast_nodes import (
     ExpressionNode, StatementNode, DeclarationNode,
-    ProgramNode, FunctionDeclNode, StructDeclNode, ParamNode,
+    ProgramNode, FunctionDeclNode, LazyFunctionDeclNode, StructDeclNode, ParamNode,
     BlockStmtNode, VarDeclStmtNode, ExprStmtNode,
     IfStmtNode, WhileStmtNode, ForStmtNode, ReturnStmtNode,
-    LiteralExprNode, IdentifierExprNode, BinaryExprNode,
-    UnaryExprNode, CallExprNode, AssignmentExprNode,
+    LiteralExprNode, IdentifierExprNode, MemberExprNode, BinaryExprNode,
+    UnaryExprNode, CallExprNode, AssignmentExprNode, iter_nodes,
 )
 
 class ParseError(Exception):
@@ -27,6 +35,14 @@ class ParserDiagnostic:
         return f"parse error at {self.line}:{self.column}: {self.message}"
 
 
+_T = TypeVar("_T")
+_EOF = TokenType.EOF
+
+# A grammar rule: a generator, run by trampoline.run, that yields the
+# sub-rules whose results it needs and returns its node.
+Rule = Generator[Any, Any, _T]
+
+
 _TYPE_KEYWORDS: Set[TokenType] = {
     TokenType.KW_INT, TokenType.KW_FLOAT,
     TokenType.KW_BOOL, TokenType.KW_VOID,
@@ -39,38 +55,283 @@ _ASSIGN_OPS: Set[TokenType] = {
     TokenType.SLASH_ASSIGN,
 }
 
+# Binding powers of the binary operators for the operator-precedence loop
+# in _parse_assignment. All of them are left-associative; a higher power binds
+# tighter. Assignment (right-associative, lowest) is handled on top.
+_BINARY_PRECEDENCE: Dict[TokenType, int] = {
+    TokenType.PIPE_PIPE: 1,
+    TokenType.AMP_AMP:   2,
+    TokenType.EQ_EQ:     3, TokenType.BANG_EQ: 3,
+    TokenType.LT:        4, TokenType.LT_EQ:   4,
+    TokenType.GT:        4, TokenType.GT_EQ:   4,
+    TokenType.PLUS:      5, TokenType.MINUS:   5,
+    TokenType.STAR:      6, TokenType.SLASH:   6, TokenType.PERCENT: 6,
+}
+
+_UNARY_OPS: Set[TokenType] = {TokenType.MINUS, TokenType.BANG}
+
+_LITERAL_KINDS: Dict[TokenType, str] = {
+    TokenType.INT_LITERAL:    'int',
+    TokenType.FLOAT_LITERAL:  'float',
+    TokenType.BOOL_LITERAL:   'bool',
+    TokenType.STRING_LITERAL: 'string',
+}
+
+
+# Tokens are compared a block at a time: one C-level list/array comparison
+# per block, falling back to a per-token loop only in blocks where it fails.
+_COMPARE_BLOCK = 256
+
+
+def _token_positions(tokens: Sequence[Token]) -> Tuple[array, array]:
+    """The lines and columns of `tokens`, as they are now."""
+    return (array('i', [token.line for token in tokens]),
+            array('i', [token.column for token in tokens]))
+
+
+def _same_content(a: Token, b: Token) -> bool:
+    return a is b or (a.type is b.type and a.lexeme == b.lexeme and a.literal == b.literal)
+
+
+def _common_ends(old: Sequence[Token], new: Sequence[Token],
+                 old_positions: Tuple[array, array],
+                 new_positions: Tuple[array, array]) -> Tuple[int, int]:
+    """
+    Lengths of the longest common prefix of two token sequences, and of the
+    longest common suffix after it up to a uniform line shift. Positions
+    are taken from the (lines, columns) arrays rather than the tokens:
+    Scanner.relex moves the tokens it carries over into `new` in place, so
+    `old_positions` must be those `old` had when it was parsed.
+    """
+    (old_lines, old_columns), (new_lines, new_columns) = old_positions, new_positions
+    limit = min(len(old), len(new))
+
+    prefix = 0
+    while prefix < limit:
+        end = min(prefix + _COMPARE_BLOCK, limit)
+        if (old_lines[prefix:end] == new_lines[prefix:end]
+                and old_columns[prefix:end] == new_columns[prefix:end]
+                and old[prefix:end] == new[prefix:end]):
+            prefix = end
+            continue
+        while (prefix < end and _same_content(old[prefix], new[prefix])
+               and old_lines[prefix] == new_lines[prefix]
+               and old_columns[prefix] == new_columns[prefix]):
+            prefix += 1
+        if prefix < end:
+            break
+
+    shift = len(new) - len(old)
+    line_shift = new_lines[-1] - old_lines[-1]
+    suffix = 0
+    limit -= prefix
+    while suffix < limit:
+        count = min(_COMPARE_BLOCK, limit - suffix)
+        start = len(old) - suffix - count
+        stop = start + count
+        lines = old_lines[start:stop]
+        if line_shift:
+            lines = array('i', [line + line_shift for line in lines])
+        if (lines == new_lines[start + shift:stop + shift]
+                and old_columns[start:stop] == new_columns[start + shift:stop + shift]
+                and old[start:stop] == new[start + shift:stop + shift]):
+            suffix += count
+            continue
+        index = stop - 1
+        while (index >= start and _same_content(old[index], new[index + shift])
+               and old_lines[index] + line_shift == new_lines[index + shift]
+               and old_columns[index] == new_columns[index + shift]):
+            index -= 1
+        suffix += stop - 1 - index
+        if index >= start:
+            break
+    return prefix, suffix
+
 
 class Parser:
-    def __init__(self, tokens: List[Token]) -> None:
-        self._tokens:  List[Token]           = tokens
+    def __init__(self, tokens: Union[List[Token], Iterable[Token]],
+                 lazy_bodies: bool = False) -> None:
+        # Sequences (a list or a TokenBuffer) are indexed directly; any other
+        # iterable, such as Scanner.iter_tokens(), is consumed through a
+        # small lookahead window.
+        if not isinstance(tokens, Sequence):
+            tokens = TokenStream(tokens)
+        self._tokens:  Union[Sequence[Token], TokenStream] = tokens
         self._pos:     int                   = 0
         self.errors:   List[ParserDiagnostic] = []
+        # With lazy_bodies, function bodies are skipped by brace matching and
+        # parsed when first read (see LazyFunctionDeclNode); their errors are
+        # inserted into self.errors, in source order, at that point. They
+        # match an eager parse's unless its recovery would leave the body:
+        # when the block closes early or runs out of tokens, the eager parse
+        # resynchronizes at the next 'fn' or 'struct' even past the body's
+        # closing brace, reports a missing '}' against the token after it,
+        # and drops the function, while a lazy body stops at its brace and
+        # keeps the function. Coming back to a body needs random access, so
+        # a token stream is always parsed eagerly.
+        self.lazy_bodies: bool = lazy_bodies and isinstance(tokens, Sequence)
+        # One (first token index, declaration or None, len(self.errors)) entry
+        # per top-level parse attempt, in order, and the tree they made up;
+        # reparse() uses them to tell what an edit can have affected.
+        self._top_level: Optional[List[Tuple[int, Optional[DeclarationNode], int]]] = None
+        self._result:    Optional[ProgramNode] = None
+        # Token positions as parsed, for lists only: their tokens are the
+        # ones Scanner.relex may shift in place before the next reparse().
+        self._positions: Optional[Tuple[array, array]] = None
+
+    def parse(self, workers: int = 1,
+              chunk_size: int = PARALLEL_CHUNK_TOKENS) -> Optional[ProgramNode]:
+        """
+        Parse the whole token sequence into a ProgramNode.
+
+        With workers > 1, sequences longer than chunk_size tokens are split
+        between top-level declarations and the pieces are parsed in worker
+        processes; function bodies are then parsed eagerly even with
+        lazy_bodies. Token streams are always parsed serially.
+        """
+        tokens = self._tokens
+        self._top_level = None
+        if workers > 1 and isinstance(tokens, Sequence) and len(tokens) > chunk_size:
+            parsed = parse_parallel(tokens, workers, chunk_size)
+            if parsed is not None:
+                declarations, errors = parsed
+                self.errors.extend(errors)
+                self._pos = len(tokens) - 1
+                self._result = ProgramNode(declarations=declarations, line=1, column=1)
+                return self._result
+
+        self._top_level = []
+        self._positions = _token_positions(tokens) if isinstance(tokens, list) else None
+        return self._run(self._parse_program())
+
+    def reparse(self, old_ast: Optional[ProgramNode], old_tokens: Sequence[Token],
+                new_tokens: Sequence[Token]) -> Optional[ProgramNode]:
+        """
+        Parse `new_tokens`, an edited copy of `old_tokens`, reusing the
+        top-level declarations of `old_ast` that the edit cannot affect.
+
+        `old_ast` and `old_tokens` must be the result and input of this
+        parser's last parse() or reparse(); otherwise, and for lazy or
+        parallel parses and token streams, new_tokens is parsed from
+        scratch. Declarations whose tokens (and the one after them) all
+        precede the first changed token are kept. Parsing restarts at the
+        first other one and, like Scanner.relex, stops as soon as it reaches
+        the start of an old declaration from which the tokens are unchanged
+        but for a uniform line shift; that declaration and all after it are
+        reused by identity, their lines shifted in place. self.errors is
+        updated to match, and the parser is left ready for the next edit.
+        """
+        top_level = self._top_level
+        if (top_level is None or old_ast is None or old_ast is not self._result
+                or old_tokens is not self._tokens or self.lazy_bodies
+                or not isinstance(new_tokens, Sequence)):
+            self._reset(new_tokens)
+            return self.parse()
+
+        positions = _token_positions(new_tokens)
+        prefix, suffix = _common_ends(old_tokens, new_tokens,
+                                      self._positions or _token_positions(old_tokens),
+                                      positions)
+        kept = 0
+        while kept + 1 < len(top_level) and top_level[kept + 1][0] + 1 < prefix:
+            kept += 1
+        restart, _decl, restart_errors = top_level[kept] if top_level else (0, None, 0)
+
+        shift = len(new_tokens) - len(old_tokens)
+        suffix_start = len(new_tokens) - suffix
+        old_index = {start: index for index, (start, _d, _e) in enumerate(top_level)}
+        resumed: List[int] = []
+
+        def resync(pos: int) -> bool:
+            if pos < suffix_start:
+                return False
+            index = old_index.get(pos - shift)
+            if index is None or index <= kept:
+                return False
+            decl = top_level[index][1]
+            # The node's position is that of its first token before the edit.
+            if decl is None or decl.column != new_tokens[pos].column:
+                return False
+            resumed.append(index)
+            return True
+
+        old_errors = self.errors
+        self._tokens = new_tokens
+        self._pos = restart
+        self._top_level = top_level[:kept]
+        self.errors = old_errors[:restart_errors]
+        self._positions = positions if isinstance(new_tokens, list) else None
+        self._result = self._run(self._parse_program(resync))
+
+        if resumed:
+            index = resumed[0]
+            start, decl, errors = top_level[index]
+            line_delta = new_tokens[start + shift].line - decl.line
+            error_delta = len(self.errors) - errors
+            reused = top_level[index:]
+            for start, decl, errors in reused:
+                self._top_level.append((start + shift, decl, errors + error_delta))
+            self.errors.extend(
+                ParserDiagnostic(e.message, e.line + line_delta, e.column)
+                for e in old_errors[top_level[index][2]:]
+            )
+            if line_delta:
+                for _start, decl, _errors in reused:
+                    if decl is not None:
+                        for node in iter_nodes(decl):
+                            node.line += line_delta
+            self._pos = len(new_tokens) - 1
+            self._result.declarations.extend(
+                decl for _start, decl, _errors in reused if decl is not None
+            )
+        return self._result
+
+    def _reset(self, tokens: Union[List[Token], Iterable[Token]]) -> None:
+        if not isinstance(tokens, Sequence):
+            tokens = TokenStream(tokens)
+            self.lazy_bodies = False
+        self._tokens = tokens
+        self._pos = 0
+        self.errors = []
 
-    def parse(self) -> Optional[ProgramNode]:
+    def _run(self, rule: Rule[ProgramNode]) -> Optional[ProgramNode]:
         try:
-            return self._parse_program()
+            # Rules yield the sub-rules they need instead of calling them,
+            # so nesting depth is not limited by the recursion limit.
+            self._result = trampoline.run(rule)
         except ParseError as e:
             self._record_error(e.message, e.token)
-            return None
-
-    def _parse_program(self) -> ProgramNode:
-        decls: List[DeclarationNode] = []
+            self._result = None
+        return self._result
+
+    def _parse_program(self, resync=None) -> Rule[ProgramNode]:
+        # Top-level loop from the current position, recording every attempt
+        # in self._top_level. With `resync`, stops before an attempt at a
+        # position for which resync(pos) is true (see reparse).
+        top_level = self._top_level
         while not self._is_at_end():
+            start = self._pos
+            if resync is not None and resync(start):
+                break
+            errors = len(self.errors)
+            decl = None
             try:
-                decls.append(self._parse_declaration())
+                decl = yield self._parse_declaration()
             except ParseError as e:
                 self._record_error(e.message, e.token)
                 self._synchronize_declaration()
+            top_level.append((start, decl, errors))
+        decls = [decl for _start, decl, _errors in top_level if decl is not None]
         return ProgramNode(declarations=decls, line=1, column=1)
 
-    def _parse_declaration(self) -> DeclarationNode:
+    def _parse_declaration(self) -> Rule[DeclarationNode]:
         if self._check(TokenType.KW_FN):
             return self._parse_function_decl()
         if self._check(TokenType.KW_STRUCT):
             return self._parse_struct_decl()
         return self._parse_var_decl()
 
-    def _parse_function_decl(self) -> FunctionDeclNode:
+    def _parse_function_decl(self) -> Rule[FunctionDeclNode]:
         tok = self._consume(TokenType.KW_FN, "expected 'fn'")
         name_tok = self._consume(TokenType.IDENTIFIER, "expected function name")
         self._consume(TokenType.LPAREN, "expected '('")
@@ -85,7 +346,20 @@ class Parser:
         if self._match(TokenType.ARROW):
             ret_type = self._parse_type()
 
-        body = self._parse_block()
+        if self.lazy_bodies:
+            end = self._skip_block()
+            if end is not None:
+                start, self._pos = self._pos, end
+                return LazyFunctionDeclNode(
+                    return_type=ret_type,
+                    name=name_tok.lexeme,
+                    params=params,
+                    parse_body=partial(self._parse_body, start, end),
+                    line=tok.line,
+                    column=tok.column,
+                )
+
+        body = yield self._parse_block()
         return FunctionDeclNode(
             return_type=ret_type,
             name=name_tok.lexeme,
@@ -95,14 +369,62 @@ class Parser:
             column=tok.column,
         )
 
-    def _parse_struct_decl(self) -> StructDeclNode:
+    def _skip_block(self) -> Optional[int]:
+        """
+        Index just past the '}' matching the '{' at the current position, or
+        None if there is no '{' here or the braces do not balance before EOF.
+        """
+        tokens = self._tokens
+        if isinstance(tokens, TokenBuffer):
+            type_at = tokens.type_at    # no Token objects for skipped tokens
+        else:
+            type_at = lambda index: tokens[index].type
+        pos = self._pos
+        if type_at(pos) is not TokenType.LBRACE:
+            return None
+        depth = 0
+        while True:
+            ttype = type_at(pos)
+            pos += 1
+            if ttype is TokenType.LBRACE:
+                depth += 1
+            elif ttype is TokenType.RBRACE:
+                depth -= 1
+                if depth == 0:
+                    return pos
+            elif ttype is _EOF:
+                return None
+
+    def _parse_body(self, start: int, end: int) -> BlockStmtNode:
+        # A separate parser over just the body's tokens, so error recovery
+        # can never run past its closing brace. Within the body it recovers
+        # as the eager parse does: a ParseError out of the block, or tokens
+        # left after it, go through the same top-level loop (declarations it
+        # finds there are dropped).
+        body_parser = Parser(self._tokens[start:end] + [self._tokens[-1]])
+        open_tok = body_parser._peek()
+        try:
+            body = trampoline.run(body_parser._parse_block())
+        except ParseError as e:
+            body_parser._record_error(e.message, e.token)
+            body_parser._synchronize_declaration()
+            body = BlockStmtNode(statements=[], line=open_tok.line, column=open_tok.column)
+        body_parser._top_level = []
+        body_parser._run(body_parser._parse_program())
+        # Bodies are read in any order; keep self.errors in source order.
+        at = bisect_right(self.errors, (open_tok.line, open_tok.column),
+                          key=lambda d: (d.line, d.column))
+        self.errors[at:at] = body_parser.errors
+        return body
+
+    def _parse_struct_decl(self) -> Rule[StructDeclNode]:
         tok = self._consume(TokenType.KW_STRUCT, "expected 'struct'")
         name_tok = self._consume(TokenType.IDENTIFIER, "expected struct name")
         self._consume(TokenType.LBRACE, "expected '{'")
 
         fields: List[VarDeclStmtNode] = []
         while not self._check(TokenType.RBRACE) and not self._is_at_end():
-            fields.append(self._parse_var_decl())
+            fields.append((yield self._parse_var_decl()))
 
         self._consume(TokenType.RBRACE, "expected '}'")
         return StructDeclNode(
@@ -144,7 +466,7 @@ class Parser:
             return tok.lexeme
         raise ParseError(f"expected type, got {tok.lexeme!r}", tok)
 
-    def _parse_statement(self) -> StatementNode:
+    def _parse_statement(self) -> Rule[StatementNode]:
         if self._check(TokenType.LBRACE):
             return self._parse_block()
         if self._check(TokenType.KW_IF):
@@ -159,13 +481,13 @@ class Parser:
             return self._parse_var_decl()
         return self._parse_expr_stmt()
 
-    def _parse_block(self) -> BlockStmtNode:
+    def _parse_block(self) -> Rule[BlockStmtNode]:
         tok = self._consume(TokenType.LBRACE, "expected '{'")
         stmts: List[StatementNode] = []
 
         while not self._check(TokenType.RBRACE) and not self._is_at_end():
             try:
-                stmts.append(self._parse_statement())
+                stmts.append((yield self._parse_statement()))
             except ParseError as e:
                 self._record_error(e.message, e.token)
                 self._synchronize_statement()
@@ -173,70 +495,70 @@ class Parser:
         self._consume(TokenType.RBRACE, "expected '}'")
         return BlockStmtNode(statements=stmts, line=tok.line, column=tok.column)
 
-    def _parse_if(self) -> IfStmtNode:
+    def _parse_if(self) -> Rule[IfStmtNode]:
         tok = self._consume(TokenType.KW_IF, "expected 'if'")
         self._consume(TokenType.LPAREN, "expected '('")
-        cond = self._parse_expression()
+        cond = yield self._parse_expression()
         self._consume(TokenType.RPAREN, "expected ')'")
-        then_branch = self._parse_statement()
+        then_branch = yield self._parse_statement()
 
         else_branch: Optional[StatementNode] = None
         if self._match(TokenType.KW_ELSE):
-            else_branch = self._parse_statement()
+            else_branch = yield self._parse_statement()
 
         return IfStmtNode(condition=cond, then_branch=then_branch,
                           else_branch=else_branch, line=tok.line, column=tok.column)
 
-    def _parse_while(self) -> WhileStmtNode:
+    def _parse_while(self) -> Rule[WhileStmtNode]:
         tok = self._consume(TokenType.KW_WHILE, "expected 'while'")
         self._consume(TokenType.LPAREN, "expected '('")
-        cond = self._parse_expression()
+        cond = yield self._parse_expression()
         self._consume(TokenType.RPAREN, "expected ')'")
-        body = self._parse_statement()
+        body = yield self._parse_statement()
         return WhileStmtNode(condition=cond, body=body, line=tok.line, column=tok.column)
 
-    def _parse_for(self) -> ForStmtNode:
+    def _parse_for(self) -> Rule[ForStmtNode]:
         tok = self._consume(TokenType.KW_FOR, "expected 'for'")
         self._consume(TokenType.LPAREN, "expected '('")
 
         init: Optional[StatementNode] = None
         if not self._check(TokenType.SEMICOLON):
             if self._is_type_start():
-                init = self._parse_var_decl()
+                init = yield self._parse_var_decl()
             else:
-                init = self._parse_expr_stmt()
+                init = yield self._parse_expr_stmt()
         else:
             self._advance()
 
         condition: Optional[ExpressionNode] = None
         if not self._check(TokenType.SEMICOLON):
-            condition = self._parse_expression()
+            condition = yield self._parse_expression()
         self._consume(TokenType.SEMICOLON, "expected ';'")
 
         update: Optional[ExpressionNode] = None
         if not self._check(TokenType.RPAREN):
-            update = self._parse_expression()
+            update = yield self._parse_expression()
         self._consume(TokenType.RPAREN, "expected ')'")
 
-        body = self._parse_statement()
+        body = yield self._parse_statement()
         return ForStmtNode(init=init, condition=condition,
                            update=update, body=body, line=tok.line, column=tok.column)
 
-    def _parse_return(self) -> ReturnStmtNode:
+    def _parse_return(self) -> Rule[ReturnStmtNode]:
         tok = self._consume(TokenType.KW_RETURN, "expected 'return'")
         value: Optional[ExpressionNode] = None
         if not self._check(TokenType.SEMICOLON):
-            value = self._parse_expression()
+            value = yield self._parse_expression()
         self._consume(TokenType.SEMICOLON, "expected ';'")
         return ReturnStmtNode(value=value, line=tok.line, column=tok.column)
 
-    def _parse_var_decl(self) -> VarDeclStmtNode:
+    def _parse_var_decl(self) -> Rule[VarDeclStmtNode]:
         type_tok = self._peek()
         vtype    = self._parse_type()
         name_tok = self._consume(TokenType.IDENTIFIER, "expected variable name")
         init: Optional[ExpressionNode] = None
         if self._match(TokenType.ASSIGN):
-            init = self._parse_expression()
+            init = yield self._parse_expression()
         self._consume(TokenType.SEMICOLON, "expected ';'")
         return VarDeclStmtNode(
             var_type=vtype,
@@ -246,24 +568,54 @@ class Parser:
             column=type_tok.column,
         )
 
-    def _parse_expr_stmt(self) -> ExprStmtNode:
+    def _parse_expr_stmt(self) -> Rule[ExprStmtNode]:
         tok  = self._peek()
-        expr = self._parse_expression()
+        expr = yield self._parse_expression()
         self._consume(TokenType.SEMICOLON, "expected ';'")
         return ExprStmtNode(expression=expr, line=tok.line, column=tok.column)
 
-    def _parse_expression(self) -> ExpressionNode:
+    def _parse_expression(self) -> Rule[ExpressionNode]:
         return self._parse_assignment()
 
-    def _parse_assignment(self) -> ExpressionNode:
-        expr = self._parse_logical_or()
+    def _parse_assignment(self) -> Rule[ExpressionNode]:
+        """
+        Binary operators by precedence, then an optional right-associative
+        assignment. Pending operators wait on an explicit stack and are
+        reduced once an operator that binds no tighter arrives, so chains
+        like a + b * c - ... need no nesting; only operands that are not
+        plain literals or names are parsed as sub-rules.
+        """
+        tokens = self._tokens
+        expr = self._parse_atom()
+        if expr is None:
+            expr = yield self._parse_unary()
+
+        operands: List[ExpressionNode] = [expr]
+        pending: List[Tuple[int, Token]] = []
+        while True:
+            op_tok = tokens[self._pos]
+            precedence = _BINARY_PRECEDENCE.get(op_tok.type)
+            if precedence is None:
+                break
+            while pending and pending[-1][0] >= precedence:
+                self._reduce(operands, pending.pop()[1])
+            self._advance()
+            pending.append((precedence, op_tok))
+            operand = self._parse_atom()
+            if operand is None:
+                operand = yield self._parse_unary()
+            operands.append(operand)
+        while pending:
+            self._reduce(operands, pending.pop()[1])
+        expr = operands[0]
+
         if self._peek().type in _ASSIGN_OPS:
             op_tok = self._advance()
-            if not isinstance(expr, IdentifierExprNode):
+            if not isinstance(expr, (IdentifierExprNode, MemberExprNode)):
                 raise ParseError("invalid assignment target", op_tok)
-            value = self._parse_assignment()
+            value = yield self._parse_assignment()
             return AssignmentExprNode(
-                target=expr.name,
+                target=expr,
                 operator=op_tok.lexeme,
                 value=value,
                 line=op_tok.line,
@@ -271,105 +623,83 @@ class Parser:
             )
         return expr
 
-    def _parse_logical_or(self) -> ExpressionNode:
-        return self._parse_left_assoc(self._parse_logical_and, {TokenType.PIPE_PIPE})
-
-    def _parse_logical_and(self) -> ExpressionNode:
-        return self._parse_left_assoc(self._parse_equality, {TokenType.AMP_AMP})
-
-    def _parse_equality(self) -> ExpressionNode:
-        return self._parse_left_assoc(self._parse_relational, {TokenType.EQ_EQ, TokenType.BANG_EQ})
-
-    def _parse_relational(self) -> ExpressionNode:
-        return self._parse_left_assoc(
-            self._parse_additive,
-            {TokenType.LT, TokenType.LT_EQ, TokenType.GT, TokenType.GT_EQ}
-        )
-
-    def _parse_additive(self) -> ExpressionNode:
-        return self._parse_left_assoc(self._parse_multiplicative, {TokenType.PLUS, TokenType.MINUS})
+    @staticmethod
+    def _reduce(operands: List[ExpressionNode], op_tok: Token) -> None:
+        right = operands.pop()
+        left  = operands.pop()
+        operands.append(BinaryExprNode(
+            left=left, operator=op_tok.lexeme, right=right,
+            line=op_tok.line, column=op_tok.column,
+        ))
+
+    def _parse_unary(self) -> Rule[ExpressionNode]:
+        if self._peek().type in _UNARY_OPS:
+            return self._parse_prefix()
+        return self._parse_primary()
 
-    def _parse_multiplicative(self) -> ExpressionNode:
-        return self._parse_left_assoc(
-            self._parse_unary,
-            {TokenType.STAR, TokenType.SLASH, TokenType.PERCENT}
+    def _parse_prefix(self) -> Rule[ExpressionNode]:
+        op_tok  = self._advance()
+        operand = self._parse_atom()
+        if operand is None:
+            operand = yield self._parse_unary()
+        return UnaryExprNode(
+            operator=op_tok.lexeme,
+            operand=operand,
+            line=op_tok.line,
+            column=op_tok.column,
         )
 
-    def _parse_left_assoc(
-        self,
-        next_rule: Callable[[], ExpressionNode],
-        ops: Set[TokenType],
-    ) -> ExpressionNode:
-        left = next_rule()
-        while self._peek().type in ops:
-            op_tok = self._advance()
-            right  = next_rule()
-            left   = BinaryExprNode(
-                left=left, operator=op_tok.lexeme, right=right,
-                line=op_tok.line, column=op_tok.column,
-            )
-        return left
-
-    def _parse_unary(self) -> ExpressionNode:
-        if self._peek().type in {TokenType.MINUS, TokenType.BANG}:
-            op_tok  = self._advance()
-            operand = self._parse_unary()
-            return UnaryExprNode(
-                operator=op_tok.lexeme,
-                operand=operand,
-                line=op_tok.line,
-                column=op_tok.column,
-            )
-        return self._parse_primary()
-
-    def _parse_primary(self) -> ExpressionNode:
+    def _parse_atom(self) -> Optional[ExpressionNode]:
+        """A literal, a name or a field chain p.x.y, or None for any other operand."""
         tok = self._peek()
 
-        if tok.type == TokenType.INT_LITERAL:
-            self._advance()
-            return LiteralExprNode(value=tok.literal, kind='int', line=tok.line, column=tok.column)
-        if tok.type == TokenType.FLOAT_LITERAL:
-            self._advance()
-            return LiteralExprNode(value=tok.literal, kind='float', line=tok.line, column=tok.column)
-        if tok.type == TokenType.BOOL_LITERAL:
-            self._advance()
-            return LiteralExprNode(value=tok.literal, kind='bool', line=tok.line, column=tok.column)
-        if tok.type == TokenType.STRING_LITERAL:
+        kind = _LITERAL_KINDS.get(tok.type)
+        if kind is not None:
             self._advance()
-            return LiteralExprNode(value=tok.literal, kind='string', line=tok.line, column=tok.column)
+            return LiteralExprNode(value=tok.literal, kind=kind, line=tok.line, column=tok.column)
         if tok.type == TokenType.KW_NULL:
             self._advance()
             return LiteralExprNode(value=None, kind='null', line=tok.line, column=tok.column)
 
-        if tok.type == TokenType.IDENTIFIER:
+        if tok.type == TokenType.IDENTIFIER and self._peek_next().type != TokenType.LPAREN:
             self._advance()
-            if self._check(TokenType.LPAREN):
-                return self._parse_call(tok)
-
-            name = tok.lexeme
-            # Parse simple struct field chains as one identifier name: p.x.y
+            expr: ExpressionNode = IdentifierExprNode(name=tok.lexeme, line=tok.line,
+                                                      column=tok.column)
+            # Struct field chains p.x.y nest left to right; every link is
+            # positioned at the start of the chain, like the whole name was.
             while self._match(TokenType.DOT):
                 field_tok = self._consume(TokenType.IDENTIFIER,
                                           "expected field name after '.'")
-                name += "." + field_tok.lexeme
+                expr = MemberExprNode(base=expr, field_name=field_tok.lexeme,
+                                      line=tok.line, column=tok.column)
+            return expr
+        return None
+
+    def _parse_primary(self) -> Rule[ExpressionNode]:
+        atom = self._parse_atom()
+        if atom is not None:
+            return atom
 
-            return IdentifierExprNode(name=name, line=tok.line, column=tok.column)
+        tok = self._peek()
+        if tok.type == TokenType.IDENTIFIER:
+            self._advance()
+            return (yield self._parse_call(tok))
 
         if tok.type == TokenType.LPAREN:
             self._advance()
-            expr = self._parse_expression()
+            expr = yield self._parse_expression()
             self._consume(TokenType.RPAREN, "expected ')'")
             return expr
 
         raise ParseError(f"unexpected token {tok.lexeme!r}", tok)
 
-    def _parse_call(self, name_tok: Token) -> CallExprNode:
+    def _parse_call(self, name_tok: Token) -> Rule[CallExprNode]:
         self._consume(TokenType.LPAREN, "expected '('")
         args: List[ExpressionNode] = []
         if not self._check(TokenType.RPAREN):
-            args.append(self._parse_expression())
+            args.append((yield self._parse_expression()))
             while self._match(TokenType.COMMA):
-                args.append(self._parse_expression())
+                args.append((yield self._parse_expression()))
         self._consume(TokenType.RPAREN, "expected ')'")
         return CallExprNode(callee=name_tok.lexeme, arguments=args,
                             line=name_tok.line, column=name_tok.column)
@@ -378,32 +708,37 @@ class Parser:
         return self._tokens[self._pos]
 
     def _peek_next(self) -> Token:
-        idx = min(self._pos + 1, len(self._tokens) - 1)
-        return self._tokens[idx]
+        # The stream always ends with EOF, which is returned past the end.
+        tok = self._tokens[self._pos]
+        if tok.type is _EOF:
+            return tok
+        return self._tokens[self._pos + 1]
 
     def _advance(self) -> Token:
         tok = self._tokens[self._pos]
-        if not self._is_at_end():
+        if tok.type is not _EOF:
             self._pos += 1
         return tok
 
     def _is_at_end(self) -> bool:
-        return self._tokens[self._pos].type == TokenType.EOF
+        return self._tokens[self._pos].type is _EOF
 
     def _check(self, ttype: TokenType) -> bool:
-        return not self._is_at_end() and self._peek().type == ttype
+        tok_type = self._tokens[self._pos].type
+        return tok_type is ttype and tok_type is not _EOF
 
     def _match(self, *types: TokenType) -> bool:
-        for ttype in types:
-            if self._check(ttype):
-                self._advance()
-                return True
+        tok_type = self._tokens[self._pos].type
+        if tok_type in types and tok_type is not _EOF:
+            self._pos += 1
+            return True
         return False
 
     def _consume(self, ttype: TokenType, message: str) -> Token:
-        if self._check(ttype):
-            return self._advance()
-        tok = self._peek()
+        tok = self._tokens[self._pos]
+        if tok.type is ttype and tok.type is not _EOF:
+            self._pos += 1
+            return tok
         raise ParseError(f"{message}; got {tok.lexeme!r}", tok)
 
     def _is_type_start(self) -> bool:
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional
 
 
 @dataclass
@@ -12,6 +13,9 @@ class BuildConfig:
     emit_asm: bool = True
     assemble: bool = False
     link: bool = False
+    mmap_source: bool = False
+    token_cache_dir: Optional[Path] = None
+    reorder_fields: bool = False    # lay struct fields out to minimise padding
 
     @property
     def stem(self):
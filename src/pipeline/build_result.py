@@ -15,6 +15,8 @@ class BuildResult:
     stage: str
     artifacts: List[BuildArtifact] = field(default_factory=list)
     diagnostics: List[str] = field(default_factory=list)
+    cache_hits: int = 0
+    cache_misses: int = 0
 
     def add_artifact(self, kind, path):
         self.artifacts.append(BuildArtifact(kind, path))
@@ -28,6 +30,10 @@ class BuildResult:
             "Last stage: {}".format(self.stage),
         ]
 
+        if self.cache_hits or self.cache_misses:
+            lines.append("Token cache: {} hits, {} misses".format(
+                self.cache_hits, self.cache_misses))
+
         if self.artifacts:
             lines.append("")
             lines.append("Artifacts:")
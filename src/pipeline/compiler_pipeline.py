@@ -1,13 +1,16 @@
 from pathlib import Path
 
 from src.lexer.scanner import Scanner
+from src.lexer.bytes_scanner import BytesScanner
+from src.lexer.token_cache import TokenCache
 from src.parser.parser import Parser
 from src.semantic.analyzer import SemanticAnalyzer
-from src.ir.ir_generator import IRGenerator
+from src.ir.ir_generator import IRGenerationError, IRGenerator
 from src.codegen.x86_generator import X86Generator
 from src.pipeline.build_config import BuildConfig
 from src.pipeline.build_result import BuildResult
 from src.pipeline.toolchain import Toolchain, ToolchainError
+from src.utils.interner import StringPool
 
 try:
     from src.optimizer.optimizer import IROptimizer
@@ -18,24 +21,57 @@ except Exception:
 class CompilerPipeline:
     def __init__(self, toolchain=None):
         self.toolchain = toolchain or Toolchain()
+        # Interning pool of the current compilation, shared by the scanner
+        # (identifiers) and the IR generator (temps and labels).
+        self.pool = StringPool()
+        # One TokenCache per cache directory, so counters span compiles.
+        self.token_caches = {}
 
     def compile(self, config: BuildConfig):
+        cache = None
+        if config.token_cache_dir is not None:
+            cache = self.token_caches.setdefault(
+                Path(config.token_cache_dir), TokenCache(config.token_cache_dir)
+            )
+            hits, misses = cache.hits, cache.misses
+
+        result = self._compile(config, cache)
+        if cache is not None:
+            result.cache_hits = cache.hits - hits
+            result.cache_misses = cache.misses - misses
+        return result
+
+    def _compile(self, config, cache):
         config.output_dir.mkdir(parents=True, exist_ok=True)
-        source = Path(config.input_file).read_text(encoding="utf-8")
+        self.pool = StringPool()
+        if config.mmap_source:
+            # Lex straight from the mapped file; diagnostics decode single
+            # lines through the scanner's line index, so the file stays
+            # mapped until the build is done.
+            with BytesScanner.from_path(config.input_file, pool=self.pool) as scanner:
+                return self._build(config, "", scanner, scanner.iter_tokens(),
+                                   scanner.line_index)
 
-        tokens = self._lex(source, str(config.input_file))
-        if isinstance(tokens, BuildResult):
-            return tokens
+        source = Path(config.input_file).read_text(encoding="utf-8")
+        scanner, tokens = self._lex(source, str(config.input_file), cache)
+        return self._build(config, source, scanner, tokens)
 
-        ast = self._parse(tokens)
+    def _build(self, config, source, scanner, tokens, line_index=None):
+        ast = self._parse(scanner, tokens)
         if isinstance(ast, BuildResult):
             return ast
 
-        semantic = self._semantic(ast, source, str(config.input_file))
+        semantic = self._semantic(ast, source, str(config.input_file),
+                                  line_index, config.reorder_fields)
         if isinstance(semantic, BuildResult):
             return semantic
 
-        ir_program = IRGenerator().generate(ast)
+        try:
+            ir_program = IRGenerator(self.pool, semantic.struct_layouts).generate(ast)
+        except IRGenerationError as exc:
+            result = BuildResult(False, "ir")
+            result.add_diagnostic(str(exc))
+            return result
 
         if config.optimize:
             if IROptimizer is None:
@@ -84,19 +120,28 @@ class CompilerPipeline:
 
         return result
 
-    def _lex(self, source, filename):
-        scanner = Scanner(source, filename=filename)
-        tokens = scanner.scan_tokens() if hasattr(scanner, "scan_tokens") else scanner.scan_all()
+    def _lex(self, source, filename, cache=None):
+        # Tokens are produced lazily and consumed by the parser as a stream.
+        # With a token cache the whole buffer is loaded (or scanned and
+        # stored) up front instead. Positions are eager: the parser reads
+        # them for every node, which costs more through a LineIndex.
+        scanner = Scanner(source, filename=filename, pool=self.pool, cache=cache)
+        if cache is not None:
+            return scanner, scanner.scan_buffer()
+        return scanner, scanner.iter_tokens()
+
+    def _parse(self, scanner, tokens):
+        parser = Parser(tokens)
+        ast = parser.parse()
+
+        # The parser always reads up to EOF, so every lexer error is known
+        # here; they take precedence over the parse errors they cause.
         if scanner.errors:
             result = BuildResult(False, "lex")
             for err in scanner.errors:
                 result.add_diagnostic(str(err))
             return result
-        return tokens
 
-    def _parse(self, tokens):
-        parser = Parser(tokens)
-        ast = parser.parse()
         if ast is None or parser.errors:
             result = BuildResult(False, "parse")
             for err in parser.errors:
@@ -104,8 +149,9 @@ class CompilerPipeline:
             return result
         return ast
 
-    def _semantic(self, ast, source, filename):
-        analyzer = SemanticAnalyzer(filename=Path(filename).name, source=source)
+    def _semantic(self, ast, source, filename, line_index=None, reorder_fields=False):
+        analyzer = SemanticAnalyzer(filename=Path(filename).name, source=source,
+                                    line_index=line_index, reorder_fields=reorder_fields)
         ok = analyzer.analyze(ast)
         if not ok:
             result = BuildResult(False, "semantic")
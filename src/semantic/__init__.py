@@ -2,10 +2,11 @@ from .type_system import (
     Type, IntType, FloatType, BoolType, StringType, VoidType,
     NullType, StructType, FunctionType,
     INT, FLOAT, BOOL, STRING, VOID, NULL,
-    BUILTIN_TYPES, resolve_type,
-    binary_result_type, unary_result_type,
+    BUILTIN_TYPES, TYPE_SIZES, WORD_SIZE, resolve_type, type_size,
+    FieldLayout, StructLayout, LayoutEngine,
+    binary_result_type, unary_result_type, TypeInterner,
 )
-from .symbol_table import SymbolTable, Symbol, SymbolKind, Scope
+from .symbol_table import SymbolTable, FlatSymbolTable, Symbol, SymbolKind, Scope
 from .errors import SemanticError, ErrorReporter
 from .analyzer import SemanticAnalyzer
 
@@ -13,9 +14,10 @@ __all__ = [
     "Type", "IntType", "FloatType", "BoolType", "StringType",
     "VoidType", "NullType", "StructType", "FunctionType",
     "INT", "FLOAT", "BOOL", "STRING", "VOID", "NULL",
-    "BUILTIN_TYPES", "resolve_type",
-    "binary_result_type", "unary_result_type",
-    "SymbolTable", "Symbol", "SymbolKind", "Scope",
+    "BUILTIN_TYPES", "TYPE_SIZES", "WORD_SIZE", "resolve_type", "type_size",
+    "FieldLayout", "StructLayout", "LayoutEngine",
+    "binary_result_type", "unary_result_type", "TypeInterner",
+    "SymbolTable", "FlatSymbolTable", "Symbol", "SymbolKind", "Scope",
     "SemanticError", "ErrorReporter",
     "SemanticAnalyzer",
 ]
\ No newline at end of file
@@ -4,23 +4,24 @@ performs type checking, and decorates expression nodes with their types.
 """
 from __future__ import annotations
 
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Union
 from src.parser.ast_nodes import (
-    ASTVisitor, ASTNode,
+    ASTVisitor, walk, ASTNode, DeclarationNode,
     ProgramNode, FunctionDeclNode, StructDeclNode, ParamNode,
     BlockStmtNode, VarDeclStmtNode, ExprStmtNode,
     IfStmtNode, WhileStmtNode, ForStmtNode, ReturnStmtNode,
-    LiteralExprNode, IdentifierExprNode, BinaryExprNode,
-    UnaryExprNode, CallExprNode, AssignmentExprNode,
+    ExpressionNode, LiteralExprNode, IdentifierExprNode, MemberExprNode,
+    BinaryExprNode, UnaryExprNode, CallExprNode, AssignmentExprNode,
 )
-from .symbol_table import SymbolTable, Symbol, SymbolKind
+from .symbol_table import FlatSymbolTable, SymbolTable, Symbol, SymbolKind
 from .type_system import (
     Type, INT, FLOAT, BOOL, STRING, VOID, NULL,
     IntType, FloatType, BoolType, VoidType, StructType, FunctionType,
-    BUILTIN_TYPES, resolve_type,
-    binary_result_type, unary_result_type,
+    BUILTIN_TYPES, LayoutEngine, StructLayout, TypeInterner, resolve_type,
 )
-from .errors import ErrorReporter
+from .errors import ErrorReporter, SemanticError
+from .parallel import PARALLEL_CHUNK_FUNCTIONS, analyze_parallel
+from src.utils.line_index import LineIndex
 
 
 class SemanticAnalyzer(ASTVisitor):
@@ -28,35 +29,60 @@ class SemanticAnalyzer(ASTVisitor):
     Single-pass semantic analyser implemented as an AST visitor.
 
     After calling analyze():
-      - self.symbol_table  – fully populated
+      - self.symbol_table  – fully populated (a FlatSymbolTable unless
+                             another table is passed in)
       - self.errors        – list of SemanticError
+      - self.struct_layouts – StructLayout of each struct, by name (fields
+                              reordered to save padding if reorder_fields)
       - Every ExpressionNode.resolved_type is set to a type string
         (or 'error' on failure).
     """
 
     def __init__(self, filename: str = "<unknown>",
-                 source: str = "") -> None:
-        self.symbol_table = SymbolTable()
-        self._reporter = ErrorReporter(filename, source)
+                 source: str = "",
+                 line_index: Optional[LineIndex] = None,
+                 symbol_table: Optional[Union[SymbolTable, FlatSymbolTable]] = None,
+                 reorder_fields: bool = False) -> None:
+        self.symbol_table = symbol_table if symbol_table is not None else FlatSymbolTable()
+        self._reporter = ErrorReporter(filename, source, line_index)
         self._struct_registry: Dict[str, StructType] = {}
+        self._types = TypeInterner()
+        self._layouts = LayoutEngine(reorder_fields)
+        self._type_names = self._types.names
         self._current_function: Optional[FunctionDeclNode] = None
         self._current_return_type: Optional[Type] = None
         self._loop_depth: int = 0
+        self._workers: int = 1
+        self._chunk_size: int = PARALLEL_CHUNK_FUNCTIONS
 
     # ── Public API ─────────────────────────────────────────────────────────
 
-    def analyze(self, ast: ProgramNode) -> bool:
+    def analyze(self, ast: ProgramNode, workers: int = 1,
+                chunk_size: int = PARALLEL_CHUNK_FUNCTIONS) -> bool:
         """
         Run semantic analysis.
         Returns True if no errors were found.
+
+        With workers > 1, programs of more than chunk_size functions have
+        their function bodies analysed in worker processes, chunk_size
+        functions at a time; errors and annotations are as for workers=1.
+        Global variables are analysed here first, and bodies stay serial
+        unless every global is initialized and declared before the first
+        function.
         """
-        ast.accept(self)
+        self._workers = workers
+        self._chunk_size = chunk_size
+        walk(self, ast)
         return not self._reporter.has_errors
 
     @property
     def errors(self):
         return self._reporter.errors
 
+    @property
+    def struct_layouts(self) -> Dict[str, StructLayout]:
+        return {name: self._layouts.layout(st) for name, st in self._struct_registry.items()}
+
     @property
     def has_errors(self) -> bool:
         return self._reporter.has_errors
@@ -85,7 +111,7 @@ class SemanticAnalyzer(ASTVisitor):
 
     def _set_expr_type(self, node: ASTNode, t: Type) -> Type:
         """Annotate an expression node with its resolved type."""
-        node.resolved_type = str(t)
+        node.resolved_type = self._type_names[t.type_id]
         return t
 
     def _error_type(self, node: ASTNode) -> Type:
@@ -93,45 +119,28 @@ class SemanticAnalyzer(ASTVisitor):
         return VOID  # continue analysis with a safe sentinel
 
     def _lookup_value_type(self, name: str, node: ASTNode) -> Optional[Type]:
-        """Resolve variables and simple struct fields like p.x."""
-        parts = name.split('.')
-        sym = self.symbol_table.lookup(parts[0])
+        """Resolve a variable's type."""
+        sym = self.symbol_table.lookup(name)
         if sym is None:
-            self._err(f"undeclared variable '{parts[0]}'", node)
+            self._err(f"undeclared variable '{name}'", node)
             return None
+        return sym.type
 
-        current_type = sym.type
-        for field in parts[1:]:
-            if not isinstance(current_type, StructType):
-                self._err(f"'{'.'.join(parts[:-1])}' is not a struct", node)
-                return None
-            if field not in current_type.fields:
-                self._err(f"struct '{current_type.name}' has no field '{field}'", node)
-                return None
-            current_type = current_type.fields[field]
-        return current_type
-
-    def _lookup_assign_symbol_and_type(self, name: str, node: ASTNode):
-        """Return (base symbol, final target type) for x or p.x."""
-        parts = name.split('.')
-        sym = self.symbol_table.lookup(parts[0])
-        if sym is None:
-            self._err(f"assignment to undeclared variable '{parts[0]}'", node)
-            return None, None
-        if sym.kind not in {SymbolKind.VARIABLE, SymbolKind.PARAMETER}:
-            self._err(f"'{parts[0]}' is not assignable (it is a {sym.kind})", node)
-            return sym, None
-
-        current_type = sym.type
-        for field in parts[1:]:
-            if not isinstance(current_type, StructType):
-                self._err(f"'{'.'.join(parts[:-1])}' is not a struct", node)
-                return sym, None
-            if field not in current_type.fields:
-                self._err(f"struct '{current_type.name}' has no field '{field}'", node)
-                return sym, None
-            current_type = current_type.fields[field]
-        return sym, current_type
+    def _resolve_member(self, node: MemberExprNode, base_type: Type,
+                        err_node: ASTNode) -> Optional[Type]:
+        """
+        Type of field `node.field_name` of a `base_type` value. Records the
+        field's index and byte offset in the struct on `node`.
+        """
+        if not isinstance(base_type, StructType):
+            self._err(f"'{node.base}' is not a struct", err_node)
+            return None
+        if node.field_name not in base_type.fields:
+            self._err(f"struct '{base_type.name}' has no field '{node.field_name}'", err_node)
+            return None
+        node.field_index = base_type.field_index(node.field_name)
+        node.offset = self._layouts.layout(base_type).fields[node.field_name].offset
+        return base_type.fields[node.field_name]
 
     # ══════════════════════════════════════════════════════════════════════
     #  Visitor implementations
@@ -150,9 +159,54 @@ class SemanticAnalyzer(ASTVisitor):
             if isinstance(decl, FunctionDeclNode):
                 self._register_function_signature(decl)
 
-        # Pass 3: fully analyse every declaration
-        for decl in node.declarations:
-            decl.accept(self)
+        # Pass 3: fully analyse every declaration, struct fields first so
+        # that function bodies see every struct complete. Diagnostics are
+        # collected per declaration and reported in source order.
+        reporter = self._reporter
+        decls = node.declarations
+        found: List[Optional[List[SemanticError]]] = [None] * len(decls)
+        functions = []
+        for i, decl in enumerate(decls):
+            if isinstance(decl, StructDeclNode):
+                mark = reporter.count()
+                yield decl
+                found[i] = reporter.pop_since(mark)
+            elif isinstance(decl, FunctionDeclNode):
+                functions.append(i)
+
+        parallel = (self._workers > 1 and len(functions) > self._chunk_size
+                    and self._globals_are_settled(decls, functions[0]))
+        for i, decl in enumerate(decls):
+            if not isinstance(decl, StructDeclNode) and not (
+                    parallel and isinstance(decl, FunctionDeclNode)):
+                found[i] = yield from self._check_body(decl)
+        if parallel:
+            for i, errors in zip(functions, analyze_parallel(
+                    self, decls, functions, self._workers, self._chunk_size)):
+                found[i] = errors
+
+        for errors in found:
+            reporter.extend(errors)
+
+    @staticmethod
+    def _globals_are_settled(decls: List[DeclarationNode], first_function: int) -> bool:
+        """
+        Whether every function body sees the same global variables, all
+        initialized, so that bodies can be analysed in any order: a body
+        sees only the globals declared before it, and assigning one that
+        has no initializer makes later reads of it valid.
+        """
+        return all(
+            i < first_function and decl.initializer is not None
+            for i, decl in enumerate(decls)
+            if isinstance(decl, VarDeclStmtNode)
+        )
+
+    def _check_body(self, decl: DeclarationNode):
+        """Analyse one declaration of pass 3; returns its diagnostics."""
+        mark = self._reporter.count()
+        yield decl
+        return self._reporter.pop_since(mark)
 
     # ── Declarations ───────────────────────────────────────────────────────
 
@@ -161,6 +215,7 @@ class SemanticAnalyzer(ASTVisitor):
             self._err(f"duplicate struct declaration '{node.name}'", node)
             return
         st = StructType(name=node.name)
+        self._types.intern(st)
         self._struct_registry[node.name] = st
         sym = Symbol(name=node.name, kind=SymbolKind.STRUCT,
                      type=st, decl_line=node.line, decl_column=node.column)
@@ -172,6 +227,7 @@ class SemanticAnalyzer(ASTVisitor):
         ret_type = self._resolve_type(node.return_type, node)
         fn_type = FunctionType(param_types=param_types,
                                return_type=ret_type)
+        self._types.intern(fn_type)
         sym = Symbol(name=node.name, kind=SymbolKind.FUNCTION,
                      type=fn_type,
                      decl_line=node.line, decl_column=node.column)
@@ -220,7 +276,7 @@ class SemanticAnalyzer(ASTVisitor):
                 self._err(f"duplicate parameter '{param.name}'", param)
 
         # Analyse body
-        node.body.accept(self)
+        yield node.body
 
         self.symbol_table.exit_scope()
         self._current_function = None
@@ -234,7 +290,7 @@ class SemanticAnalyzer(ASTVisitor):
     def visit_block_stmt(self, node: BlockStmtNode) -> None:
         self.symbol_table.enter_scope("block")
         for stmt in node.statements:
-            stmt.accept(self)
+            yield stmt
         self.symbol_table.exit_scope()
 
     def visit_var_decl_stmt(self, node: VarDeclStmtNode) -> None:
@@ -252,8 +308,9 @@ class SemanticAnalyzer(ASTVisitor):
 
         initialized = False
         if node.initializer is not None:
-            init_type = node.initializer.accept(self)
-            if init_type is not None and not vtype.is_assignable_from(init_type):
+            init_type = yield node.initializer
+            if init_type is not None and not self._types.assignable(vtype.type_id,
+                                                                    init_type.type_id):
                 self._err(
                     f"type mismatch in initializer of '{node.name}': "
                     f"expected {vtype}, got {init_type}",
@@ -267,48 +324,48 @@ class SemanticAnalyzer(ASTVisitor):
             is_initialized=initialized,
         )
         self.symbol_table.define(sym)
-        node.resolved_type = str(vtype)
+        node.resolved_type = self._type_names[vtype.type_id]
 
     def visit_expr_stmt(self, node: ExprStmtNode) -> None:
-        node.expression.accept(self)
+        yield node.expression
 
     def visit_if_stmt(self, node: IfStmtNode) -> None:
-        cond_type = node.condition.accept(self)
+        cond_type = yield node.condition
         if cond_type is not None and not isinstance(cond_type, BoolType):
             self._err(
                 f"condition in 'if' must be bool, got {cond_type}",
                 node.condition,
             )
-        node.then_branch.accept(self)
+        yield node.then_branch
         if node.else_branch:
-            node.else_branch.accept(self)
+            yield node.else_branch
 
     def visit_while_stmt(self, node: WhileStmtNode) -> None:
-        cond_type = node.condition.accept(self)
+        cond_type = yield node.condition
         if cond_type is not None and not isinstance(cond_type, BoolType):
             self._err(
                 f"condition in 'while' must be bool, got {cond_type}",
                 node.condition,
             )
         self._loop_depth += 1
-        node.body.accept(self)
+        yield node.body
         self._loop_depth -= 1
 
     def visit_for_stmt(self, node: ForStmtNode) -> None:
         self.symbol_table.enter_scope("for")
         if node.init:
-            node.init.accept(self)
+            yield node.init
         if node.condition:
-            cond_type = node.condition.accept(self)
+            cond_type = yield node.condition
             if cond_type is not None and not isinstance(cond_type, BoolType):
                 self._err(
                     f"condition in 'for' must be bool, got {cond_type}",
                     node.condition,
                 )
         if node.update:
-            node.update.accept(self)
+            yield node.update
         self._loop_depth += 1
-        node.body.accept(self)
+        yield node.body
         self._loop_depth -= 1
         self.symbol_table.exit_scope()
 
@@ -327,12 +384,12 @@ class SemanticAnalyzer(ASTVisitor):
                 )
             return
 
-        ret_type = node.value.accept(self)
+        ret_type = yield node.value
         if ret_type is None:
             return
 
         expected = self._current_return_type
-        if not expected.is_assignable_from(ret_type):
+        if not self._types.assignable(expected.type_id, ret_type.type_id):
             self._err(
                 f"return type mismatch in '{self._current_function.name}': "
                 f"expected {expected}, got {ret_type}",
@@ -360,22 +417,40 @@ class SemanticAnalyzer(ASTVisitor):
         if t is None:
             return self._error_type(node)
 
-        # Use-before-initialization check only for plain variables.
-        if '.' not in node.name:
-            sym = self.symbol_table.lookup(node.name)
-            if sym and sym.kind == SymbolKind.VARIABLE and not sym.is_initialized:
-                self._err(f"variable '{node.name}' may be used before initialization", node)
+        sym = self.symbol_table.lookup(node.name)
+        if sym and sym.kind == SymbolKind.VARIABLE and not sym.is_initialized:
+            self._err(f"variable '{node.name}' may be used before initialization", node)
 
         return self._set_expr_type(node, t)
 
+    def visit_member_expr(self, node: MemberExprNode) -> Type:
+        node.field_index = node.offset = None
+        if isinstance(node.base, IdentifierExprNode):
+            # Struct variables are filled in field by field, so the root of
+            # a chain is not checked for initialization.
+            base_type = self._lookup_value_type(node.base.name, node.base)
+            if base_type is None:
+                self._error_type(node.base)
+            else:
+                self._set_expr_type(node.base, base_type)
+        else:
+            base_type = yield node.base
+            if node.base.resolved_type == "error":
+                base_type = None    # already reported
+
+        t = None if base_type is None else self._resolve_member(node, base_type, node)
+        if t is None:
+            return self._error_type(node)
+        return self._set_expr_type(node, t)
+
     def visit_binary_expr(self, node: BinaryExprNode) -> Type:
-        left_type = node.left.accept(self)
-        right_type = node.right.accept(self)
+        left_type = yield node.left
+        right_type = yield node.right
 
         if left_type is None or right_type is None:
             return self._error_type(node)
 
-        result = binary_result_type(node.operator, left_type, right_type)
+        result = self._types.binary(node.operator, left_type.type_id, right_type.type_id)
         if result is None:
             self._err(
                 f"operator '{node.operator}' cannot be applied to "
@@ -384,14 +459,15 @@ class SemanticAnalyzer(ASTVisitor):
             )
             return self._error_type(node)
 
-        return self._set_expr_type(node, result)
+        node.resolved_type = self._type_names[result]
+        return self._types.types[result]
 
     def visit_unary_expr(self, node: UnaryExprNode) -> Type:
-        operand_type = node.operand.accept(self)
+        operand_type = yield node.operand
         if operand_type is None:
             return self._error_type(node)
 
-        result = unary_result_type(node.operator, operand_type)
+        result = self._types.unary(node.operator, operand_type.type_id)
         if result is None:
             self._err(
                 f"unary operator '{node.operator}' cannot be applied "
@@ -400,7 +476,8 @@ class SemanticAnalyzer(ASTVisitor):
             )
             return self._error_type(node)
 
-        return self._set_expr_type(node, result)
+        node.resolved_type = self._type_names[result]
+        return self._types.types[result]
 
     def visit_call_expr(self, node: CallExprNode) -> Type:
         sym = self.symbol_table.lookup(node.callee)
@@ -431,10 +508,10 @@ class SemanticAnalyzer(ASTVisitor):
             # Still type-check as many args as we can
 
         for i, arg in enumerate(node.arguments):
-            arg_type = arg.accept(self)
+            arg_type = yield arg
             if i < expected_n and arg_type is not None:
                 expected_type = fn_type.param_types[i]
-                if not expected_type.is_assignable_from(arg_type):
+                if not self._types.assignable(expected_type.type_id, arg_type.type_id):
                     self._err(
                         f"argument {i + 1} to '{node.callee}': "
                         f"expected {expected_type}, got {arg_type}",
@@ -445,13 +522,13 @@ class SemanticAnalyzer(ASTVisitor):
 
     def visit_assignment_expr(self, node: AssignmentExprNode) -> Type:
         target_type = self._resolve_assignment_target_type(node.target, node)
-        value_type = node.value.accept(self)
+        value_type = yield node.value
 
         if value_type is None:
             return self._error_type(node)
 
 
-        if not target_type.is_assignable_from(value_type):
+        if not self._types.assignable(target_type.type_id, value_type.type_id):
 
             self._err(
                 f"type mismatch in assignment to '{node.target}': "
@@ -468,32 +545,27 @@ class SemanticAnalyzer(ASTVisitor):
         sym.is_initialized = True
         return self._set_expr_type(node, target_type)
 
-    def _resolve_assignment_target_type(self, target: str, node: ASTNode) -> Type:
-        if "." not in target:
-            sym = self.symbol_table.lookup(target)
-            if sym is None:
-                self._err(f"undeclared variable '{target}'", node)
-                return VOID
-            sym.is_initialized = True
-            return sym.type
-
-        base_name, field_name = target.split(".", 1)
-        sym = self.symbol_table.lookup(base_name)
-
+    def _resolve_assignment_target_type(self, target: ExpressionNode, node: ASTNode) -> Type:
+        # Field chains are resolved from the variable outwards. Links past
+        # an error stay unannotated, also when the tree was analysed before.
+        links: List[MemberExprNode] = []
+        while isinstance(target, MemberExprNode):
+            links.append(target)
+            target.resolved_type = target.field_index = target.offset = None
+            target = target.base
+        target.resolved_type = None
+
+        sym = self.symbol_table.lookup(target.name)
         if sym is None:
-            self._err(f"undeclared variable '{base_name}'", node)
+            self._err(f"undeclared variable '{target.name}'", node)
             return VOID
 
-        if not isinstance(sym.type, StructType):
-            self._err(f"'{base_name}' is not a struct", node)
-            return VOID
-
-        if field_name not in sym.type.fields:
-            self._err(
-                f"struct '{sym.type.name}' has no field '{field_name}'",
-                node,
-            )
-            return VOID
+        current_type = self._set_expr_type(target, sym.type)
+        for link in reversed(links):
+            current_type = self._resolve_member(link, current_type, node)
+            if current_type is None:
+                return VOID
+            self._set_expr_type(link, current_type)
 
         sym.is_initialized = True
-        return sym.type.fields[field_name]
\ No newline at end of file
+        return current_type
@@ -3,7 +3,9 @@ Semantic error definitions and the error collector.
 """
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Iterable, List, Optional, Sequence
+
+from src.utils.line_index import LineIndex
 
 
 @dataclass
@@ -16,7 +18,7 @@ class SemanticError:
     context:  str = ""          # e.g. "in function 'foo'"
     hint:     str = ""          # optional suggestion
 
-    def format(self, source_lines: Optional[List[str]] = None) -> str:
+    def format(self, source_lines: Optional[Sequence[str]] = None) -> str:
         """
         Render in the style:
             semantic error: <message>
@@ -54,14 +56,29 @@ class SemanticError:
 
 
 class ErrorReporter:
-    """Collects semantic errors; allows analysis to continue after errors."""
+    """
+    Collects semantic errors; allows analysis to continue after errors.
+
+    Source lines for caret diagnostics come from a LineIndex, built only
+    when errors are formatted unless the scanner's index is passed in.
+    """
 
     def __init__(self, filename: str = "<unknown>",
-                 source: str = "") -> None:
-        self._filename     = filename
-        self._source_lines = source.splitlines() if source else []
+                 source: str = "",
+                 line_index: Optional[LineIndex] = None) -> None:
+        self._filename   = filename
+        self._source     = source
+        self._line_index = line_index
         self._errors: List[SemanticError] = []
 
+    @property
+    def source_lines(self) -> Sequence[str]:
+        if self._line_index is None:
+            if not self._source:
+                return []
+            self._line_index = LineIndex(self._source)
+        return self._line_index
+
     def error(self, message: str, line: int, column: int,
               context: str = "", hint: str = "") -> None:
         self._errors.append(SemanticError(
@@ -73,6 +90,18 @@ class ErrorReporter:
             hint=hint,
         ))
 
+    def extend(self, errors: Iterable[SemanticError]) -> None:
+        self._errors.extend(errors)
+
+    def count(self) -> int:
+        return len(self._errors)
+
+    def pop_since(self, mark: int) -> List[SemanticError]:
+        """Remove and return the errors reported after count() was `mark`."""
+        popped = self._errors[mark:]
+        del self._errors[mark:]
+        return popped
+
     @property
     def errors(self) -> List[SemanticError]:
         return list(self._errors)
@@ -83,7 +112,7 @@ class ErrorReporter:
 
     def format_all(self) -> str:
         return '\n\n'.join(
-            e.format(self._source_lines) for e in self._errors
+            e.format(self.source_lines) for e in self._errors
         )
 
     def summary(self) -> str:
@@ -0,0 +1,206 @@
+"""
+Incremental semantic analysis of successive versions of a program.
+
+Declarations outside function bodies (structs, signatures and global
+variables: passes 1 and 2 and the rest of pass 3) are cheap and are always
+checked again. A function body is checked again only if it changed, or if
+a global it depends on did. While a body is analysed, every global name it
+looks up is recorded with that global's signature: callees and other
+symbols through the symbol table, including names it failed to find, and
+structs through the types and fields it resolves. Global variables are
+also recorded with whether they were initialized when the body was
+reached, since an earlier body assigning one makes reads of it valid. The
+body's diagnostics, the annotations it left on the tree and the globals it
+initialized are cached under its ast_serializer.fingerprint. A later
+version reuses them when a function has the same fingerprint and every
+recorded dependency still matches.
+"""
+from typing import Any, Dict, Generator, List, NamedTuple, Optional, Tuple
+
+from src.parser.ast_nodes import (
+    ASTNode, DeclarationNode, FunctionDeclNode, MemberExprNode, ProgramNode,
+)
+from src.parser.ast_serializer import fingerprint
+from src.utils.line_index import LineIndex
+from .analyzer import SemanticAnalyzer
+from .errors import SemanticError
+from .parallel import apply_annotations, collect_annotations
+from .symbol_table import FlatSymbolTable, Symbol, SymbolKind
+from .type_system import BUILTIN_TYPES, LayoutEngine, StructType, Type
+
+_Dependency = Tuple[str, str]      # ("symbol", "initialized" or "struct", name)
+
+_UNKNOWN = object()
+
+
+def _struct_signature(st: Optional[StructType], layouts: LayoutEngine) -> Any:
+    # The whole layout: a nested struct can change alignment, and so move
+    # the fields after it, without changing size.
+    if st is None:
+        return None
+    layout = layouts.layout(st)
+    fields = tuple((name, str(t), layout.fields[name]) for name, t in st.fields.items())
+    return fields, layout.size, layout.alignment
+
+
+def _type_signature(t: Type, layouts: LayoutEngine) -> Any:
+    return _struct_signature(t, layouts) if isinstance(t, StructType) else str(t)
+
+
+def _symbol_signature(symbol: Optional[Symbol], layouts: LayoutEngine) -> Any:
+    if symbol is None:
+        return None
+    return symbol.kind, _type_signature(symbol.type, layouts)
+
+
+class _Entry(NamedTuple):
+    deps:        Dict[_Dependency, Any]
+    errors:      List[Tuple[str, int, int, str, str]]  # lines relative to the function
+    annotations: tuple
+    initializes: Tuple[str, ...]   # globals the body marked initialized
+    node:        DeclarationNode
+    line:        int     # node.line when the errors were found
+
+    def fits(self, decl: DeclarationNode) -> bool:
+        # Hints quote positions ("declared at 3:5") that cannot be shifted.
+        return decl.line == self.line or not any(error[4] for error in self.errors)
+
+
+class _RecordingSymbolTable(FlatSymbolTable):
+    """FlatSymbolTable noting the global lookups made while `deps` is set."""
+
+    def __init__(self, layouts: LayoutEngine) -> None:
+        super().__init__()
+        self.deps: Optional[Dict[_Dependency, Any]] = None
+        self.layouts = layouts
+
+    def lookup(self, name: str) -> Optional[Symbol]:
+        symbol = super().lookup(name)
+        if self.deps is not None and (symbol is None or self._globals.get(name) is symbol):
+            self.deps[("symbol", name)] = _symbol_signature(symbol, self.layouts)
+            if symbol is not None and symbol.kind == SymbolKind.VARIABLE:
+                # As the body found it, before any assignment of its own.
+                self.deps.setdefault(("initialized", name), symbol.is_initialized)
+        return symbol
+
+    def lookup_global(self, name: str) -> Optional[Symbol]:
+        symbol = super().lookup_global(name)
+        if self.deps is not None:
+            self.deps[("symbol", name)] = _symbol_signature(symbol, self.layouts)
+        return symbol
+
+
+class _CachingAnalyzer(SemanticAnalyzer):
+    def __init__(self, cache: Dict[bytes, _Entry], filename: str, source: str,
+                 line_index: Optional[LineIndex]) -> None:
+        super().__init__(filename, source, line_index)
+        self.symbol_table = _RecordingSymbolTable(self._layouts)
+        self._cache = cache
+        self._deps: Optional[Dict[_Dependency, Any]] = None
+        self._signatures: Dict[_Dependency, Any] = {}
+        self._canonical: Dict[str, str] = {}
+        self.entries: Dict[bytes, _Entry] = {}
+        self.rechecked: List[str] = []
+
+    def _current_signature(self, dep: _Dependency) -> Any:
+        if dep[0] == "initialized":
+            # Changes as bodies run, so it is never memoized.
+            symbol = self.symbol_table.lookup_global(dep[1])
+            return symbol is not None and symbol.is_initialized
+        signature = self._signatures.get(dep, _UNKNOWN)
+        if signature is _UNKNOWN:
+            kind, name = dep
+            if kind == "struct":
+                signature = _struct_signature(self._struct_registry.get(name), self._layouts)
+            else:
+                signature = _symbol_signature(self.symbol_table.lookup_global(name),
+                                              self._layouts)
+            self._signatures[dep] = signature
+        return signature
+
+    def _check_body(self, decl: DeclarationNode) -> Generator[ASTNode, Any, List[SemanticError]]:
+        if not isinstance(decl, FunctionDeclNode):
+            # A global variable: cheap, and later bodies need its symbol.
+            return (yield from super()._check_body(decl))
+        key = fingerprint(decl)
+        entry = self._cache.get(key)
+        if entry is not None and entry.fits(decl) and all(
+                self._current_signature(dep) == signature
+                for dep, signature in entry.deps.items()):
+            if decl is not entry.node:
+                apply_annotations(decl, entry.annotations)
+            self.entries[key] = entry._replace(node=decl, line=decl.line)
+            for name in entry.initializes:
+                self.symbol_table.lookup_global(name).is_initialized = True
+            mark = self._reporter.count()
+            for message, line, column, context, hint in entry.errors:
+                self._reporter.error(message, decl.line + line, column, context, hint)
+            return self._reporter.pop_since(mark)
+
+        self.rechecked.append(decl.name)
+        deps: Dict[_Dependency, Any] = {}
+        self._deps = self.symbol_table.deps = deps
+        try:
+            errors = yield from super()._check_body(decl)
+        finally:
+            self._deps = self.symbol_table.deps = None
+        self.entries[key] = _Entry(
+            deps,
+            [(e.message, e.line - decl.line, e.column, e.context, e.hint) for e in errors],
+            collect_annotations(decl, self._canonical),
+            tuple(name for (kind, name), initialized in deps.items()
+                  if kind == "initialized" and not initialized
+                  and self._current_signature((kind, name))),
+            decl,
+            decl.line,
+        )
+        return errors
+
+    def _resolve_type(self, name: str, node: ASTNode) -> Type:
+        if self._deps is not None and name not in BUILTIN_TYPES:
+            self._deps[("struct", name)] = _struct_signature(self._struct_registry.get(name),
+                                                             self._layouts)
+        return super()._resolve_type(name, node)
+
+    def _resolve_member(self, node: MemberExprNode, base_type: Type,
+                        err_node: ASTNode) -> Optional[Type]:
+        if self._deps is not None and isinstance(base_type, StructType):
+            self._deps[("struct", base_type.name)] = _struct_signature(base_type, self._layouts)
+        return super()._resolve_member(node, base_type, err_node)
+
+
+class IncrementalAnalyzer:
+    """
+    Semantic analysis of one program as it is edited: each analyze() call
+    takes the current ProgramNode and re-checks only the function bodies
+    the edits since the previous call can have affected. Diagnostics and
+    annotations come out as from SemanticAnalyzer.analyze().
+
+    After each call, `analyzer` is the SemanticAnalyzer that ran, with the
+    usual symbol_table, and `rechecked` lists the functions it analysed.
+    """
+
+    def __init__(self, filename: str = "<unknown>") -> None:
+        self.filename = filename
+        self.analyzer: Optional[SemanticAnalyzer] = None
+        self.rechecked: List[str] = []
+        self._cache: Dict[bytes, _Entry] = {}
+
+    def analyze(self, ast: ProgramNode, source: str = "",
+                line_index: Optional[LineIndex] = None) -> bool:
+        """Analyse `ast`; returns True if no errors were found."""
+        analyzer = _CachingAnalyzer(self._cache, self.filename, source, line_index)
+        ok = analyzer.analyze(ast)
+        # Only this version's functions are kept, so the cache stays the
+        # size of the program.
+        self._cache = analyzer.entries
+        self.analyzer = analyzer
+        self.rechecked = analyzer.rechecked
+        return ok
+
+    @property
+    def errors(self) -> List[SemanticError]:
+        return self.analyzer.errors if self.analyzer is not None else []
+
+    def format_errors(self) -> str:
+        return self.analyzer.format_errors() if self.analyzer is not None else ""
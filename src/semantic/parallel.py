@@ -0,0 +1,96 @@
+"""
+Parallel analysis of function bodies.
+
+Once struct types are complete, every signature is in the global scope and
+the global variables have been analysed (passes 1 and 2 of
+SemanticAnalyzer.visit_program, and the struct and global variable parts of
+pass 3), function bodies no longer affect each other: each one only reads
+the global scope and the struct registry. That holds while every global is
+initialized and declared before the first function, which the analyser
+checks. Runs of consecutive functions are analysed in a ProcessPoolExecutor
+by copies of the analyser in that state.
+
+Workers send back each function's diagnostics and the annotations it left
+on the tree: resolved_type for every node, in iter_nodes order, and the
+field index and offset of every MemberExprNode. The parent copies them
+onto its own nodes, so the tree ends up as a serial run leaves it.
+"""
+import gc
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from src.parser.ast_nodes import (
+    ASTVisitor, DeclarationNode, MemberExprNode, iter_nodes, walk,
+)
+from .errors import SemanticError
+
+PARALLEL_CHUNK_FUNCTIONS = 64
+
+_ANALYZER: Optional[ASTVisitor] = None      # set in each worker by _init_worker
+_DECLARATIONS: Sequence[DeclarationNode] = ()
+
+_Annotations = Tuple[List[Optional[str]], List[Tuple[Optional[int], Optional[int]]]]
+
+
+def _init_worker(analyzer: ASTVisitor, declarations: Sequence[DeclarationNode]) -> None:
+    global _ANALYZER, _DECLARATIONS
+    _ANALYZER = analyzer
+    _DECLARATIONS = declarations
+    gc.freeze()
+
+
+def collect_annotations(decl: DeclarationNode, canonical: Dict[str, str]) -> _Annotations:
+    """What analysing `decl` left on its nodes, in iter_nodes order."""
+    types: List[Optional[str]] = []
+    members: List[Tuple[Optional[int], Optional[int]]] = []
+    for node in iter_nodes(decl):
+        resolved = node.resolved_type
+        # One string object per distinct type keeps the pickle small.
+        types.append(resolved if resolved is None else canonical.setdefault(resolved, resolved))
+        if type(node) is MemberExprNode:
+            members.append((node.field_index, node.offset))
+    return types, members
+
+
+def _analyze_chunk(indices: List[int]) -> List[Tuple[List[SemanticError], _Annotations]]:
+    reporter = _ANALYZER._reporter
+    canonical: Dict[str, str] = {}
+    results = []
+    for index in indices:
+        decl = _DECLARATIONS[index]
+        mark = reporter.count()
+        walk(_ANALYZER, decl)
+        results.append((reporter.pop_since(mark), collect_annotations(decl, canonical)))
+    return results
+
+
+def apply_annotations(decl: DeclarationNode, annotations: _Annotations) -> None:
+    """Put annotations from collect_annotations() on an identical `decl`."""
+    types, members = annotations
+    member_info = iter(members)
+    for node, resolved in zip(iter_nodes(decl), types):
+        node.resolved_type = resolved
+        if type(node) is MemberExprNode:
+            node.field_index, node.offset = next(member_info)
+
+
+def analyze_parallel(analyzer: ASTVisitor, declarations: Sequence[DeclarationNode],
+                     indices: Sequence[int], workers: Optional[int] = None,
+                     chunk_size: int = PARALLEL_CHUNK_FUNCTIONS) -> List[List[SemanticError]]:
+    """
+    Analyse declarations[i] for each i in `indices` on `workers` processes.
+
+    Returns each one's diagnostics, in the order of `indices`, and leaves
+    the same annotations on the tree as walking them with `analyzer` would.
+    """
+    jobs = [list(indices[i:i + chunk_size]) for i in range(0, len(indices), chunk_size)]
+    errors: List[List[SemanticError]] = []
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(),
+                             initializer=_init_worker,
+                             initargs=(analyzer, declarations)) as pool:
+        for job, results in zip(jobs, pool.map(_analyze_chunk, jobs)):
+            for index, (decl_errors, annotations) in zip(job, results):
+                apply_annotations(declarations[index], annotations)
+                errors.append(decl_errors)
+    return errors
@@ -2,7 +2,7 @@
 Hierarchical Scope and Symbol Table for Python 3.8+.
 """
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 
 class SymbolKind:
@@ -98,4 +98,78 @@ class SymbolTable:
         return self._global.lookup_local(name)
 
     def dump(self) -> str:
-        return self._global.dump(0)
\ No newline at end of file
+        return self._global.dump(0)
+
+
+class FlatSymbolTable:
+    """
+    SymbolTable without Scope objects for the nested scopes: one stack of
+    bindings per name, plus an undo log of the names each open scope has
+    declared. lookup() is a single dict probe however deeply scopes nest,
+    and exit_scope() costs only the symbols the scope declared.
+
+    The interface is SymbolTable's except that there is no current_scope,
+    and enter_scope()/exit_scope() return None. global_scope is a Scope
+    over the live global symbols.
+    """
+
+    def __init__(self) -> None:
+        # name -> [(scope level, symbol), ...], innermost binding last
+        self._bindings: Dict[str, List[Tuple[int, Symbol]]] = {}
+        self._globals: Dict[str, Symbol] = {}
+        self._undo: List[str] = []      # names defined in open non-global scopes
+        self._marks: List[int] = []     # len(_undo) as each open scope began
+
+    def enter_scope(self, name: str = "") -> None:
+        self._marks.append(len(self._undo))
+
+    def exit_scope(self) -> None:
+        if not self._marks:
+            raise RuntimeError("Cannot exit global scope")
+        mark = self._marks.pop()
+        undo = self._undo
+        bindings = self._bindings
+        while len(undo) > mark:
+            name = undo.pop()
+            stack = bindings[name]
+            stack.pop()
+            if not stack:
+                del bindings[name]
+
+    @property
+    def global_scope(self) -> Scope:
+        return Scope("global", parent=None, symbols=self._globals)
+
+    def depth(self) -> int:
+        return len(self._marks) + 1
+
+    def define(self, symbol: Symbol) -> bool:
+        level = len(self._marks)
+        stack = self._bindings.get(symbol.name)
+        if stack is None:
+            self._bindings[symbol.name] = [(level, symbol)]
+        elif stack[-1][0] == level:
+            return False
+        else:
+            stack.append((level, symbol))
+        if level:
+            self._undo.append(symbol.name)
+        else:
+            self._globals[symbol.name] = symbol
+        return True
+
+    def lookup(self, name: str) -> Optional[Symbol]:
+        stack = self._bindings.get(name)
+        return stack[-1][1] if stack else None
+
+    def lookup_local(self, name: str) -> Optional[Symbol]:
+        stack = self._bindings.get(name)
+        if stack and stack[-1][0] == len(self._marks):
+            return stack[-1][1]
+        return None
+
+    def lookup_global(self, name: str) -> Optional[Symbol]:
+        return self._globals.get(name)
+
+    def dump(self) -> str:
+        return self.global_scope.dump(0)
@@ -2,10 +2,12 @@
 Semantic analyzer Type System. Fully compatible with Python 3.8+.
 """
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Tuple, Set
+from typing import List, NamedTuple, Optional, Dict, Tuple, Set
 
 
 class Type:
+    type_id: int = -1   # index in the TypeInterner of the analysis; see there
+
     def is_numeric(self) -> bool:
         return False
 
@@ -72,6 +74,18 @@ class StructType(Type):
     def __repr__(self) -> str:
         return f"struct {self.name}"
 
+    def size(self) -> int:
+        """Bytes taken by a value of this struct, fields in declaration order."""
+        return LayoutEngine().layout(self).size
+
+    def field_index(self, name: str) -> int:
+        """Position of field `name` in declaration order."""
+        return list(self.fields).index(name)
+
+    def field_offset(self, name: str) -> int:
+        """Byte offset of field `name`, fields in declaration order."""
+        return LayoutEngine().layout(self).fields[name].offset
+
 
 @dataclass(eq=False)
 class FunctionType(Type):
@@ -107,6 +121,104 @@ BUILTIN_TYPES: Dict[str, Type] = {
 }
 
 
+# Bytes of each scalar type; a scalar is aligned to its own size. Other
+# non-struct types, and a struct field that would contain its own
+# enclosing struct again, take one word.
+TYPE_SIZES: Dict[str, int] = {
+    "bool": 1,
+    "int": 8,
+    "float": 8,
+    "string": 8,
+}
+
+WORD_SIZE = 8
+
+# Bump whenever LayoutEngine may place a field differently: the offsets the
+# analyser records are stored in checked ASTs (see parser/ast_cache.py).
+LAYOUT_VERSION = "2"
+
+
+class FieldLayout(NamedTuple):
+    offset:    int
+    size:      int
+    alignment: int
+
+
+@dataclass(frozen=True)
+class StructLayout:
+    """Where the fields of a struct value go, and how big it is."""
+    name:      str
+    fields:    Dict[str, FieldLayout]     # in declaration order
+    size:      int                        # a multiple of alignment
+    alignment: int
+
+    @property
+    def padding(self) -> int:
+        """Bytes of the struct not taken by any field."""
+        return self.size - sum(f.size for f in self.fields.values())
+
+    def memory_order(self) -> List[str]:
+        """Field names by offset."""
+        return sorted(self.fields, key=lambda name: self.fields[name].offset)
+
+
+def _align(offset: int, alignment: int) -> int:
+    return -(-offset // alignment) * alignment
+
+
+class LayoutEngine:
+    """
+    Lays struct types out with every field at a multiple of its alignment,
+    padding as needed, and the size rounded up to the struct's alignment.
+
+    Fields are kept in declaration order unless reorder_fields is set: then
+    they are placed by decreasing alignment, which leaves no padding between
+    them. Layouts are memoized, so a struct's fields must not change after
+    it has been laid out.
+    """
+
+    def __init__(self, reorder_fields: bool = False) -> None:
+        self.reorder_fields = reorder_fields
+        self._layouts: Dict[Tuple[str, Tuple[str, ...]], StructLayout] = {}
+
+    def layout(self, st: StructType, enclosing: Tuple[str, ...] = ()) -> StructLayout:
+        """Layout of `st`, as a field nested in the structs `enclosing`."""
+        key = (st.name, enclosing)
+        layout = self._layouts.get(key)
+        if layout is None:
+            layout = self._layouts[key] = self._compute(st, enclosing + (st.name,))
+        return layout
+
+    def size_and_alignment(self, t: Type, enclosing: Tuple[str, ...] = ()) -> Tuple[int, int]:
+        if isinstance(t, StructType):
+            if t.name in enclosing:
+                return WORD_SIZE, WORD_SIZE
+            layout = self.layout(t, enclosing)
+            return layout.size, layout.alignment
+        size = TYPE_SIZES.get(str(t), WORD_SIZE)
+        return size, size
+
+    def _compute(self, st: StructType, inner: Tuple[str, ...]) -> StructLayout:
+        placed = [(name, *self.size_and_alignment(t, inner)) for name, t in st.fields.items()]
+        if self.reorder_fields:
+            placed.sort(key=lambda item: -item[2])    # stable: ties keep declaration order
+        offsets: Dict[str, FieldLayout] = {}
+        offset = 0
+        alignment = 1
+        for name, size, field_alignment in placed:
+            offset = _align(offset, field_alignment)
+            offsets[name] = FieldLayout(offset, size, field_alignment)
+            offset += size
+            alignment = max(alignment, field_alignment)
+        fields = {name: offsets[name] for name in st.fields}
+        return StructLayout(st.name, fields, _align(offset, alignment), alignment)
+
+
+def type_size(t: Type, enclosing: Tuple[str, ...] = ()) -> int:
+    """Bytes taken by a value of type `t`, struct fields in declaration order."""
+    return LayoutEngine().size_and_alignment(t, enclosing)[0]
+
+
 def resolve_type(name: str, struct_registry: Dict[str, StructType]) -> Optional[Type]:
     if name in BUILTIN_TYPES:
         return BUILTIN_TYPES[name]
@@ -154,4 +266,92 @@ def unary_result_type(op: str, operand: Type) -> Optional[Type]:
     if op == '!':
         if isinstance(operand, BoolType):
             return BOOL
-    return None
\ No newline at end of file
+    return None
+
+
+_UNARY_OPS: Tuple[str, ...] = ('-', '!')
+_BINARY_OPS: Tuple[str, ...] = tuple(sorted(_ARITHMETIC_OPS | _COMPARISON_OPS | _LOGICAL_OPS))
+
+# Builtin types have these ids in every TypeInterner.
+INT_ID, FLOAT_ID, BOOL_ID, STRING_ID, VOID_ID, NULL_ID = range(6)
+for _type_id, _builtin in enumerate((INT, FLOAT, BOOL, STRING, VOID, NULL)):
+    _builtin.type_id = _type_id
+
+
+class TypeInterner:
+    """
+    Small integer ids for the types of one analysis, with the answers to
+    binary_result_type, unary_result_type and is_assignable_from kept in
+    tables indexed by id.
+
+    Equal types share an id, and every interned type object carries it as
+    `type_id`, so the analyser looks results up without formatting or
+    comparing types. Struct and function types must be interned by the
+    analysis that made them. Tables are filled in up front for the builtin
+    types and on first use for the others.
+    """
+
+    def __init__(self) -> None:
+        self._ids: Dict[Type, int] = {}
+        self.types: List[Type] = []
+        self.names: List[str] = []      # str(type), by id
+        self._binary: Dict[Tuple[str, int, int], Optional[int]] = {}
+        self._unary: Dict[Tuple[str, int], Optional[int]] = {}
+        self._assignable: Dict[Tuple[int, int], bool] = {}
+
+        for builtin in (INT, FLOAT, BOOL, STRING, VOID, NULL):
+            self.intern(builtin)
+        builtin_ids = range(len(self.types))
+        for left in builtin_ids:
+            for op in _UNARY_OPS:
+                self._unary[op, left] = self._compute_unary(op, left)
+            for right in builtin_ids:
+                self._assignable[left, right] = self._compute_assignable(left, right)
+                for op in _BINARY_OPS:
+                    self._binary[op, left, right] = self._compute_binary(op, left, right)
+
+    def intern(self, t: Type) -> int:
+        """The id of `t`, which is given one if no equal type has it yet."""
+        type_id = self._ids.get(t)
+        if type_id is None:
+            type_id = self._ids[t] = len(self.types)
+            self.types.append(t)
+            self.names.append(str(t))
+        t.type_id = type_id
+        return type_id
+
+    def binary(self, op: str, left: int, right: int) -> Optional[int]:
+        """Id of binary_result_type(op, ...) for operands of the given ids."""
+        try:
+            return self._binary[op, left, right]
+        except KeyError:
+            result = self._binary[op, left, right] = self._compute_binary(op, left, right)
+            return result
+
+    def unary(self, op: str, operand: int) -> Optional[int]:
+        """Id of unary_result_type(op, ...) for an operand of the given id."""
+        try:
+            return self._unary[op, operand]
+        except KeyError:
+            result = self._unary[op, operand] = self._compute_unary(op, operand)
+            return result
+
+    def assignable(self, target: int, source: int) -> bool:
+        """types[target].is_assignable_from(types[source])."""
+        try:
+            return self._assignable[target, source]
+        except KeyError:
+            result = self._assignable[target, source] = self._compute_assignable(target, source)
+            return result
+
+    def _result_id(self, t: Optional[Type]) -> Optional[int]:
+        return None if t is None else self.intern(t)
+
+    def _compute_binary(self, op: str, left: int, right: int) -> Optional[int]:
+        return self._result_id(binary_result_type(op, self.types[left], self.types[right]))
+
+    def _compute_unary(self, op: str, operand: int) -> Optional[int]:
+        return self._result_id(unary_result_type(op, self.types[operand]))
+
+    def _compute_assignable(self, target: int, source: int) -> bool:
+        return self.types[target].is_assignable_from(self.types[source])
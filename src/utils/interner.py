@@ -0,0 +1,34 @@
+"""
+String interning pool shared by the stages of one compilation.
+
+The scanner interns every identifier lexeme and the IR generator interns
+the temp and label names it invents, so equal names are the same object
+from tokens through AST nodes, symbol tables, IR arguments and stack
+frame slots. Dict lookups then hit the identity fast path, and repeated
+names are stored once.
+"""
+from typing import Dict, Iterator
+
+
+class StringPool:
+    """
+    Maps each string to its canonical instance.
+
+    Unlike sys.intern the pool is owned by a compilation and is freed with
+    it, which keeps long-running processes from accumulating names.
+    """
+
+    def __init__(self) -> None:
+        self._strings: Dict[str, str] = {}
+
+    def intern(self, text: str) -> str:
+        return self._strings.setdefault(text, text)
+
+    def __contains__(self, text: object) -> bool:
+        return text in self._strings
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._strings)
@@ -0,0 +1,65 @@
+"""
+Newline offset index: maps absolute source offsets to line/column pairs.
+
+Built once per source with re.finditer and queried by binary search, so the
+scanner can record bare offsets and diagnostics can fetch single lines
+without re-splitting the whole source.
+
+The source may also be bytes or an mmap (see BytesScanner); offsets and
+columns are then byte based and line_text() decodes the requested line.
+"""
+import re
+from array import array
+from bisect import bisect_right
+from typing import Tuple, Union
+
+_NEWLINE = re.compile("\n")
+_NEWLINE_BYTES = re.compile(b"\n")
+
+
+class LineIndex:
+    """
+    Line starts of a source text.
+
+    Lines and columns are 1-based and count characters, exactly like the
+    scanner. Indexing with a 0-based line number returns that line's text,
+    so a LineIndex can stand in for source.splitlines() in diagnostics.
+    """
+
+    def __init__(self, source: Union[str, bytes]) -> None:
+        self.source = source
+        newline = _NEWLINE if isinstance(source, str) else _NEWLINE_BYTES
+        self._starts = array('i', [0])
+        self._starts.extend(m.end() for m in newline.finditer(source))
+
+    def line_of(self, offset: int) -> int:
+        return bisect_right(self._starts, offset)
+
+    def column_of(self, offset: int) -> int:
+        return offset - self._starts[bisect_right(self._starts, offset) - 1] + 1
+
+    def position(self, offset: int) -> Tuple[int, int]:
+        line = bisect_right(self._starts, offset)
+        return line, offset - self._starts[line - 1] + 1
+
+    def offset_of(self, line: int, column: int) -> int:
+        return self._starts[line - 1] + column - 1
+
+    def line_text(self, line: int) -> str:
+        """Text of 1-based `line` without its line terminator."""
+        start = self._starts[line - 1]
+        end = self._starts[line] - 1 if line < len(self._starts) else len(self.source)
+        text = self.source[start:end]
+        if not isinstance(text, str):
+            text = text.decode("utf-8")
+        return text[:-1] if text.endswith("\r") else text
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += len(self._starts)
+        if not 0 <= index < len(self._starts):
+            raise IndexError("line index out of range")
+        return self.line_text(index + 1)
@@ -0,0 +1,63 @@
+"""
+Explicit-stack driver for generator-based recursion.
+
+Recursive passes over source structure (the parser's grammar rules, AST
+visitors) are written as generators that `yield` whatever they would
+otherwise have recursed into and receive its result back from the yield.
+run() keeps the suspended generators on a list, so nesting depth is
+bounded by memory rather than by the interpreter's recursion limit, and
+each level costs O(1) to enter and leave.
+"""
+from types import GeneratorType
+from typing import Any, Callable, Generator, List, Optional
+
+
+def run(task: Generator, expand: Optional[Callable[[Any], Any]] = None) -> Any:
+    """
+    Run `task` to completion and return its return value.
+
+    Each value the task yields is a request. Without `expand` the request
+    must itself be a generator, which is run the same way. With `expand`,
+    the request is passed to it first: a generator result is run as a
+    sub-task and anything else is sent straight back as the answer.
+
+    An exception escaping a sub-task is thrown into the task that yielded
+    it, at its yield, so try/except around `yield` behaves like it does
+    around a call.
+    """
+    stack: List[Generator] = []     # suspended callers of `current`
+    current = task
+    value: Any = None
+    error: Optional[BaseException] = None
+    while True:
+        try:
+            if error is None:
+                request = current.send(value)
+            else:
+                pending, error = error, None
+                request = current.throw(pending)
+        except StopIteration as done:
+            if not stack:
+                return done.value
+            current = stack.pop()
+            value = done.value
+            continue
+        except Exception as exc:
+            if not stack:
+                raise
+            current = stack.pop()
+            error = exc
+            continue
+
+        if expand is not None:
+            try:
+                request = expand(request)
+            except Exception as exc:
+                error = exc
+                continue
+            if type(request) is not GeneratorType:
+                value = request
+                continue
+        stack.append(current)
+        current = request
+        value = None
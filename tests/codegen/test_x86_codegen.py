@@ -20,6 +20,10 @@ VALID_CODEGEN_CASES = [
     "function_call.src",
     "if_else.src",
     "while_loop.src",
+    "struct_fields.src",
+    "struct_padding.src",
+    "struct_copy.src",
+    "struct_assign.src",
 ]
 
 
@@ -23,6 +23,10 @@ VALID_IR_CASES = [
     "function_call_ir.src",
     "if_else_ir.src",
     "while_ir.src",
+    "struct_fields_ir.src",
+    "struct_padding_ir.src",
+    "struct_copy_ir.src",
+    "struct_assign_ir.src",
 ]
 
 INVALID_IR_CASES = [
@@ -168,3 +172,80 @@ def test_ir_infinite_while_program_generates_cfg_without_crash():
 
     assert "digraph" in dot
     assert "while" in dot
+
+
+def test_ir_names_are_interned_in_the_scanner_pool():
+    src_path = VALID_DIR / "while_ir.src"
+    source = src_path.read_text(encoding="utf-8")
+
+    scanner = Scanner(source, filename=str(src_path))
+    ast = Parser(scanner.scan_tokens()).parse()
+    program = IRGenerator(scanner.pool).generate(ast)
+
+    names = [
+        name
+        for block in program.get_function("main").blocks
+        for instr in block.instructions
+        for name in [instr.dest, *instr.args]
+        if isinstance(name, str)
+    ]
+    x_refs = {id(name) for name in names if name == "x"}
+    assert len(x_refs) == 1
+    assert all(name in scanner.pool for name in names if name.startswith("t"))
+    assert any(block.label in scanner.pool for block in program.get_function("main").blocks)
+
+
+def test_ir_generation_handles_deep_expression_nesting():
+    depth = 10_000
+    source = "fn m(int a) -> int { return " + "a + (" * depth + "a" + ")" * depth + "; }"
+
+    program = IRGenerator().generate(_parse(source, "<deep>"))
+
+    opcodes = [instr.opcode for block in program.get_function("m").blocks
+               for instr in block.instructions]
+    assert opcodes.count("ADD") == depth
+    assert opcodes[-1] == "RETURN"
+
+
+def test_100k_deep_nesting_goes_through_parse_semantic_and_ir():
+    depth = 100_000
+    source = (
+        "fn m(int a, bool b) -> int {\n"
+        + "if (b) " * depth + "{ a = a + 1; }\n"
+        + "return " + "a + (" * depth + "a" + ")" * depth + ";\n}\n"
+    )
+
+    program = IRGenerator().generate(_semantic_ok(source, "<deep>"))
+
+    opcodes = [instr.opcode for block in program.get_function("m").blocks
+               for instr in block.instructions]
+    assert opcodes.count("ADD") == depth + 1
+    assert opcodes[-1] == "RETURN"
+
+
+@pytest.mark.parametrize("body, culprit", [
+    ("return g(w.b);", "'w.b'"),
+    ("B u = w.b; return g(u);", "'u'"),
+    ("B u; B t; u = t = w.b; return 0;", "this value"),
+])
+def test_structs_too_big_for_a_register_are_rejected_outside_copies(body, culprit):
+    from src.ir.ir_generator import IRGenerationError
+
+    source = ("struct B { int x; int y; }\n"
+              "struct A { B b; }\n"
+              "fn g(B p) -> int { return p.x; }\n"
+              "fn main() -> int { A w; " + body + " }\n")
+    ast = _semantic_ok(source, "<copy>")
+
+    with pytest.raises(IRGenerationError, match=f"{culprit}: it is a 16-byte struct B"):
+        IRGenerator().generate(ast)
+
+
+def test_unresolved_field_access_is_an_ir_generation_error():
+    from src.ir.ir_generator import IRGenerationError
+
+    source = "struct P { int x; }\nfn main() -> int { P a; a.x = 1; return a.x; }\n"
+    ast = _parse(source, "<unresolved>")
+
+    with pytest.raises(IRGenerationError, match=r"2:\d+: field access 'a.x' was not resolved"):
+        IRGenerator().generate(ast)
@@ -4,6 +4,7 @@ These tests DO NOT generate fixtures. They only read existing files from:
   tests/lexer/valid/*.src + matching *.txt
   tests/lexer/invalid/*.src
 """
+import sys
 from pathlib import Path
 import pytest
 
@@ -79,3 +80,308 @@ def test_invalid_lexer_cases_report_errors(src_path: Path):
     assert scanner.errors or any(t.type == TokenType.ERROR for t in tokens), (
         "Invalid lexer case did not report any error"
     )
+
+
+def _snapshot(source: str, engine: str):
+    scanner = Scanner(source, filename="<test>", engine=engine)
+    tokens = scanner.scan_tokens()
+    return (
+        [(t.type, t.lexeme, t.line, t.column, t.literal) for t in tokens],
+        [str(e) for e in scanner.errors],
+    )
+
+
+EDGE_CASES = [
+    "/* outer /* inner */ still comment */ x",
+    "/* never closed /* nested */",
+    '"tab\\there" "bad \\q escape" "line\\\nbreak"',
+    '"unterminated\nnext',
+    "1. 1.5.3 .5x 12abc 99999999999",
+    "a->b -= c /= d // trailing",
+    "x\t \r\n  y   ",
+    "é½ & | ~",
+    "a" * 300,
+]
+
+
+@pytest.mark.parametrize(
+    "source",
+    [p.read_text(encoding="utf-8") for p in valid_cases + invalid_cases] + EDGE_CASES,
+    ids=[p.name for p in valid_cases + invalid_cases] + [f"edge{i}" for i in range(len(EDGE_CASES))],
+)
+def test_regex_engine_matches_legacy_engine(source: str):
+    assert _snapshot(source, "regex") == _snapshot(source, "legacy")
+
+
+def test_unknown_engine_is_rejected():
+    with pytest.raises(ValueError):
+        Scanner("x", engine="dfa")
+
+
+def test_iter_tokens_is_lazy_and_matches_scan_tokens():
+    source = (VALID_DIR / "12_mixed_expression.src").read_text(encoding="utf-8")
+    stream = Scanner(source).iter_tokens()
+    first = next(stream)
+    assert first.type == TokenType.KW_FN
+    rest = list(stream)
+    assert [first] + rest == Scanner(source).scan_tokens()
+
+
+@pytest.mark.parametrize("src_path", valid_cases + invalid_cases, ids=lambda p: p.name)
+def test_token_buffer_views_match_token_list(src_path: Path):
+    source = src_path.read_text(encoding="utf-8")
+    tokens = Scanner(source).scan_tokens()
+    buffer = Scanner(source).scan_buffer()
+
+    assert len(buffer) == len(tokens)
+    assert list(buffer) == tokens
+    assert [buffer.type_at(i) for i in range(len(buffer))] == [t.type for t in tokens]
+    assert buffer[-1].type == TokenType.EOF
+
+
+@pytest.mark.parametrize("src_path", valid_cases + invalid_cases, ids=lambda p: p.name)
+def test_lazy_positions_match_eager_positions(src_path: Path):
+    source = src_path.read_text(encoding="utf-8")
+    eager_scanner = Scanner(source)
+    eager = eager_scanner.scan_tokens()
+    lazy_scanner = Scanner(source, lazy_positions=True)
+    lazy = lazy_scanner.scan_tokens()
+
+    assert lazy == eager
+    assert [(t.line, t.column) for t in lazy] == [(t.line, t.column) for t in eager]
+    assert list(map(str, lazy_scanner.errors)) == list(map(str, eager_scanner.errors))
+    assert list(Scanner(source, lazy_positions=True).scan_buffer()) == eager
+
+
+def test_lazy_positions_place_lexer_errors_like_eager_positions():
+    from src.lexer.token_types import LazyToken, Token
+
+    source = ('int a = 1;\n  x = "p\\\nq\\z" @ 2abc;\n\n'
+              '  y = 3.;\n"tail\n$ 99999999999999999999\n/* open\n')
+    eager_scanner = Scanner(source)
+    eager = eager_scanner.scan_tokens()
+    lazy_scanner = Scanner(source, lazy_positions=True)
+
+    lazy = lazy_scanner.scan_tokens()
+
+    assert list(map(str, lazy_scanner.errors)) == list(map(str, eager_scanner.errors))
+    assert len(eager_scanner.errors) == 9
+    # A lazy token's position is that of its offset, even for the error
+    # token of a string continued over an escaped newline.
+    assert ([(t.type, t.lexeme, t.offset) for t in lazy]
+            == [(t.type, t.lexeme, t.offset) for t in eager])
+    # Without line and column slots a lazy token is smaller than a Token.
+    assert sys.getsizeof(lazy[0]) < sys.getsizeof(eager[0])
+    assert isinstance(lazy[0], LazyToken) and isinstance(eager[0], Token)
+
+
+def test_line_index_resolves_offsets_and_lines():
+    source = "fn a\r\n  b\n\nc"
+    index = Scanner(source, lazy_positions=True).line_index
+
+    assert index.position(0) == (1, 1)
+    assert index.position(source.index("b")) == (2, 3)
+    assert index.position(len(source)) == (4, 2)
+    assert index.offset_of(4, 1) == source.index("c")
+    assert list(index) == ["fn a", "  b", "", "c"]
+
+
+def test_lazy_positions_require_regex_engine():
+    with pytest.raises(ValueError):
+        Scanner("x", engine="legacy", lazy_positions=True)
+
+
+def _buffer_snapshot(buffer):
+    return [(t.type, t.lexeme, t.line, t.column, t.literal, t.offset) for t in buffer]
+
+
+@pytest.mark.parametrize(
+    "source",
+    ["".join(p.read_text(encoding="utf-8") for p in valid_cases + invalid_cases)] + EDGE_CASES,
+    ids=["all_goldens"] + [f"edge{i}" for i in range(len(EDGE_CASES))],
+)
+def test_parallel_scan_matches_serial_scan(source: str):
+    serial = Scanner(source)
+    expected = _buffer_snapshot(serial.scan_buffer())
+
+    parallel = Scanner(source)
+    buffer = parallel.scan_buffer(workers=2, chunk_size=8)
+
+    assert _buffer_snapshot(buffer) == expected
+    assert list(map(str, parallel.errors)) == list(map(str, serial.errors))
+
+
+def test_safe_boundaries_skip_comments_and_strings():
+    from src.lexer.parallel import find_safe_boundaries
+
+    source = 'a\n/* x\n/* y */\nz */\n"s\\\nt"\n// "\nb\n'
+    bounds = find_safe_boundaries(source, chunk_size=1)
+
+    assert bounds == [2, 20, 27, 32]
+
+
+UNICODE_CASES = [
+    'string s = "héllo, мир"; int x = 1;',
+    '"日本\\q語" x /* ü\n ß */ y // ç',
+    'int café = 1; é½ ٣.5 .٣ 12ab€ x',
+    '"a\\\né" b\n"unterminated ñ\nc',
+]
+
+
+@pytest.mark.parametrize(
+    "source",
+    [p.read_text(encoding="utf-8") for p in valid_cases + invalid_cases] + EDGE_CASES + UNICODE_CASES,
+    ids=[p.name for p in valid_cases + invalid_cases]
+        + [f"edge{i}" for i in range(len(EDGE_CASES))]
+        + [f"unicode{i}" for i in range(len(UNICODE_CASES))],
+)
+def test_bytes_scanner_matches_str_scanner(source: str):
+    from src.lexer.bytes_scanner import BytesScanner
+
+    data = source.encode("utf-8")
+    bytes_scanner = BytesScanner(data)
+    tokens = bytes_scanner.scan_tokens()
+
+    assert _snapshot(source, "regex") == (
+        [(t.type, t.lexeme, t.line, t.column, t.literal) for t in tokens],
+        [str(e) for e in bytes_scanner.errors],
+    )
+    for token in tokens:
+        assert data[token.offset:].decode("utf-8").startswith(token.lexeme)
+
+
+def test_bytes_scanner_reads_memory_mapped_file(tmp_path):
+    from src.lexer.bytes_scanner import BytesScanner
+
+    source = UNICODE_CASES[0]
+    path = tmp_path / "input.src"
+    path.write_text(source, encoding="utf-8")
+
+    with BytesScanner.from_path(path) as scanner:
+        assert scanner.scan_tokens() == Scanner(source).scan_tokens()
+    assert scanner._source.closed
+    (tmp_path / "empty.src").write_bytes(b"")
+    with BytesScanner.from_path(tmp_path / "empty.src") as scanner:
+        assert [t.type for t in scanner.scan_tokens()] == [TokenType.EOF]
+
+
+@pytest.mark.parametrize("source", UNICODE_CASES, ids=lambda s: s[:12])
+def test_bytes_scanner_buffer_matches_str_scanner_buffer(source: str):
+    from src.lexer.bytes_scanner import BytesScanner
+
+    expected = Scanner(source).scan_buffer()
+    buffer = BytesScanner(source.encode("utf-8")).scan_buffer()
+
+    assert buffer.source == source
+    assert list(buffer) == list(expected)
+    assert [t.offset for t in buffer] == [t.offset for t in expected]
+
+
+@pytest.mark.parametrize("engine", ["regex", "legacy"])
+def test_identifier_lexemes_are_interned(engine: str):
+    scanner = Scanner("int count = count + count;", engine=engine)
+    counts = [t.lexeme for t in scanner.scan_tokens() if t.type == TokenType.IDENTIFIER]
+
+    assert len(counts) == 3
+    assert counts[0] is counts[1] is counts[2]
+    assert "count" in scanner.pool
+
+
+def test_buffer_identifier_lexemes_are_interned_on_cache_hits(tmp_path):
+    from src.lexer.token_cache import TokenCache
+    from src.utils.interner import StringPool
+
+    cache = TokenCache(tmp_path)
+    source = "int count = count + count;"
+    for _run in range(2):
+        pool = StringPool()
+        buffer = Scanner(source, pool=pool, cache=cache).scan_buffer()
+        counts = [t.lexeme for t in buffer if t.type == TokenType.IDENTIFIER]
+
+        assert len(counts) == 3
+        assert all(lexeme is pool.intern("count") for lexeme in counts)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+RELEX_EDITS = [
+    ("insert", lambda src: (len(src) // 2, len(src) // 2, "x ")),
+    ("newline", lambda src: (len(src) // 3, len(src) // 3, "\n")),
+    ("delete", lambda src: (len(src) // 4, len(src) // 4 + 3, "")),
+    ("comment", lambda src: (0, 0, "/* ")),
+    ("append", lambda src: (len(src), len(src), "\n\"open")),
+]
+
+
+@pytest.mark.parametrize("edit", RELEX_EDITS, ids=[name for name, _ in RELEX_EDITS])
+@pytest.mark.parametrize("src_path", valid_cases + invalid_cases, ids=lambda p: p.name)
+def test_relex_matches_full_rescan(src_path: Path, edit):
+    source = src_path.read_text(encoding="utf-8")
+    start, end, text = edit[1](source)
+    edited = source[:start] + text + source[end:]
+
+    scanner = Scanner(source)
+    tokens = scanner.relex(scanner.scan_tokens(), (start, end), text)
+    fresh = Scanner(edited)
+    expected = fresh.scan_tokens()
+
+    assert tokens == expected
+    assert [t.offset for t in tokens] == [t.offset for t in expected]
+    assert list(map(str, scanner.errors)) == list(map(str, fresh.errors))
+
+
+def test_relex_reuses_tokens_after_the_edit():
+    source = "int a = 1;\nint b = 2;\nint c = 3;\n"
+    scanner = Scanner(source)
+    old = scanner.scan_tokens()
+    tail = old[-6:]
+
+    tokens = scanner.relex(old, (4, 5), "alpha\n")
+
+    assert tokens[1].lexeme == "alpha"
+    assert all(a is b for a, b in zip(tokens[-6:], tail))
+    assert (tokens[-2].line, tokens[-2].column, tokens[-2].offset) == (4, 10, source.index("3;") + 1 + 5)
+
+
+@pytest.mark.parametrize("engine", ["regex", "legacy"])
+def test_dispatch_tables_cover_every_operator_and_keyword(engine: str):
+    from src.lexer.token_types import KEYWORD_TOKENS, OPERATORS
+
+    for lexeme, ttype in OPERATORS.items():
+        tokens = Scanner(f"a {lexeme} b", engine=engine).scan_tokens()
+        assert [(t.type, t.lexeme) for t in tokens[1:-2]] == [(ttype, lexeme)]
+
+    for word, (ttype, literal) in KEYWORD_TOKENS.items():
+        token = Scanner(word, engine=engine).scan_tokens()[0]
+        assert (token.type, token.literal) == (ttype, literal)
+
+
+@pytest.mark.parametrize("src_path", valid_cases + invalid_cases, ids=lambda p: p.name)
+def test_token_cache_hit_matches_fresh_scan(src_path: Path, tmp_path):
+    from src.lexer.token_cache import TokenCache
+
+    source = src_path.read_text(encoding="utf-8")
+    cache = TokenCache(tmp_path)
+    first = Scanner(source, cache=cache)
+    expected = [(t.type, t.lexeme, t.line, t.column, t.literal, t.offset)
+                for t in first.scan_buffer()]
+    second = Scanner(source, cache=cache)
+    tokens = second.scan_buffer()
+
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert [(t.type, t.lexeme, t.line, t.column, t.literal, t.offset)
+            for t in tokens] == expected
+    assert [type(t.literal) for t in tokens] == [type(e[4]) for e in expected]
+    assert list(map(str, second.errors)) == list(map(str, first.errors))
+
+
+def test_token_cache_treats_corrupt_entry_as_miss(tmp_path):
+    from src.lexer.token_cache import TokenCache
+
+    cache = TokenCache(tmp_path)
+    source = "int a = 1;"
+    Scanner(source, cache=cache).scan_buffer()
+    cache.path_for(source).write_bytes(b"garbage")
+
+    assert len(Scanner(source, cache=cache).scan_buffer()) == 6
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert cache.load(source) is not None
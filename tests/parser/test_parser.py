@@ -78,3 +78,447 @@ def test_invalid_parser_cases_match_expected_errors(src_path: Path):
     expected_norm = _normalise(expected)
     actual_norm = _normalise(actual)
     assert actual_norm == expected_norm or expected_norm in actual_norm
+
+
+@pytest.mark.parametrize("src_path", valid_cases + invalid_cases, ids=lambda p: p.name)
+def test_streamed_tokens_parse_like_token_list(src_path: Path):
+    source = src_path.read_text(encoding="utf-8")
+    list_parser, list_ast = _parse(source, str(src_path))
+
+    stream_parser = Parser(Scanner(source, filename=str(src_path)).iter_tokens())
+    stream_ast = stream_parser.parse()
+
+    assert _parser_errors_text(stream_parser) == _parser_errors_text(list_parser)
+    assert TextPrinter().print(stream_ast) == TextPrinter().print(list_ast)
+
+
+@pytest.mark.parametrize("src_path", valid_cases, ids=lambda p: p.name)
+def test_parser_indexes_token_buffer_directly(src_path: Path):
+    source = src_path.read_text(encoding="utf-8")
+    _list_parser, list_ast = _parse(source, str(src_path))
+
+    buffer_ast = Parser(Scanner(source).scan_buffer()).parse()
+
+    assert TextPrinter().print(buffer_ast) == TextPrinter().print(list_ast)
+
+
+def _render(node) -> str:
+    from src.parser.ast_nodes import (
+        AssignmentExprNode, BinaryExprNode, IdentifierExprNode,
+        LiteralExprNode, MemberExprNode, UnaryExprNode,
+    )
+    if isinstance(node, BinaryExprNode):
+        return f"({_render(node.left)} {node.operator} {_render(node.right)})"
+    if isinstance(node, UnaryExprNode):
+        return f"({node.operator}{_render(node.operand)})"
+    if isinstance(node, AssignmentExprNode):
+        return f"({node.target} {node.operator} {_render(node.value)})"
+    if isinstance(node, (IdentifierExprNode, MemberExprNode)):
+        return str(node)
+    assert isinstance(node, LiteralExprNode)
+    return str(node.value)
+
+
+@pytest.mark.parametrize("source, expected", [
+    ("a - b - c", "((a - b) - c)"),
+    ("a + b * c % d", "(a + ((b * c) % d))"),
+    ("-a * b", "((-a) * b)"),
+    ("!a == b && c < d || e", "((((!a) == b) && (c < d)) || e)"),
+    ("a = b += c || d", "(a = (b += (c || d)))"),
+    ("(a + b) * - - c", "((a + b) * (-(-c)))"),
+    ("a <= b != c > d", "((a <= b) != (c > d))"),
+])
+def test_expression_precedence_and_associativity(source: str, expected: str):
+    parser, ast = _parse(f"fn m() {{ {source}; }}", "<expr>")
+
+    assert parser.errors == []
+    assert _render(ast.declarations[0].body.statements[0].expression) == expected
+
+
+def test_assignment_to_non_identifier_is_rejected():
+    parser, _ast = _parse("fn m() { a + b = c; }", "<expr>")
+
+    assert [e.message for e in parser.errors] == ["invalid assignment target"]
+
+
+def test_member_access_nests_left_to_right():
+    from src.parser.ast_nodes import IdentifierExprNode, MemberExprNode
+
+    parser, ast = _parse("fn m() { p.q.r = p.q; }", "<expr>")
+
+    assert parser.errors == []
+    assign = ast.declarations[0].body.statements[0].expression
+    target = assign.target
+    assert isinstance(target, MemberExprNode) and target.field_name == "r"
+    assert isinstance(target.base, MemberExprNode) and target.base.field_name == "q"
+    assert isinstance(target.base.base, IdentifierExprNode)
+    assert _render(assign) == "(p.q.r = p.q)"
+
+
+DEEP = 10_000   # far past the default recursion limit of 1000
+
+
+@pytest.mark.parametrize("source", [
+    "fn m() -> int { return " + "(" * DEEP + "1" + ")" * DEEP + "; }",
+    "fn m() -> int { return " + "-" * DEEP + "1; }",
+    "fn m() -> int { return " + "a + (" * DEEP + "a" + ")" * DEEP + "; }",
+    "fn m() { " + "x = " * DEEP + "1; }",
+    "fn m() { " + "f(" * DEEP + ")" * DEEP + "; }",
+    "fn m() { " + "{" * DEEP + "}" * DEEP + " }",
+    "fn m() { " + "if (a) " * DEEP + "x = 1; }",
+], ids=["parens", "unary", "nested-binary", "assign", "calls", "blocks", "ifs"])
+def test_deeply_nested_input_parses_without_recursion(source: str):
+    from src.parser.ast_printer import DotPrinter
+
+    parser, ast = _parse(source, "<deep>")
+
+    assert parser.errors == []
+    assert DotPrinter().generate(ast).startswith("digraph AST {")
+
+
+def test_parse_errors_unwind_through_deep_nesting():
+    source = "fn m() { " + "{" * DEEP + "x = ; y = 1;" + "}" * DEEP + " }"
+
+    parser, ast = _parse(source, "<deep>")
+
+    assert [e.message for e in parser.errors] == ["unexpected token ';'"]
+    assert ast is not None
+
+
+def test_text_and_json_printers_handle_deep_trees():
+    import json
+    from src.parser.ast_printer import JsonPrinter
+
+    # Indentation makes these outputs quadratic in depth; keep it modest.
+    depth = 3000
+    _parser, ast = _parse("fn m() -> int { return " + "-" * depth + "1; }", "<deep>")
+
+    assert TextPrinter().print(ast).count("Unary") == depth
+    assert JsonPrinter().serialise(ast).count('"node": "Unary"') == depth
+
+    _parser, shallow = _parse("fn m() -> int { return -(1 + 2) * 3; }", "<shallow>")
+    assert JsonPrinter().serialise(shallow) == json.dumps(
+        json.loads(JsonPrinter().serialise(shallow)), indent=2
+    )
+
+
+@pytest.mark.parametrize("src_path", valid_cases, ids=lambda p: p.name)
+def test_streaming_printers_write_the_string_output(src_path: Path):
+    import io
+    from src.parser.ast_printer import DotPrinter, JsonPrinter
+
+    _parser, ast = _parse(src_path.read_text(encoding="utf-8"), str(src_path))
+
+    for printer, render in ((TextPrinter(), TextPrinter().print),
+                            (JsonPrinter(), JsonPrinter().serialise)):
+        out = io.StringIO()
+        printer.write(ast, out)
+        assert out.getvalue() == render(ast) + "\n"
+
+    # DOT streams each edge right after its nodes: same lines, other order.
+    out = io.StringIO()
+    DotPrinter().write(ast, out)
+    assert sorted(out.getvalue().splitlines()) == sorted(DotPrinter().generate(ast).splitlines())
+
+
+def test_max_depth_prints_deeper_nodes_as_placeholders():
+    import io
+    import json
+    from src.parser.ast_printer import DotPrinter, JsonPrinter
+
+    _parser, ast = _parse("fn m(int a) -> int { return -(a + 1); }", "<depth>")
+
+    assert TextPrinter().print(ast, max_depth=1).splitlines() == [
+        "Program [1:1]",
+        "  FunctionDecl: m(int a) -> int [1:1]",
+        "    Block ... [1:20]",
+    ]
+    data = json.loads(JsonPrinter().serialise(ast, max_depth=0))
+    assert data["declarations"] == [{"node": "FunctionDecl", "line": 1, "column": 1, "elided": True}]
+    assert json.loads(JsonPrinter().serialise(ast, max_depth=99)) == json.loads(JsonPrinter().serialise(ast))
+
+    out = io.StringIO()
+    DotPrinter().write(ast, out, max_depth=0)
+    assert DotPrinter().generate(ast, max_depth=0).count("->") == 1
+    assert out.getvalue().count('label="FunctionDecl\\n..."') == 1
+
+
+def test_ast_nodes_are_slotted():
+    import gc
+    from src.parser.ast_nodes import ASTNode, LiteralExprNode
+
+    _parser, ast = _parse(
+        "struct P { int x; } fn m(int a) -> int { for (int i = 0; i < a; i += 1) "
+        "{ if (a) { a = -f(i); } else { while (a) { return 1; } } } return a; }",
+        "<slots>",
+    )
+    nodes = [o for o in gc.get_objects() if isinstance(o, ASTNode)]
+    assert {type(n).__name__ for n in nodes} >= {"ForStmtNode", "StructDeclNode", "CallExprNode"}
+    assert not any(hasattr(n, "__dict__") for n in nodes)
+
+    node = LiteralExprNode(1, 2, 3, "int")
+    node.resolved_type = "int"
+    with pytest.raises(AttributeError):
+        node.extra = True
+
+
+@pytest.mark.parametrize("src_path", valid_cases, ids=lambda p: p.name)
+def test_lazy_bodies_print_like_eager_parse(src_path: Path):
+    source = src_path.read_text(encoding="utf-8")
+    _eager_parser, eager_ast = _parse(source, str(src_path))
+
+    lazy_parser = Parser(Scanner(source).scan_buffer(), lazy_bodies=True)
+    lazy_ast = lazy_parser.parse()
+
+    assert TextPrinter().print(lazy_ast) == TextPrinter().print(eager_ast)
+    assert lazy_parser.errors == []
+
+
+def test_lazy_bodies_are_parsed_on_first_access():
+    from src.parser.ast_nodes import LazyFunctionDeclNode
+
+    source = "fn a() { x = {; } } fn b(int n) -> int { return n + 1; }"
+    parser = Parser(_scan(source, "<lazy>"), lazy_bodies=True)
+    a, b = parser.parse().declarations
+
+    assert isinstance(a, LazyFunctionDeclNode) and not a.body_parsed
+    assert (b.name, b.return_type, b.params[0].name) == ("b", "int", "n")
+    assert parser.errors == []
+
+    assert _render(b.body.statements[0].value) == "(n + 1)"
+    assert b.body_parsed and not a.body_parsed
+    assert parser.errors == []
+
+    # Recovery inside a body stays within its braces.
+    assert a.body.statements == []
+    assert _parser_errors_text(parser) == (
+        "parse error at 1:14: unexpected token '{'\n"
+        "parse error at 1:19: expected type, got '}'"
+    )
+
+
+def test_lazy_body_errors_match_eager_parse_in_source_order():
+    source = (
+        "fn a() -> int { int x = 1; - }\n"
+        "int g = ;\n"
+        "fn b() { if (x { y = 1; } }\n"
+    )
+    parser = Parser(_scan(source, "<lazy>"), lazy_bodies=True)
+    a, b = parser.parse().declarations
+    b.body, a.body    # read out of source order
+    eager_parser, _ast = _parse(source, "<lazy>")
+
+    assert _parser_errors_text(parser) == _parser_errors_text(eager_parser) == (
+        "parse error at 1:30: unexpected token '}'\n"
+        "parse error at 2:9: unexpected token ';'\n"
+        "parse error at 3:16: expected ')'; got '{'\n"
+        "parse error at 3:27: expected type, got '}'"
+    )
+
+    # After a body that closes early, the eager parse resynchronizes at the
+    # next 'fn', past `int g`; a lazy body stops at its own closing brace.
+    source = "fn a() { if (x { y = 1; } }\nint g = ;\nfn b() { }\n"
+    parser = Parser(_scan(source, "<lazy>"), lazy_bodies=True)
+    for decl in parser.parse().declarations:
+        getattr(decl, "body", None)
+    eager_parser, _ast = _parse(source, "<lazy>")
+
+    assert _parser_errors_text(parser) == (
+        _parser_errors_text(eager_parser) + "\nparse error at 2:9: unexpected token ';'"
+    )
+
+
+def test_lazy_bodies_need_random_access():
+    tokens = _scan("fn a() { }", "<lazy>")
+
+    assert Parser(tokens, lazy_bodies=True).lazy_bodies is True
+    assert Parser(iter(tokens), lazy_bodies=True).lazy_bodies is False
+    # An unbalanced body is parsed eagerly, with the usual diagnostics.
+    source = "fn a() { { int x = 1;"
+    parser = Parser(_scan(source, "<lazy>"), lazy_bodies=True)
+    parser.parse()
+    eager_parser, _ast = _parse(source, "<lazy>")
+    assert _parser_errors_text(parser) == _parser_errors_text(eager_parser) != ""
+
+
+@pytest.mark.parametrize("src_path", valid_cases + invalid_cases, ids=lambda p: p.name)
+def test_parallel_parse_matches_serial_parse(src_path: Path):
+    source = src_path.read_text(encoding="utf-8")
+    serial_parser, serial_ast = _parse(source, str(src_path))
+
+    parallel_parser = Parser(_scan(source, str(src_path)))
+    parallel_ast = parallel_parser.parse(workers=2, chunk_size=1)
+
+    assert parallel_ast == serial_ast
+    assert _parser_errors_text(parallel_parser) == _parser_errors_text(serial_parser)
+
+
+def test_declaration_boundaries_are_top_level():
+    from src.parser.parallel import find_declaration_boundaries
+
+    tokens = _scan("struct S { int x; } fn a() { { } } fn b() { struct } fn c() {}", "<b>")
+    kinds = [(i, t.lexeme) for i, t in enumerate(tokens) if t.lexeme in ("fn", "struct")]
+
+    assert kinds == [(0, "struct"), (7, "fn"), (15, "fn"), (20, "struct"), (22, "fn")]
+    assert find_declaration_boundaries(tokens, chunk_size=1) == [7, 15, 22]
+    assert find_declaration_boundaries(tokens, chunk_size=10) == [15]
+
+
+def test_parallel_parse_falls_back_when_a_chunk_spills():
+    # 'fn a() ->' needs a type from the next chunk; the chunk would report
+    # it at its own EOF, so the whole program is parsed serially instead.
+    source = "fn a() -> fn b() { return; }"
+    serial_parser, serial_ast = _parse(source, "<spill>")
+
+    parallel_parser = Parser(_scan(source, "<spill>"))
+    parallel_ast = parallel_parser.parse(workers=2, chunk_size=1)
+
+    assert parallel_ast == serial_ast
+    assert _parser_errors_text(parallel_parser) == _parser_errors_text(serial_parser) != ""
+
+
+@pytest.mark.parametrize("src_path", valid_cases, ids=lambda p: p.name)
+def test_binary_ast_round_trip_keeps_types(src_path: Path):
+    from src.parser import ast_serializer
+    from src.parser.ast_printer import JsonPrinter
+    from src.semantic.analyzer import SemanticAnalyzer
+
+    source = src_path.read_text(encoding="utf-8")
+    _parser, ast = _parse(source, str(src_path))
+    SemanticAnalyzer(filename=str(src_path), source=source).analyze(ast)
+
+    loaded = ast_serializer.loads(ast_serializer.dumps(ast))
+
+    assert loaded == ast
+    assert JsonPrinter().serialise(loaded) == JsonPrinter().serialise(ast)
+
+
+def test_binary_ast_handles_deep_and_lazy_trees():
+    from src.parser import ast_serializer
+    from src.parser.ast_nodes import FunctionDeclNode
+
+    _parser, deep = _parse("fn m() -> int { return " + "(" * DEEP + "1" + ")" * DEEP + "; }", "<deep>")
+    assert ast_serializer.loads(ast_serializer.dumps(deep)) == deep
+
+    lazy = Parser(_scan("fn a(int x) -> int { return -x; }", "<lazy>"), lazy_bodies=True).parse()
+    loaded = ast_serializer.loads(ast_serializer.dumps(lazy))
+    assert type(loaded.declarations[0]) is FunctionDeclNode
+    assert loaded.declarations[0].body == lazy.declarations[0].body
+
+    with pytest.raises(ValueError):
+        ast_serializer.loads(b"not an ast")
+
+
+def test_ast_cache_keeps_parsed_and_checked_trees_apart(tmp_path):
+    from src.parser.ast_cache import ASTCache
+    from src.semantic.analyzer import SemanticAnalyzer
+
+    source = "fn f(int a) -> int { return a * 2; }"
+    cache = ASTCache(tmp_path)
+    assert cache.load(source) is None
+
+    _parser, ast = _parse(source, "<cache>")
+    cache.store(source, ast)
+    SemanticAnalyzer().analyze(ast)
+    cache.store(source, ast, checked=True)
+
+    parsed = cache.load(source)
+    checked = cache.load(source, checked=True)
+    assert parsed.declarations[0].body.statements[0].value.resolved_type is None
+    assert checked.declarations[0].body.statements[0].value.resolved_type == "int"
+    assert checked == ast
+    assert (cache.hits, cache.misses) == (2, 1)
+
+    cache.path_for(source).write_bytes(b"garbage")
+    assert cache.load(source) is None
+    assert cache.load(source + " ") is None
+    assert (cache.hits, cache.misses) == (2, 3)
+
+
+def test_ast_cache_checked_key_follows_layout_version(monkeypatch):
+    from src.parser import ast_cache
+
+    cache = ast_cache.ASTCache("unused")
+    parsed, checked = cache.key("x"), cache.key("x", checked=True)
+    monkeypatch.setattr(ast_cache, "LAYOUT_VERSION", "old")
+    assert cache.key("x") == parsed
+    assert cache.key("x", checked=True) != checked
+
+
+_REPARSE_SOURCE = (
+    "struct P { int x; int y; }\n"
+    "fn a(int x) -> int { return x + 1; }\n"
+    "fn b(int x) -> int { return x * 2; }\n"
+    "fn c(int x) -> int { return x - 3; }\n"
+)
+
+
+def _edit(source: str, old: str, new: str) -> str:
+    assert old in source
+    return source.replace(old, new, 1)
+
+
+@pytest.mark.parametrize("use_relex", [False, True], ids=["scan", "relex"])
+def test_reparse_reuses_untouched_declarations(use_relex: bool):
+    scanner = Scanner(_REPARSE_SOURCE, filename="<edit>")
+    tokens = scanner.scan_tokens()
+    parser = Parser(tokens)
+    ast = parser.parse()
+    struct, a, b, c = ast.declarations
+
+    new_source = _edit(_REPARSE_SOURCE, "x * 2;", "x * 2;\n    int y = x;")
+    if use_relex:
+        start = _REPARSE_SOURCE.index("x * 2;")
+        new_tokens = scanner.relex(tokens, (start, start + 6), "x * 2;\n    int y = x;")
+    else:
+        new_tokens = _scan(new_source, "<edit>")
+    new_ast = parser.reparse(ast, tokens, new_tokens)
+
+    expected_parser, expected = _parse(new_source, "<edit>")
+    assert new_ast == expected
+    assert parser.errors == expected_parser.errors == []
+    assert new_ast.declarations[0] is struct and new_ast.declarations[1] is a
+    assert new_ast.declarations[2] is not b
+    assert new_ast.declarations[3] is c and c.line == 5
+
+
+def test_reparse_tracks_errors_and_unbalanced_edits():
+    tokens = _scan(_REPARSE_SOURCE, "<edit>")
+    parser = Parser(tokens)
+    ast = parser.parse()
+
+    source = _REPARSE_SOURCE
+    for old, new in [("x + 1;", "x + ;"), ("fn b(int x) -> int {", "fn b(int x) -> int"),
+                     ("\nfn c", "\n\n\nfn c"), ("x + ;", "x + 1;"),
+                     ("fn b(int x) -> int", "fn b(int x) -> int {")]:
+        source = _edit(source, old, new)
+        new_tokens = _scan(source, "<edit>")
+        ast = parser.reparse(ast, tokens, new_tokens)
+        tokens = new_tokens
+
+        expected_parser, expected = _parse(source, "<edit>")
+        assert ast == expected
+        assert _parser_errors_text(parser) == _parser_errors_text(expected_parser)
+
+    # Inputs that are not this parser's last ones are parsed from scratch.
+    assert Parser(tokens).reparse(ast, tokens, tokens) == ast
+
+
+def test_fingerprint_ignores_annotations_and_moves():
+    from src.parser.ast_serializer import fingerprint
+    from src.semantic.analyzer import SemanticAnalyzer
+
+    source = "struct P { int x; }\nfn f(P p) -> int { return p.x + 1; }\n"
+    _parser, ast = _parse(source, "<fp>")
+    before = fingerprint(ast.declarations[1])
+    SemanticAnalyzer().analyze(ast)
+    assert fingerprint(ast.declarations[1]) == before
+
+    _parser, moved = _parse("\n\n" + source, "<fp>")
+    assert fingerprint(moved.declarations[1]) == before
+    assert fingerprint(moved) != fingerprint(ast)
+
+    _parser, edited = _parse(source.replace("+ 1", "+ 2"), "<fp>")
+    assert fingerprint(edited.declarations[1]) != before
+    _parser, shifted = _parse(source.replace("return", "return "), "<fp>")
+    assert fingerprint(shifted.declarations[1]) != before
@@ -81,3 +81,304 @@ def test_invalid_semantic_cases_match_expected_errors(src_path: Path):
     expected_norm = _normalise(expected)
     actual_norm = _normalise(actual)
     assert actual_norm == expected_norm or expected_norm in actual_norm
+
+
+@pytest.mark.parametrize("src_path", invalid_cases, ids=lambda p: p.name)
+def test_shared_line_index_renders_same_diagnostics(src_path: Path):
+    source = src_path.read_text(encoding="utf-8")
+    scanner = Scanner(source, filename=str(src_path), lazy_positions=True)
+    ast = Parser(scanner.iter_tokens()).parse()
+
+    analyzer = SemanticAnalyzer(filename=str(src_path), source=source,
+                                line_index=scanner.line_index)
+    analyzer.analyze(ast)
+
+    source_lines = source.splitlines()
+    expected = "\n\n".join(e.format(source_lines) for e in analyzer.errors)
+    assert analyzer.format_errors() == expected
+
+
+@pytest.mark.parametrize("src_path", invalid_cases, ids=lambda p: p.name)
+def test_lazily_parsed_bodies_give_same_diagnostics(src_path: Path):
+    source = src_path.read_text(encoding="utf-8")
+    eager = SemanticAnalyzer(filename=str(src_path), source=source)
+    eager.analyze(_build_ast(source, str(src_path)))
+
+    parser = Parser(Scanner(source, filename=str(src_path)).scan_buffer(), lazy_bodies=True)
+    lazy = SemanticAnalyzer(filename=str(src_path), source=source)
+    lazy.analyze(parser.parse())
+
+    assert parser.errors == []
+    assert lazy.format_errors() == eager.format_errors()
+
+
+def test_deeply_nested_program_is_analyzed_without_recursion():
+    depth = 10_000
+    source = (
+        "fn m(int a, bool b) -> int {\n"
+        + "if (b) " * depth + "{ a = a + 1; }\n"
+        + "return " + "a + (" * depth + "a" + ")" * depth + ";\n}\n"
+    )
+    ast = _build_ast(source, "<deep>")
+    analyzer = SemanticAnalyzer(filename="<deep>", source=source)
+
+    assert analyzer.analyze(ast), analyzer.format_errors()
+    assert ast.declarations[0].body.statements[1].value.resolved_type == "int"
+
+
+def test_member_chains_carry_field_index_and_offset():
+    source = (
+        "struct Inner { int a; int b; }\n"
+        "struct Outer { int x; Inner inner; }\n"
+        "fn m() -> int { Outer o; o.inner.b = 1; return o.inner.b; }\n"
+    )
+    ast = _build_ast(source, "<member>")
+    analyzer = SemanticAnalyzer(filename="<member>", source=source)
+
+    assert analyzer.analyze(ast), analyzer.format_errors()
+    body = ast.declarations[2].body.statements
+    for member in (body[1].expression.target, body[2].value):
+        assert (member.field_index, member.offset, member.resolved_type) == (1, 8, "int")
+        assert (member.base.field_index, member.base.offset) == (1, 8)
+        assert member.base.resolved_type == "struct Inner"
+
+
+@pytest.mark.parametrize("src_path", valid_cases + invalid_cases, ids=lambda p: p.name)
+def test_flat_symbol_table_matches_scope_chain(src_path: Path):
+    from src.semantic.symbol_table import FlatSymbolTable, SymbolTable
+
+    source = src_path.read_text(encoding="utf-8")
+    results = []
+    for table in (SymbolTable(), FlatSymbolTable()):
+        analyzer = SemanticAnalyzer(filename=str(src_path), source=source, symbol_table=table)
+        analyzer.analyze(_build_ast(source, str(src_path)))
+        results.append((analyzer.format_errors(), table.dump()))
+
+    assert results[0] == results[1]
+
+
+def test_flat_symbol_table_undoes_scopes():
+    from src.semantic.symbol_table import FlatSymbolTable, Symbol, SymbolKind
+    from src.semantic.type_system import INT
+
+    def sym(name, line):
+        return Symbol(name=name, kind=SymbolKind.VARIABLE, type=INT, decl_line=line, decl_column=1)
+
+    table = FlatSymbolTable()
+    assert table.define(sym("x", 1))
+    table.enter_scope("fn:m")
+    assert table.lookup_local("x") is None
+    assert table.define(sym("x", 2)) and not table.define(sym("x", 3))
+    table.enter_scope("block")
+    assert table.define(sym("y", 4))
+    assert (table.lookup("x").decl_line, table.depth()) == (2, 3)
+    table.exit_scope()
+    assert table.lookup("y") is None and table.lookup("x").decl_line == 2
+    table.exit_scope()
+    assert table.lookup("x").decl_line == 1 == table.lookup_global("x").decl_line
+    with pytest.raises(RuntimeError):
+        table.exit_scope()
+    assert table.dump() == "Scope(global):\n  variable x: int (declared at 1:1)"
+    assert table.global_scope.lookup_local("x") is table.lookup_global("x")
+    assert table.global_scope.dump() == table.dump()
+
+
+def _functions(prefix: str, body: str, count: int = 8) -> str:
+    return "".join(f"fn {prefix}{i}() -> int {{ {body.format(i=i)} }}\n" for i in range(count))
+
+
+GLOBAL_SOURCES = {
+    "globals-first": "int g = 1;\n" + _functions("f", "return g + {i};"),
+    "global-after-functions": (_functions("f", "return g + {i};") + "int g = 1;\n"
+                               + _functions("h", "g = {i}; return g;")),
+    "uninitialized-global": ("int g;\nfn set() { g = 1; }\n"
+                             + _functions("f", "return g + {i};")),
+}
+
+
+@pytest.mark.parametrize("name, source", [
+    pytest.param(name, source, id=name) for name, source in
+    [(p.name, p.read_text(encoding="utf-8")) for p in valid_cases + invalid_cases]
+    + list(GLOBAL_SOURCES.items())
+])
+def test_parallel_analysis_matches_serial(name: str, source: str):
+    from src.parser.ast_printer import JsonPrinter
+
+    serial_ast = _build_ast(source, name)
+    serial = SemanticAnalyzer(filename=name, source=source)
+    serial_ok = serial.analyze(serial_ast)
+
+    parallel_ast = _build_ast(source, name)
+    parallel = SemanticAnalyzer(filename=name, source=source)
+    parallel_ok = parallel.analyze(parallel_ast, workers=2, chunk_size=1)
+
+    assert parallel_ok == serial_ok
+    assert parallel.format_errors() == serial.format_errors()
+    assert JsonPrinter().serialise(parallel_ast) == JsonPrinter().serialise(serial_ast)
+
+
+def test_struct_declared_after_use_is_complete_and_errors_stay_in_order():
+    source = (
+        "fn m() -> int { P p; p.x = 1; int a = q; return p.x; }\n"
+        "struct P { int x; nope y; }\n"
+        "fn n() -> int { int b = r; return 0; }\n"
+    )
+    for workers in (1, 2):
+        ast = _build_ast(source, "<order>")
+        analyzer = SemanticAnalyzer(filename="<order>", source=source)
+        analyzer.analyze(ast, workers=workers, chunk_size=1)
+
+        messages = [(e.line, e.message) for e in analyzer.errors]
+        assert [line for line, _message in messages] == [1, 1, 2, 3, 3]
+        assert (2, "unknown type 'nope'") in messages
+        assert not any("no field" in message for _line, message in messages)
+
+
+_INCREMENTAL_SOURCE = (
+    "struct P { int x; int y; }\n"
+    "fn a(int v) -> int { return v + 1; }\n"
+    "fn b(int v) -> int { P p; p.x = v; return p.x + a(v); }\n"
+    "fn c(int v) -> int { return v * 2; }\n"
+    "fn d() -> int { return missing; }\n"
+)
+
+
+@pytest.mark.parametrize("old, new, rechecked", [
+    ("v * 2", "v * 3", ["c"]),
+    ("fn a(int v) -> int", "fn a(float v) -> int", ["a", "b"]),
+    ("int y;", "int y; bool z;", ["b"]),
+    # d's hint quotes where it is declared, so moving it re-checks it
+    ("struct P", "\n\nstruct P", ["d"]),
+    ("fn c", "fn missing() -> int { return 0; }\nfn c", ["d", "missing"]),
+], ids=["body", "signature", "struct", "moved", "new-global"])
+def test_incremental_analysis_rechecks_only_affected_functions(old, new, rechecked):
+    from src.parser.ast_printer import JsonPrinter
+    from src.semantic.incremental import IncrementalAnalyzer
+
+    incremental = IncrementalAnalyzer("<inc>")
+    incremental.analyze(_build_ast(_INCREMENTAL_SOURCE, "<inc>"), _INCREMENTAL_SOURCE)
+    assert incremental.rechecked == ["a", "b", "c", "d"]
+
+    source = _INCREMENTAL_SOURCE.replace(old, new, 1)
+    ast = _build_ast(source, "<inc>")
+    incremental.analyze(ast, source)
+    assert sorted(incremental.rechecked) == rechecked
+
+    expected_ast = _build_ast(source, "<inc>")
+    expected = SemanticAnalyzer(filename="<inc>", source=source)
+    expected.analyze(expected_ast)
+    assert incremental.format_errors() == expected.format_errors() != ""
+    assert JsonPrinter().serialise(ast) == JsonPrinter().serialise(expected_ast)
+
+
+_GLOBALS_SOURCE = (
+    "int g = 1;\n"
+    "int h;\n"
+    "fn set() { h = 2; }\n"
+    "fn a() -> int { return g; }\n"
+    "fn b() -> int { return h; }\n"
+)
+
+
+@pytest.mark.parametrize("old, new, rechecked", [
+    ("return g;", "return g + 1;", ["a"]),            # g itself is not cached
+    ("return h;", "return h + 1;", ["b"]),            # set() replays h = 2
+    ("h = 2;", "", ["b", "set"]),                      # b now reads h uninitialized
+    ("int g = 1;", "float g = 1.0;", ["a"]),
+], ids=["body", "replayed-initialization", "initialization-removed", "global-type"])
+def test_incremental_analysis_tracks_global_variables(old, new, rechecked):
+    from src.parser.ast_printer import JsonPrinter
+    from src.semantic.incremental import IncrementalAnalyzer
+
+    incremental = IncrementalAnalyzer("<inc>")
+    assert incremental.analyze(_build_ast(_GLOBALS_SOURCE, "<inc>"), _GLOBALS_SOURCE)
+
+    source = _GLOBALS_SOURCE.replace(old, new, 1)
+    ast = _build_ast(source, "<inc>")
+    incremental.analyze(ast, source)
+    assert sorted(incremental.rechecked) == rechecked
+
+    expected_ast = _build_ast(source, "<inc>")
+    expected = SemanticAnalyzer(filename="<inc>", source=source)
+    expected.analyze(expected_ast)
+    assert incremental.format_errors() == expected.format_errors()
+    assert JsonPrinter().serialise(ast) == JsonPrinter().serialise(expected_ast)
+
+
+def test_incremental_analysis_rechecks_when_nested_alignment_moves_fields():
+    from src.parser.ast_printer import JsonPrinter
+    from src.semantic.incremental import IncrementalAnalyzer
+
+    source = ("struct B { int x; }\n"
+              "struct A { bool a; B b; int c; }\n"
+              "fn f() -> int { A v; A w; v.b = w.b; return v.c; }\n")
+    incremental = IncrementalAnalyzer("<inc>")
+    incremental.analyze(_build_ast(source, "<inc>"), source)
+
+    # Same size, but B's alignment drops from 8 to 1, so A.b moves from 8 to 1.
+    source = source.replace("int x;", " ".join(f"bool x{i};" for i in range(8)))
+    ast = _build_ast(source, "<inc>")
+    incremental.analyze(ast, source)
+    assert incremental.rechecked == ["f"]
+
+    expected_ast = _build_ast(source, "<inc>")
+    SemanticAnalyzer(filename="<inc>", source=source).analyze(expected_ast)
+    assert JsonPrinter().serialise(ast) == JsonPrinter().serialise(expected_ast)
+    assert ast.declarations[2].body.statements[2].expression.target.offset == 1
+
+
+def test_type_interner_tables_match_type_functions():
+    from src.semantic.type_system import (
+        BOOL, FLOAT, INT, NULL, STRING, VOID, FunctionType, StructType, TypeInterner,
+        binary_result_type, unary_result_type,
+    )
+
+    interner = TypeInterner()
+    types = [INT, FLOAT, BOOL, STRING, VOID, NULL, StructType("P"), StructType("Q"),
+             FunctionType([INT], BOOL)]
+    ids = [interner.intern(t) for t in types]
+    assert ids == list(range(len(types))) and ids[:3] == [INT.type_id, FLOAT.type_id, BOOL.type_id]
+    assert interner.intern(StructType("P")) == ids[6]
+    assert interner.intern(FunctionType([INT], BOOL)) == ids[8]
+    assert interner.names[ids[6]] == "struct P"
+
+    def _type(type_id):
+        return None if type_id is None else interner.types[type_id]
+
+    for left in types:
+        for op in ("-", "!"):
+            assert _type(interner.unary(op, left.type_id)) == unary_result_type(op, left)
+        for right in types:
+            assert interner.assignable(left.type_id, right.type_id) == left.is_assignable_from(right)
+            for op in ("+", "-", "*", "/", "%", "==", "!=", "<", "<=", ">", ">=", "&&", "||"):
+                expected = binary_result_type(op, left, right)
+                assert _type(interner.binary(op, left.type_id, right.type_id)) == expected
+
+
+def test_struct_layout_pads_aligns_and_optionally_reorders():
+    from src.semantic.type_system import BOOL, INT, LayoutEngine, StructType
+
+    inner = StructType("Inner", {"flag": BOOL, "n": INT})
+    outer = StructType("Outer", {"a": BOOL, "inner": inner, "b": BOOL, "c": BOOL})
+    outer.fields["self"] = outer        # contains itself: one word
+
+    layout = LayoutEngine().layout(outer)
+    assert {name: f.offset for name, f in layout.fields.items()} == \
+        {"a": 0, "inner": 8, "b": 24, "c": 25, "self": 32}
+    assert (layout.size, layout.alignment, layout.padding) == (40, 8, 13)
+
+    packed = LayoutEngine(reorder_fields=True).layout(outer)
+    assert packed.memory_order() == ["inner", "self", "a", "b", "c"]
+    assert list(packed.fields) == list(outer.fields)
+    assert (packed.size, packed.padding) == (32, 5)
+
+    source = ("struct Flags { bool on; int count; bool dirty; }\n"
+              "fn main() -> int { Flags f; f.dirty = true; f.count = 2; return f.count; }\n")
+    for reorder, offsets, size in ((False, [16, 8, 8], 24), (True, [9, 0, 0], 16)):
+        ast = _build_ast(source, "<layout>")
+        analyzer = SemanticAnalyzer(filename="<layout>", reorder_fields=reorder)
+        assert analyzer.analyze(ast)
+        assert analyzer.struct_layouts["Flags"].size == size
+        statements = ast.declarations[1].body.statements
+        assert [s.expression.target.offset for s in statements[1:3]] + \
+            [statements[3].value.offset] == offsets
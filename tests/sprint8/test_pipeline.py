@@ -111,3 +111,60 @@ def test_assemble_stage_reports_missing_nasm():
     assert result.success is False
     assert result.stage == "assemble"
     assert "NASM was not found" in "\n".join(result.diagnostics)
+
+
+@pytest.mark.parametrize("case_name, expected_stage", INVALID_PIPELINE_CASES)
+def test_pipeline_mmap_source_reports_same_diagnostics(case_name, expected_stage):
+    src_path = INVALID_DIR / case_name
+    out_dir = BUILD_DIR / case_name.replace(".src", "")
+
+    text = CompilerPipeline().compile(BuildConfig(input_file=src_path, output_dir=out_dir))
+    mapped = CompilerPipeline().compile(
+        BuildConfig(input_file=src_path, output_dir=out_dir, mmap_source=True)
+    )
+
+    assert mapped.stage == text.stage == expected_stage
+    assert mapped.diagnostics == text.diagnostics
+
+
+def test_pipeline_token_cache_counts_hits_and_misses(tmp_path):
+    src_path = VALID_DIR / VALID_PIPELINE_CASES[1]
+    config = BuildConfig(input_file=src_path, output_dir=tmp_path / "out",
+                         token_cache_dir=tmp_path / "tokens")
+    pipeline = CompilerPipeline()
+
+    cold = pipeline.compile(config)
+    warm = pipeline.compile(config)
+
+    assert cold.success and warm.success, warm.summary()
+    assert (cold.cache_hits, cold.cache_misses) == (0, 1)
+    assert (warm.cache_hits, warm.cache_misses) == (1, 0)
+    assert "Token cache: 1 hits, 0 misses" in warm.summary()
+
+    reference = BuildConfig(input_file=src_path, output_dir=tmp_path / "ref")
+    CompilerPipeline().compile(reference)
+    assert config.ir_path.read_text(encoding="utf-8") == \
+        reference.ir_path.read_text(encoding="utf-8")
+
+
+def test_pipeline_reorder_fields_shrinks_struct_slots(tmp_path):
+    src_path = tmp_path / "flags.src"
+    src_path.write_text("struct Flags { bool on; int count; bool dirty; }\n"
+                        "fn main() -> int { Flags f; f.on = true; f.count = 2; return f.count; }\n",
+                        encoding="utf-8")
+
+    asm = {}
+    for reorder in (False, True):
+        config = BuildConfig(input_file=src_path, output_dir=tmp_path / str(reorder),
+                             reorder_fields=reorder)
+        result = CompilerPipeline().compile(config)
+        assert result.success, result.summary()
+        asm[reorder] = config.asm_path.read_text(encoding="utf-8")
+
+    # In declaration order f takes 24 bytes from rbp-24: on, count, dirty
+    # at 0, 8, 16. Reordered it takes 16 from rbp-16: count, on, dirty at
+    # 0, 8, 9, and the temp after it moves up a slot.
+    assert "mov byte [rbp-24], al" in asm[False]
+    assert "mov qword [rbp-16], rax\n    mov rax, qword [rbp-16]\n    mov qword [rbp-32]" in asm[False]
+    assert "mov byte [rbp-8], al" in asm[True]
+    assert "mov qword [rbp-16], rax\n    mov rax, qword [rbp-16]\n    mov qword [rbp-24]" in asm[True]